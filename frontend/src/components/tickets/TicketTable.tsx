@@ -17,21 +17,37 @@ import {
     SelectValue,
 } from '@/components/ui/Select'
 
+export interface TicketFilters {
+    status?: TicketStatus
+    priority?: Priority
+}
+
 interface TicketTableProps {
     tickets: Ticket[]
     onTicketClick?: (ticket: Ticket) => void
+    onFiltersChange?: (filters: TicketFilters) => void
+    initialSort?: SortField | null
 }
 
 type SortField = 'name' | 'creation' | 'priority' | 'status'
 type SortDirection = 'asc' | 'desc'
 
-export function TicketTable({ tickets, onTicketClick }: TicketTableProps) {
+export function TicketTable({ tickets, onTicketClick, onFiltersChange, initialSort = 'creation' }: TicketTableProps) {
     const [search, setSearch] = useState('')
     const [statusFilter, setStatusFilter] = useState<TicketStatus | 'all'>('all')
     const [priorityFilter, setPriorityFilter] = useState<Priority | 'all'>('all')
-    const [sortField, setSortField] = useState<SortField>('creation')
+    const [sortField, setSortField] = useState<SortField | null>(initialSort)
     const [sortDirection, setSortDirection] = useState<SortDirection>('desc')
 
+    const changeFilters = (status: TicketStatus | 'all', priority: Priority | 'all') => {
+        setStatusFilter(status)
+        setPriorityFilter(priority)
+        onFiltersChange?.({
+            status: status === 'all' ? undefined : status,
+            priority: priority === 'all' ? undefined : priority,
+        })
+    }
+
     const handleSort = (field: SortField) => {
         if (sortField === field) {
             setSortDirection(sortDirection === 'asc' ? 'desc' : 'asc')
@@ -115,7 +131,7 @@ export function TicketTable({ tickets, onTicketClick }: TicketTableProps) {
                 </div>
 
                 <div className="flex gap-2">
-                    <Select value={statusFilter} onValueChange={(v) => setStatusFilter(v as TicketStatus | 'all')}>
+                    <Select value={statusFilter} onValueChange={(v) => changeFilters(v as TicketStatus | 'all', priorityFilter)}>
                         <SelectTrigger className="w-[140px]">
                             <SelectValue placeholder="Status" />
                         </SelectTrigger>
@@ -131,7 +147,7 @@ export function TicketTable({ tickets, onTicketClick }: TicketTableProps) {
 
                     <Select
                         value={priorityFilter}
-                        onValueChange={(v) => setPriorityFilter(v as Priority | 'all')}
+                        onValueChange={(v) => changeFilters(statusFilter, v as Priority | 'all')}
                     >
                         <SelectTrigger className="w-[140px]">
                             <SelectValue placeholder="Priority" />
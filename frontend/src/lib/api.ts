@@ -1,5 +1,5 @@
 import axios, { type AxiosInstance, type AxiosError } from 'axios'
-import type { APIResponse, PaginatedResponse, Ticket, Customer, Team, Communication, ChannelConfig, KnowledgeBaseArticle, PriorityLevel, SystemSettings, AgentMembership, CustomerHandle, SLA, User } from './types'
+import type { APIResponse, CursorPage, Ticket, TicketPage, TicketSearchResult, Customer, Team, Communication, CommunicationOriginal, ChannelConfig, KnowledgeBaseArticle, PriorityLevel, SystemSettings, AgentMembership, CustomerHandle, SLA, User } from './types'
 import { supabase } from './supabase'
 
 export const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:3000'
@@ -41,17 +41,68 @@ class APIClient {
     async getTickets(params?: {
         status?: string
         priority?: string
-        search?: string
-    }): Promise<Ticket[]> {
+        team?: string
+        agent?: string
+        channel?: string
+        limit?: number
+        cursor?: string
+        fields?: string
+        counts?: boolean
+    }): Promise<TicketPage> {
         const response = await this.client.get('/tickets', { params })
         return response.data
     }
 
+    async searchTickets(params: {
+        q: string
+        status?: string
+        team?: string
+        from?: string
+        to?: string
+        limit?: number
+        cursor?: string
+    }): Promise<CursorPage<TicketSearchResult>> {
+        const response = await this.client.get('/search/tickets', { params })
+        return response.data
+    }
+
     async getTicket(name: string): Promise<Ticket> {
         const response = await this.client.get(`/tickets/${name}`)
         return response.data
     }
 
+    async getConversation(name: string, params?: { limit?: number; cursor?: string }): Promise<CursorPage<Communication>> {
+        const response = await this.client.get(`/tickets/${name}/communications`, { params })
+        return response.data
+    }
+
+    async getCommunication(name: string, id: number, include?: string): Promise<Partial<Communication>> {
+        const response = await this.client.get(`/tickets/${name}/communications/${id}`, { params: include ? { include } : undefined })
+        return response.data
+    }
+
+    async getCommunicationOriginal(name: string, id: number): Promise<CommunicationOriginal> {
+        const response = await this.client.get(`/tickets/${name}/communications/${id}/original`)
+        return response.data
+    }
+
+    async downloadAttachment(name: string, id: number, filename: string): Promise<Blob> {
+        const url = `/tickets/${name}/communications/${id}/attachments/${encodeURIComponent(filename)}`
+        const parts: Uint8Array[] = []
+        let start = 0
+        let mimeType = 'application/octet-stream'
+        while (true) {
+            const response = await this.client.get(url, { headers: { Range: `bytes=${start}-` } })
+            const { data, end, size, mime_type } = response.data
+            const bytes = Uint8Array.from(atob(data), c => c.charCodeAt(0))
+            parts.push(bytes)
+            mimeType = mime_type || mimeType
+            if (end + 1 >= size) break
+            start = end + 1
+        }
+        return new Blob(parts, { type: mimeType })
+    }
+
     async createTicket(data: Partial<Ticket>): Promise<Ticket> {
         const response = await this.client.post('/tickets', data)
         return response.data
@@ -77,10 +128,10 @@ class APIClient {
     }
 
     async getCustomers(params?: {
-        page?: number
-        pageSize?: number
         search?: string
-    }): Promise<PaginatedResponse<Customer>> {
+        limit?: number
+        cursor?: string
+    }): Promise<CursorPage<Customer>> {
         const response = await this.client.get('/management/customers', { params })
         return response.data
     }
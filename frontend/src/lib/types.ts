@@ -66,6 +66,7 @@ export interface Team {
     description: string | null
     escalation_team: string | null
     last_agent: string | null
+    assignment_strategy: 'round_robin' | 'least_loaded'
     creation: string
     modified: string
 }
@@ -90,13 +91,28 @@ export interface PriorityLevel {
     modified: string
 }
 
+export interface BlobRef {
+    sha256: string
+    size: number
+    mime_type: string
+}
+
+export interface CommunicationOriginal {
+    id: number
+    raw_headers: Record<string, string>
+    full_body_text: string | null
+}
+
 export interface Communication {
     id: number
     ticket: string
     body: string
     direction: CommunicationDirection
     channel: string | null
-    attachments: Record<string, any> | null
+    attachments?: Record<string, string | BlobRef> | null
+    attachment_names?: string[] | null
+    has_original?: boolean
+    message_id?: string | null
     sender: string | null
     raised_by: string
     name: string
@@ -163,8 +179,30 @@ export interface PaginatedResponse<T> {
     limit: number
 }
 
+export interface CursorPage<T> {
+    data: T[]
+    next_cursor: string | null
+    limit: number
+    total?: number | null
+}
+
+export interface TicketCounts {
+    total: number
+    by_status: Record<string, number>
+}
+
+export interface TicketPage extends CursorPage<Ticket> {
+    counts?: TicketCounts
+}
+
 export interface APIResponse<T> {
     data: T
     message?: string
     success: boolean
 }
+
+export interface TicketSearchResult extends Ticket {
+    rank: number
+    matched_communication: number | null
+    headline: string
+}
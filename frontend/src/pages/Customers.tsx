@@ -25,7 +25,7 @@ import {
     SelectTrigger,
     SelectValue,
 } from '@/components/ui/Select'
-import { Plus, Pencil, Trash2, UserCircle, Mail, Phone, Building, Link as LinkIcon, X } from 'lucide-react'
+import { Plus, Pencil, Trash2, UserCircle, Mail, Phone, Building, Link as LinkIcon, X, Search } from 'lucide-react'
 import type { Customer, CustomerHandle, ChannelConfig } from '@/lib/types'
 import { api } from '@/lib/api'
 import { useAuth } from '@/contexts/AuthContext'
@@ -35,6 +35,10 @@ export default function Customers() {
     const { role } = useAuth()
     const [customers, setCustomers] = useState<Customer[]>([])
     const [loading, setLoading] = useState(true)
+    const [search, setSearch] = useState('')
+    const [nextCursor, setNextCursor] = useState<string | null>(null)
+    const [total, setTotal] = useState<number | null>(null)
+    const [loadingMore, setLoadingMore] = useState(false)
     const [isDialogOpen, setIsDialogOpen] = useState(false)
     const [isHandlesDialogOpen, setIsHandlesDialogOpen] = useState(false)
     const [editingCustomer, setEditingCustomer] = useState<Customer | null>(null)
@@ -50,11 +54,13 @@ export default function Customers() {
         organization: ''
     })
 
-    const fetchCustomers = async () => {
+    const fetchCustomers = async (term = search) => {
         setLoading(true)
         try {
-            const response = await api.getCustomers()
+            const response = await api.getCustomers({ search: term.trim() || undefined })
             setCustomers(response.data || [])
+            setNextCursor(response.next_cursor)
+            setTotal(response.total ?? null)
         } catch (error) {
             console.error('Failed to fetch customers:', error)
             toast.error('Failed to load customers')
@@ -63,6 +69,21 @@ export default function Customers() {
         }
     }
 
+    const loadMoreCustomers = async () => {
+        if (!nextCursor) return
+        setLoadingMore(true)
+        try {
+            const response = await api.getCustomers({ search: search.trim() || undefined, cursor: nextCursor })
+            setCustomers(prev => [...prev, ...response.data])
+            setNextCursor(response.next_cursor)
+        } catch (error) {
+            console.error('Failed to fetch more customers:', error)
+            toast.error('Failed to load customers')
+        } finally {
+            setLoadingMore(false)
+        }
+    }
+
     const fetchChannels = async () => {
         try {
             const data = await api.getChannels()
@@ -73,10 +94,14 @@ export default function Customers() {
     }
 
     useEffect(() => {
-        fetchCustomers()
         fetchChannels()
     }, [])
 
+    useEffect(() => {
+        const timer = setTimeout(() => fetchCustomers(search), 300)
+        return () => clearTimeout(timer)
+    }, [search])
+
     const handleOpenDialog = (customer?: Customer) => {
         if (customer) {
             setEditingCustomer(customer)
@@ -188,11 +213,23 @@ export default function Customers() {
                 </div>
 
                 <Card>
-                    <CardHeader>
+                    <CardHeader className="flex flex-col gap-4 sm:flex-row sm:items-center sm:justify-between space-y-0">
                         <CardTitle className="flex items-center gap-2">
                             <UserCircle className="h-5 w-5" />
-                            All Customers
+                            {search.trim() ? 'Matching Customers' : 'All Customers'}
+                            {total !== null && (
+                                <span className="text-sm font-normal text-muted-foreground">(~{total.toLocaleString()})</span>
+                            )}
                         </CardTitle>
+                        <div className="relative sm:w-80">
+                            <Search className="absolute left-3 top-1/2 h-4 w-4 -translate-y-1/2 text-muted-foreground" />
+                            <Input
+                                placeholder="Search name, email, phone or handle..."
+                                value={search}
+                                onChange={(e) => setSearch(e.target.value)}
+                                className="pl-9"
+                            />
+                        </div>
                     </CardHeader>
                     <CardContent>
                         {loading ? (
@@ -262,6 +299,13 @@ export default function Customers() {
                                 </TableBody>
                             </Table>
                         )}
+                        {!loading && nextCursor && (
+                            <div className="mt-4 flex justify-center">
+                                <Button variant="outline" onClick={loadMoreCustomers} disabled={loadingMore}>
+                                    {loadingMore ? 'Loading...' : 'Load more'}
+                                </Button>
+                            </div>
+                        )}
                     </CardContent>
                 </Card>
 
@@ -27,6 +27,20 @@ interface AgentPerformance {
     closed_count: number
 }
 
+interface PercentileSummary {
+    count: number
+    p50: number | null
+    p90: number | null
+    p99: number | null
+}
+
+interface DashboardPercentiles {
+    relative_accuracy: number
+    first_response_hours: PercentileSummary
+    resolution_hours: PercentileSummary
+    hold_time_hours: PercentileSummary
+}
+
 interface DashboardStats {
     total_tickets: number
     status_counts: {
@@ -42,6 +56,7 @@ interface DashboardStats {
     avg_resolution_hours: number | null
     sla_compliance: number
     avg_hold_time_hours: number | null
+    percentiles?: DashboardPercentiles
 }
 
 type Period = 'today' | '7d' | '30d' | '3m' | '6m' | '1y' | 'all' | 'custom'
@@ -104,6 +119,11 @@ export default function Dashboard() {
         return `${(hours / 24).toFixed(1)} days`
     }
 
+    const formatPercentiles = (summary?: PercentileSummary): string | null => {
+        if (!summary || !summary.count) return null
+        return `p50 ${formatHours(summary.p50)} · p90 ${formatHours(summary.p90)} · p99 ${formatHours(summary.p99)}`
+    }
+
     if (loading) {
         return (
             <MainLayout>
@@ -300,6 +320,9 @@ export default function Dashboard() {
                                     <div>
                                         <p className="text-sm text-muted-foreground">Avg First Response</p>
                                         <p className="text-2xl font-bold">{formatHours(stats.avg_first_response_hours)}</p>
+                                        {formatPercentiles(stats.percentiles?.first_response_hours) && (
+                                            <p className="text-xs text-muted-foreground">{formatPercentiles(stats.percentiles?.first_response_hours)}</p>
+                                        )}
                                     </div>
                                     <Clock className="h-8 w-8 text-muted-foreground" />
                                 </div>
@@ -307,6 +330,9 @@ export default function Dashboard() {
                                     <div>
                                         <p className="text-sm text-muted-foreground">Avg Resolution Time</p>
                                         <p className="text-2xl font-bold">{formatHours(stats.avg_resolution_hours)}</p>
+                                        {formatPercentiles(stats.percentiles?.resolution_hours) && (
+                                            <p className="text-xs text-muted-foreground">{formatPercentiles(stats.percentiles?.resolution_hours)}</p>
+                                        )}
                                     </div>
                                     <CheckCircle className="h-8 w-8 text-muted-foreground" />
                                 </div>
@@ -17,7 +17,7 @@ import { FileInput } from '@/components/ui/FileInput'
 import { ChannelIcon } from '@/components/tickets/ChannelIcon'
 import { fileToBase64 } from '@/lib/fileUtils'
 import { api } from '@/lib/api'
-import type { Ticket, Communication, TicketStatus, Priority, ChannelConfig, AgentMembership, Team } from '@/lib/types'
+import type { Ticket, Communication, CommunicationOriginal, TicketStatus, Priority, ChannelConfig, AgentMembership, Team } from '@/lib/types'
 import { cn, safeFormat } from '@/lib/utils'
 import { useAuth } from '@/contexts/AuthContext'
 import {
@@ -44,6 +44,10 @@ export default function TicketDetail() {
     const [updating, setUpdating] = useState(false)
     const [teamMembers, setTeamMembers] = useState<AgentMembership[]>([])
     const [teams, setTeams] = useState<Team[]>([])
+    const [olderCursor, setOlderCursor] = useState<string | null>(null)
+    const [loadingOlder, setLoadingOlder] = useState(false)
+    const [loadingAttachments, setLoadingAttachments] = useState<Record<number, boolean>>({})
+    const [originals, setOriginals] = useState<Record<number, CommunicationOriginal>>({})
 
     const { data: streamedTicket } = useStreamItem({ streamName: 'tickets', groupId: 'all', id: id || '' })
     const { data: streamedCommunications } = useStreamGroup({ streamName: 'communications', groupId: id || '' })
@@ -123,28 +127,16 @@ export default function TicketDetail() {
     const fetchTicket = async (ticketId: string, showLoading = false) => {
         if (showLoading) setLoading(true)
         try {
-            const data = await api.getTicket(ticketId)
-            setTicket(prev => {
-                if (!prev) return data
-
-                const existingComms = prev.Communication || []
-                const dbComms = data.Communication || []
-                const mergedComms = [...dbComms]
-
-                existingComms.forEach(ec => {
-                    if (!mergedComms.find(dc => String(dc.id) === String(ec.id))) {
-                        mergedComms.push(ec)
-                    }
-                })
-
-                return {
-                    ...prev,
-                    ...data,
-                    Communication: mergedComms.sort((a, b) =>
-                        new Date(a.creation).getTime() - new Date(b.creation).getTime()
-                    )
-                }
-            })
+            const [data, conversation] = await Promise.all([
+                api.getTicket(ticketId),
+                api.getConversation(ticketId)
+            ])
+            if (showLoading) setOlderCursor(conversation.next_cursor)
+            setTicket(prev => ({
+                ...prev,
+                ...data,
+                Communication: mergeCommunications(prev?.Communication || [], conversation.data)
+            }))
             setReplyChannel(data.channel || 'Email')
         } catch (error) {
             console.error('Failed to fetch ticket:', error)
@@ -153,6 +145,84 @@ export default function TicketDetail() {
         }
     }
 
+    const mergeCommunications = (existing: Communication[], incoming: Communication[]) => {
+        const merged = [...incoming]
+        existing.forEach(ec => {
+            const index = merged.findIndex(c => String(c.id) === String(ec.id))
+            if (index === -1) {
+                merged.push(ec)
+            } else if (ec.attachments && !merged[index].attachments) {
+                merged[index] = { ...merged[index], attachments: ec.attachments }
+            }
+        })
+        return merged.sort((a, b) =>
+            new Date(a.creation).getTime() - new Date(b.creation).getTime()
+        )
+    }
+
+    const attachmentNames = (comm: Communication) =>
+        comm.attachment_names || Object.keys(comm.attachments || {})
+
+    const attachmentsLoaded = (comm: Communication) =>
+        attachmentNames(comm).length === 0 ||
+        (!!comm.attachments && Object.values(comm.attachments).every(content => typeof content === 'string'))
+
+    const loadOlderMessages = async () => {
+        if (!id || !olderCursor) return
+        setLoadingOlder(true)
+        try {
+            const page = await api.getConversation(id, { cursor: olderCursor })
+            setOlderCursor(page.next_cursor)
+            setTicket(prev => prev ? { ...prev, Communication: mergeCommunications(prev.Communication || [], page.data) } : prev)
+        } catch (error) {
+            console.error('Failed to load older messages:', error)
+        } finally {
+            setLoadingOlder(false)
+        }
+    }
+
+    const loadAttachments = async (comm: Communication) => {
+        if (!id) return
+        setLoadingAttachments(prev => ({ ...prev, [comm.id]: true }))
+        try {
+            const attachments = comm.attachments || (await api.getCommunication(id, comm.id, 'attachments')).attachments || {}
+            const resolved: Record<string, string> = {}
+            for (const [filename, content] of Object.entries(attachments)) {
+                resolved[filename] = typeof content === 'string'
+                    ? content
+                    : URL.createObjectURL(await api.downloadAttachment(id, comm.id, filename))
+            }
+            setTicket(prev => prev ? {
+                ...prev,
+                Communication: (prev.Communication || []).map(c =>
+                    String(c.id) === String(comm.id) ? { ...c, attachments: resolved } : c
+                )
+            } : prev)
+        } catch (error) {
+            console.error('Failed to load attachments:', error)
+        } finally {
+            setLoadingAttachments(prev => ({ ...prev, [comm.id]: false }))
+        }
+    }
+
+    const toggleOriginal = async (comm: Communication) => {
+        if (!id) return
+        if (originals[comm.id]) {
+            setOriginals(prev => {
+                const next = { ...prev }
+                delete next[comm.id]
+                return next
+            })
+            return
+        }
+        try {
+            const original = await api.getCommunicationOriginal(id, comm.id)
+            setOriginals(prev => ({ ...prev, [comm.id]: original }))
+        } catch (error) {
+            console.error('Failed to load original message:', error)
+        }
+    }
+
     const fetchChannels = async () => {
         try {
             const data = await api.getChannels()
@@ -426,6 +496,13 @@ export default function TicketDetail() {
                         )}
                         <Card className="border-none shadow-none bg-transparent">
                             <CardContent className="p-0 space-y-6">
+                                {olderCursor && (
+                                    <div className="flex justify-center">
+                                        <Button variant="outline" size="sm" onClick={loadOlderMessages} disabled={loadingOlder}>
+                                            {loadingOlder ? 'Loading...' : 'Load earlier messages'}
+                                        </Button>
+                                    </div>
+                                )}
                                 {sortedCommunications.map((comm: Communication) => {
                                     const isEvent = comm.direction === 'System' || comm.direction === 'Escalation'
 
@@ -479,7 +556,39 @@ export default function TicketDetail() {
                                                 <div className="prose prose-sm max-w-none text-foreground">
                                                     <p className="whitespace-pre-wrap">{comm.body}</p>
                                                 </div>
-                                                {comm.attachments && Object.keys(comm.attachments).length > 0 && (
+                                                {comm.has_original && (
+                                                    <div className="mt-2">
+                                                        <button
+                                                            type="button"
+                                                            onClick={() => toggleOriginal(comm)}
+                                                            className="text-xs text-muted-foreground hover:text-foreground underline"
+                                                        >
+                                                            {originals[comm.id] ? 'Hide original' : 'View original'}
+                                                        </button>
+                                                        {originals[comm.id] && (
+                                                            <pre className="mt-2 max-h-96 overflow-auto rounded-md border bg-gray-50 p-3 text-[11px] whitespace-pre-wrap">
+                                                                {Object.entries(originals[comm.id].raw_headers).map(([key, value]) => `${key}: ${value}`).join('\n')}
+                                                                {'\n\n'}
+                                                                {originals[comm.id].full_body_text}
+                                                            </pre>
+                                                        )}
+                                                    </div>
+                                                )}
+                                                {!attachmentsLoaded(comm) && (
+                                                    <div className="mt-4 flex flex-wrap items-center gap-2">
+                                                        {attachmentNames(comm).map(filename => (
+                                                            <span key={filename} className="flex items-center gap-1 px-2 py-1 rounded-md border bg-white text-xs text-slate-700">
+                                                                <Paperclip className="h-3 w-3" />
+                                                                {filename}
+                                                            </span>
+                                                        ))}
+                                                        <Button variant="ghost" size="sm" onClick={() => loadAttachments(comm)} disabled={loadingAttachments[comm.id]}>
+                                                            <Download className="h-3.5 w-3.5 mr-1" />
+                                                            {loadingAttachments[comm.id] ? 'Loading...' : 'Show attachments'}
+                                                        </Button>
+                                                    </div>
+                                                )}
+                                                {attachmentsLoaded(comm) && comm.attachments && Object.keys(comm.attachments).length > 0 && (
                                                     <div className="mt-4 flex flex-wrap gap-2">
                                                         {Object.entries(comm.attachments).map(([filename, content]) => {
                                                             const isImage = /\.(jpg|jpeg|png|gif|webp|svg)$/i.test(filename) || (typeof content === 'string' && content.startsWith('data:image/'))
@@ -1,13 +1,14 @@
 import { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { MainLayout } from '@/components/layout/MainLayout'
-import { TicketTable } from '@/components/tickets/TicketTable'
+import { TicketTable, type TicketFilters } from '@/components/tickets/TicketTable'
 import { CreateTicketDialog } from '@/components/tickets/CreateTicketDialog'
 import { Button } from '@/components/ui/Button'
 import { Badge } from '@/components/ui/Badge'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/Card'
-import { Plus, Ticket as TicketIcon, Clock, CheckCircle, AlertCircle } from 'lucide-react'
-import type { Ticket } from '@/lib/types'
+import { Input } from '@/components/ui/Input'
+import { Plus, Ticket as TicketIcon, Clock, CheckCircle, AlertCircle, Search, X } from 'lucide-react'
+import type { Ticket, TicketCounts, TicketSearchResult } from '@/lib/types'
 import { api } from '@/lib/api'
 
 import { useStreamGroup, useMotiaStream } from '@motiadev/stream-client-react'
@@ -15,19 +16,29 @@ import { useStreamGroup, useMotiaStream } from '@motiadev/stream-client-react'
 export default function Tickets() {
     const navigate = useNavigate()
     const [tickets, setTickets] = useState<Ticket[]>([])
+    const [counts, setCounts] = useState<TicketCounts | null>(null)
+    const [filters, setFilters] = useState<TicketFilters>({})
     const [isCreateDialogOpen, setIsCreateDialogOpen] = useState(false)
     const [loading, setLoading] = useState(true)
+    const [nextCursor, setNextCursor] = useState<string | null>(null)
+    const [loadingMore, setLoadingMore] = useState(false)
     const [fetchTime, setFetchTime] = useState<Date | null>(null)
+    const [searchQuery, setSearchQuery] = useState('')
+    const [searchResults, setSearchResults] = useState<TicketSearchResult[] | null>(null)
+    const [searchCursor, setSearchCursor] = useState<string | null>(null)
+    const [searching, setSearching] = useState(false)
     const { data: streamedTickets } = useStreamGroup({ streamName: 'tickets', groupId: 'all' })
     const { stream } = useMotiaStream()
 
-    const fetchTickets = async () => {
+    const fetchTickets = async (nextFilters: TicketFilters = filters, withCounts = true) => {
         setLoading(true)
         try {
             const now = new Date()
-            const data = await api.getTickets()
-            setTickets(data)
+            const page = await api.getTickets({ ...nextFilters, counts: withCounts || undefined })
+            setTickets(page.data)
+            setNextCursor(page.next_cursor)
             setFetchTime(now)
+            if (page.counts) setCounts(page.counts)
         } catch (error) {
             console.error('Failed to fetch tickets:', error)
         } finally {
@@ -35,6 +46,49 @@ export default function Tickets() {
         }
     }
 
+    const loadMoreTickets = async () => {
+        if (!nextCursor) return
+        setLoadingMore(true)
+        try {
+            const page = await api.getTickets({ ...filters, cursor: nextCursor })
+            setTickets(prev => [...prev, ...page.data.filter(t => !prev.some(p => p.name === t.name))])
+            setNextCursor(page.next_cursor)
+        } catch (error) {
+            console.error('Failed to fetch more tickets:', error)
+        } finally {
+            setLoadingMore(false)
+        }
+    }
+
+    const searchTickets = async (cursor?: string) => {
+        const q = searchQuery.trim()
+        if (!q) {
+            clearSearch()
+            return
+        }
+        setSearching(true)
+        try {
+            const page = await api.searchTickets({ q, cursor })
+            setSearchResults(prev => cursor && prev ? [...prev, ...page.data] : page.data)
+            setSearchCursor(page.next_cursor)
+        } catch (error) {
+            console.error('Failed to search tickets:', error)
+        } finally {
+            setSearching(false)
+        }
+    }
+
+    const changeFilters = (nextFilters: TicketFilters) => {
+        setFilters(nextFilters)
+        fetchTickets(nextFilters, false)
+    }
+
+    const clearSearch = () => {
+        setSearchQuery('')
+        setSearchResults(null)
+        setSearchCursor(null)
+    }
+
     useEffect(() => {
         fetchTickets()
     }, [])
@@ -64,28 +118,28 @@ export default function Tickets() {
     const stats = [
         {
             title: 'Total Tickets',
-            value: tickets.length,
+            value: counts?.total ?? 0,
             icon: TicketIcon,
             color: 'text-blue-600',
             bgColor: 'bg-blue-100',
         },
         {
             title: 'Open',
-            value: tickets.filter(t => t.status === 'Open').length,
+            value: counts?.by_status['Open'] ?? 0,
             icon: AlertCircle,
             color: 'text-orange-600',
             bgColor: 'bg-orange-100',
         },
         {
             title: 'Replied',
-            value: tickets.filter(t => t.status === 'Replied').length,
+            value: counts?.by_status['Replied'] ?? 0,
             icon: Clock,
             color: 'text-yellow-600',
             bgColor: 'bg-yellow-100',
         },
         {
             title: 'Resolved',
-            value: tickets.filter(t => t.status === 'Resolved').length,
+            value: counts?.by_status['Resolved'] ?? 0,
             icon: CheckCircle,
             color: 'text-green-600',
             bgColor: 'bg-green-100',
@@ -138,19 +192,68 @@ export default function Tickets() {
                 </div>
 
                 <Card>
-                    <CardHeader>
-                        <CardTitle>All Tickets</CardTitle>
+                    <CardHeader className="flex flex-col gap-4 sm:flex-row sm:items-center sm:justify-between space-y-0">
+                        <CardTitle>{searchResults ? 'Search Results' : 'All Tickets'}</CardTitle>
+                        <form
+                            className="flex items-center gap-2 sm:w-96"
+                            onSubmit={(e) => {
+                                e.preventDefault()
+                                searchTickets()
+                            }}
+                        >
+                            <div className="relative flex-1">
+                                <Search className="absolute left-3 top-1/2 h-4 w-4 -translate-y-1/2 text-muted-foreground" />
+                                <Input
+                                    placeholder="Search ticket contents..."
+                                    value={searchQuery}
+                                    onChange={(e) => setSearchQuery(e.target.value)}
+                                    className="pl-9"
+                                />
+                            </div>
+                            {searchResults && (
+                                <Button type="button" variant="ghost" size="icon" onClick={clearSearch}>
+                                    <X className="h-4 w-4" />
+                                </Button>
+                            )}
+                        </form>
                     </CardHeader>
                     <CardContent>
-                        {loading ? (
+                        {searchResults ? (
+                            <>
+                                <TicketTable
+                                    key="search"
+                                    tickets={searchResults}
+                                    initialSort={null}
+                                    onTicketClick={(ticket) => navigate(`/tickets/${ticket.name}`)}
+                                />
+                                {searchCursor && (
+                                    <div className="mt-4 flex justify-center">
+                                        <Button variant="outline" onClick={() => searchTickets(searchCursor)} disabled={searching}>
+                                            {searching ? 'Loading...' : 'Load more'}
+                                        </Button>
+                                    </div>
+                                )}
+                            </>
+                        ) : loading && !fetchTime ? (
                             <div className="flex h-32 items-center justify-center">
                                 <div className="h-8 w-8 animate-spin rounded-full border-4 border-primary border-t-transparent" />
                             </div>
                         ) : (
-                            <TicketTable
-                                tickets={tickets}
-                                onTicketClick={(ticket) => navigate(`/tickets/${ticket.name}`)}
-                            />
+                            <>
+                                <TicketTable
+                                    key="list"
+                                    tickets={tickets}
+                                    onFiltersChange={changeFilters}
+                                    onTicketClick={(ticket) => navigate(`/tickets/${ticket.name}`)}
+                                />
+                                {nextCursor && (
+                                    <div className="mt-4 flex justify-center">
+                                        <Button variant="outline" onClick={loadMoreTickets} disabled={loadingMore}>
+                                            {loadingMore ? 'Loading...' : 'Load more'}
+                                        </Button>
+                                    </div>
+                                )}
+                            </>
                         )}
                     </CardContent>
                 </Card>
@@ -158,7 +261,7 @@ export default function Tickets() {
                 <CreateTicketDialog
                     open={isCreateDialogOpen}
                     onOpenChange={setIsCreateDialogOpen}
-                    onTicketCreated={fetchTickets}
+                    onTicketCreated={() => fetchTickets()}
                 />
             </div>
         </MainLayout>
@@ -1,10 +1,10 @@
 #!/usr/bin/python3
 
-import os
 from datetime import datetime
-from supabase import create_client, Client
 from src.ticket.store.ticket import Ticket
+from src.middleware.auth import get_service_client
 from src.ai.service.gemini import GeminiService
+from src.storage.service.payload import check_in
 
 config = {
     "name": "Ticket Orchestrator",
@@ -22,15 +22,12 @@ async def handler(input, ctx):
         ctx.logger.warn(f"{str(e)}. Skipping AI orchestration.")
         return
 
-    supabase_url = os.environ.get('SUPABASE_URL')
-    supabase_key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or os.environ.get('SUPABASE_KEY')
-
-    if not supabase_url or not supabase_key:
-        ctx.logger.error("SUPABASE_URL or SUPABASE_KEY/SUPABASE_SERVICE_ROLE_KEY not set")
+    supabase = get_service_client()
+    if supabase is None:
+        ctx.logger.error("SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY not set")
         return
 
-    supabase: Client = create_client(supabase_url, supabase_key)
-    ticket_store = Ticket(supabase, None)
+    ticket_store = Ticket(supabase, None, supabase)
 
     ticket_data = input
     ticket_id = ticket_data.get('name') or ticket_data.get('ticket')
@@ -57,8 +54,7 @@ async def handler(input, ctx):
 
     try:
         await stream_event("fetching_context", "Fetching teams, priorities, and knowledge base...")
-        teams_res = supabase.table('Team').select('name, description').execute()
-        priorities_res = supabase.table('Priority').select('name, description').execute()
+        reference = ticket_store.reference
         kb_res = supabase.table('Knowledge_Base').select('title, content').execute()
 
         await stream_event("fetching_history", "Retrieving conversation history...")
@@ -107,8 +103,8 @@ async def handler(input, ctx):
                     "resolution": comm_res.data[0]['body']
                 })
 
-        teams = teams_res.data
-        priorities = [p['name'] for p in priorities_res.data]
+        teams = [{'name': t['name'], 'description': t.get('description')} for t in reference.teams]
+        priorities = [p['name'] for p in reference.priorities]
         kb_articles = kb_res.data
 
         if not teams or not priorities:
@@ -116,7 +112,7 @@ async def handler(input, ctx):
             await stream_event("completed", "Error: Missing configuration.")
             return
 
-        ticket = ticket_store.get_by_id(ticket_id)
+        ticket = ticket_store.get_by_id(ticket_id, 'name, subject, description, channel, status')
         if not ticket:
             ctx.logger.error(f"Ticket {ticket_id} not found in DB.")
             await stream_event("completed", "Error: Ticket not found.")
@@ -173,7 +169,7 @@ async def handler(input, ctx):
                 })
                 await ctx.emit({
                     "topic": "ticket.replied",
-                    "data": c
+                    "data": check_in(c)
                 })
 
             ctx.logger.info(f"Ticket {ticket_id} auto-resolved by AI.")
@@ -199,7 +195,7 @@ async def handler(input, ctx):
                 })
                 await ctx.emit({
                     "topic": "ticket.replied",
-                    "data": c
+                    "data": check_in(c)
                 })
 
 
@@ -209,10 +205,10 @@ async def handler(input, ctx):
 
         elif not res.needs_more_info and not res.can_resolve:
 
-            sla_res = supabase.table('SLA').select('resolution_time').eq('priority', assigned_priority).execute()
+            sla = reference.sla_for(assigned_priority)
             est_time = "a few days"
-            if sla_res.data:
-                est_time = sla_res.data[0]['resolution_time']
+            if sla:
+                est_time = sla['resolution_time']
 
             confirmation_msg = (
                 f"Thank you for providing the details. We have received your request and assigned it to our {assigned_group}.\n\n"
@@ -243,7 +239,7 @@ async def handler(input, ctx):
                     })
                     await ctx.emit({
                         "topic": "ticket.replied",
-                        "data": c
+                        "data": check_in(c)
                     })
 
 
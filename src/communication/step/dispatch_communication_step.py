@@ -3,6 +3,7 @@
 import os
 from supabase import create_client, Client
 from src.email.service.email import EmailService
+from src.storage.service.payload import check_out
 
 config = {
     "name": "Communication Dispatcher",
@@ -20,6 +21,7 @@ async def handler(input, ctx):
     if direction != 'Outbound':
         return
 
+    comm_data = check_out(input, 'body', 'attachments')
     ticket_id = comm_data.get('ticket')
     body = comm_data.get('body')
 
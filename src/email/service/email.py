@@ -11,6 +11,7 @@ import email.policy
 from email.message import EmailMessage
 from email.utils import parseaddr, formataddr, make_msgid, parsedate_to_datetime
 from src.models.models import InboundEmail, Attachment
+from src.storage.service.blob import get_blob_store, is_blob_ref
 
 class EmailService:
     def __init__(self):
@@ -104,13 +105,12 @@ class EmailService:
                 filename = part.get_filename()
                 if filename:
                     try:
-                        file_data = part.get_payload(decode=True)
-                        encoded_data = base64.b64encode(file_data).decode('utf-8')
+                        ref = get_blob_store().put(part.get_payload(decode=True), ctype)
                         attachments.append(Attachment(
                             filename=filename,
                             mime_type=ctype,
-                            size_bytes=len(file_data),
-                            data=encoded_data
+                            size_bytes=ref['size'],
+                            sha256=ref['sha256']
                         ))
                     except Exception as e:
                         print(f"Could not process attachment {filename}: {e}")
@@ -156,7 +156,7 @@ class EmailService:
         body: str,
         reply_to_message_id: str | None = None,
         references_chain: list[str] | None = None,
-        attachments: dict[str, str] | None = None
+        attachments: dict[str, dict | str] | None = None
     ) -> str | None:
         msg = EmailMessage()
         msg['From'] = formataddr((self.EMAIL_USER.split('@')[0], self.EMAIL_USER))
@@ -170,9 +170,18 @@ class EmailService:
             msg['References'] = ' '.join(references_chain)
 
         if attachments:
+            store = get_blob_store()
             for filename, data_url in attachments.items():
                 try:
-                    if ',' in data_url:
+                    if is_blob_ref(data_url):
+                        maintype, subtype = data_url['mime_type'].split('/', 1)
+                        msg.add_attachment(
+                            b''.join(store.iter_chunks(data_url['sha256'])),
+                            maintype=maintype,
+                            subtype=subtype,
+                            filename=filename
+                        )
+                    elif ',' in data_url:
                         header, encoded = data_url.split(',', 1)
                         mime_type = header.split(':')[1].split(';')[0]
                         maintype, subtype = mime_type.split('/', 1)
@@ -2,6 +2,7 @@
 
 from src.email.service.email import EmailService
 from src.models.models import InboundEmail
+from src.storage.service.payload import check_in
 
 config = {
     "type": "cron",
@@ -19,5 +20,5 @@ async def handler(ctx):
         ctx.logger.info(f'Email received: {e.subject}')
         await ctx.emit({
             "topic": "email.received",
-            "data": e.model_dump(mode='json')
+            "data": check_in(e.model_dump(mode='json'))
         })
@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+
+import math
+
+# DDSketch with the same mapping as sketch_key() in db_setup.sql. Every value
+# of at least MIN_VALUE seconds is returned within RELATIVE_ACCURACY of the true
+# quantile; shorter durations land in the zero bucket and are reported as 0.
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+MIN_VALUE = 1.0
+QUANTILES = {'p50': 0.5, 'p90': 0.9, 'p99': 0.99}
+
+
+class DDSketch:
+    def __init__(self, count: int = 0, zero_count: int = 0, bins: dict[int, int] | None = None):
+        self.count = count
+        self.zero_count = zero_count
+        self.bins = bins or {}
+
+    @classmethod
+    def from_row(cls, row: dict) -> 'DDSketch':
+        bins = {int(k): int(v) for k, v in (row.get('merged') or {}).items()}
+        return cls(int(row.get('total') or 0), int(row.get('zeros') or 0), bins)
+
+    @staticmethod
+    def key(value: float) -> int | None:
+        return math.ceil(math.log(value) / math.log(GAMMA)) if value >= MIN_VALUE else None
+
+    @staticmethod
+    def value(key: int) -> float:
+        return 2 * GAMMA ** key / (GAMMA + 1)
+
+    def add(self, value: float, count: int = 1):
+        key = self.key(value)
+        self.count += count
+        if key is None:
+            self.zero_count += count
+        else:
+            self.bins[key] = self.bins.get(key, 0) + count
+
+    def merge(self, other: 'DDSketch'):
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        if self.count <= 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return self.value(key)
+        return self.value(max(self.bins)) if self.bins else 0.0
+
+    def summary(self, scale: float = 1.0) -> dict:
+        result = {'count': self.count}
+        for name, q in QUANTILES.items():
+            value = self.quantile(q)
+            result[name] = round(value / scale, 2) if value is not None else None
+        return result
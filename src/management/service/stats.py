@@ -0,0 +1,209 @@
+#!/usr/bin/python3
+
+from datetime import datetime, date, timedelta, timezone
+from supabase import Client
+from src.models.interval import HOUR, column_seconds
+from src.management.service.sketch import DDSketch, RELATIVE_ACCURACY
+from src.management.store.directory import DirectoryCache, display_name
+
+PERIOD_DAYS = {'7d': 7, '30d': 30, '3m': 90, '6m': 180, '1y': 365}
+STATUS_COLUMNS = {
+    'open': 'open',
+    'replied': 'replied',
+    'on hold': 'on_hold',
+    'resolved': 'resolved',
+    'closed': 'closed'
+}
+SKETCH_METRICS = {
+    'first_response': 'first_response_hours',
+    'resolution': 'resolution_hours',
+    'hold': 'hold_time_hours'
+}
+SKETCH_DIMENSIONS = ('team', 'priority')
+SUM_COLUMNS = (
+    'total', *STATUS_COLUMNS.values(), 'bot_resolved', 'sla_breached',
+    'first_response_count', 'first_response_seconds', 'resolution_count', 'resolution_seconds',
+    'hold_count', 'hold_seconds'
+)
+
+
+def _parse_timestamp(value) -> datetime:
+    return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+
+
+def _average_hours(seconds, count: int) -> float | None:
+    return round(float(seconds) / count / HOUR, 2) if count else None
+
+
+def period_start(period: str, today: date | None = None) -> date | None:
+    today = today or datetime.now(timezone.utc).date()
+    if period == 'today':
+        return today
+    if period in PERIOD_DAYS:
+        return today - timedelta(days=PERIOD_DAYS[period])
+    return None
+
+
+def summarize_tickets(tickets: list[dict]) -> tuple[dict, dict[str, dict]]:
+    totals = dict.fromkeys(SUM_COLUMNS, 0)
+    agents = {}
+    totals['total'] = len(tickets)
+    for t in tickets:
+        column = STATUS_COLUMNS.get((t.get('status') or '').lower())
+        if column:
+            totals[column] += 1
+        if t.get('resolved_by_bot'):
+            totals['bot_resolved'] += 1
+        if t.get('agreement_status') == 'Failed':
+            totals['sla_breached'] += 1
+        if t.get('resolved_by') and t.get('status') in ('Resolved', 'Closed'):
+            counts = agents.setdefault(str(t['resolved_by']), {'resolved_count': 0, 'closed_count': 0})
+            counts['resolved_count' if t['status'] == 'Resolved' else 'closed_count'] += 1
+        if t.get('resolution_date') and t.get('creation'):
+            try:
+                delta = _parse_timestamp(t['resolution_date']) - _parse_timestamp(t['creation'])
+            except ValueError:
+                continue
+            totals['resolution_count'] += 1
+            totals['resolution_seconds'] += delta.total_seconds()
+
+    for prefix, column in (('first_response', 'first_response_time'), ('hold', 'total_hold_time')):
+        seconds = [s for s in column_seconds(t.get(column) for t in tickets) if s is not None]
+        totals[f'{prefix}_count'] = len(seconds)
+        totals[f'{prefix}_seconds'] = sum(seconds)
+    return totals, agents
+
+
+class StatsService:
+    PAGE_SIZE = 1000
+
+    def __init__(self, supabase: Client):
+        self.supabase = supabase
+
+    def get(self, period: str = 'all', start: datetime | None = None, end: datetime | None = None, percentiles_by: str | None = None) -> dict:
+        if percentiles_by and percentiles_by not in SKETCH_DIMENSIONS:
+            raise ValueError(f"percentiles_by must be one of {', '.join(SKETCH_DIMENSIONS)}")
+
+        if start and end:
+            stats = self.from_tickets(start, end)
+            first_day, last_day = start.date(), end.date()
+        else:
+            first_day, last_day = period_start(period), None
+            stats = self.from_rollups(first_day)
+
+        stats['percentiles'] = self.percentiles(first_day, last_day).get('', self._empty_percentiles())
+        if percentiles_by:
+            stats[f'percentiles_by_{percentiles_by}'] = [
+                {percentiles_by: group or None, **summary}
+                for group, summary in self.percentiles(first_day, last_day, percentiles_by).items()
+            ]
+        return stats
+
+    def percentiles(self, start: date | None = None, end: date | None = None, dimension: str | None = None) -> dict[str, dict]:
+        rows = self.supabase.rpc('merge_ticket_sketches', {
+            'p_start': start.isoformat() if start else None,
+            'p_end': end.isoformat() if end else None,
+            'p_dimension': dimension
+        }).execute().data or []
+
+        groups = {}
+        for row in rows:
+            metric = SKETCH_METRICS.get(row['sketch_metric'])
+            if metric:
+                summary = groups.setdefault(row['sketch_group'], self._empty_percentiles())
+                summary[metric] = DDSketch.from_row(row).summary(HOUR)
+        return groups
+
+    def from_rollups(self, start: date | None = None, end: date | None = None) -> dict:
+        totals = dict.fromkeys(SUM_COLUMNS, 0)
+        for row in self._rows('Ticket_Daily_Stats', ', '.join(SUM_COLUMNS), ('day',), start, end):
+            for column in SUM_COLUMNS:
+                totals[column] += row[column] or 0
+
+        agents = {}
+        for row in self._rows('Ticket_Daily_Agent_Stats', 'agent, resolved_count, closed_count', ('day', 'agent'), start, end):
+            counts = agents.setdefault(row['agent'], {'resolved_count': 0, 'closed_count': 0})
+            counts['resolved_count'] += row['resolved_count']
+            counts['closed_count'] += row['closed_count']
+        return self._payload(totals, agents)
+
+    def from_tickets(self, start: datetime | None = None, end: datetime | None = None) -> dict:
+        return self.supabase.rpc('ticket_stats', {
+            'p_start': start.isoformat() if start else None,
+            'p_end': end.isoformat() if end else None
+        }).execute().data
+
+    def scan_tickets(self, start: datetime | None = None, end: datetime | None = None) -> dict:
+        tickets = []
+        offset = 0
+        while True:
+            query = self.supabase.table('Ticket').select(
+                'name, status, resolved_by_bot, resolved_by, agreement_status, creation, '
+                'resolution_date, first_response_time, total_hold_time'
+            )
+            if start:
+                query = query.gte('creation', start.isoformat())
+            if end:
+                query = query.lte('creation', end.isoformat())
+            page = query.order('name').range(offset, offset + self.PAGE_SIZE - 1).execute().data or []
+            tickets.extend(page)
+            if len(page) < self.PAGE_SIZE:
+                break
+            offset += self.PAGE_SIZE
+        totals, agents = summarize_tickets(tickets)
+        return self._payload(totals, agents)
+
+    def _rows(self, table: str, columns: str, order: tuple[str, ...], start: date | None, end: date | None) -> list[dict]:
+        rows = []
+        offset = 0
+        while True:
+            query = self.supabase.table(table).select(columns)
+            if start:
+                query = query.gte('day', start.isoformat())
+            if end:
+                query = query.lte('day', end.isoformat())
+            for column in order:
+                query = query.order(column)
+            page = query.range(offset, offset + self.PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < self.PAGE_SIZE:
+                return rows
+            offset += self.PAGE_SIZE
+
+    def _empty_percentiles(self) -> dict:
+        return {
+            'relative_accuracy': RELATIVE_ACCURACY,
+            **{metric: DDSketch().summary(HOUR) for metric in SKETCH_METRICS.values()}
+        }
+
+    def _agent_performance(self, agents: dict[str, dict]) -> list[dict]:
+        agents = {k: v for k, v in agents.items() if v['resolved_count'] or v['closed_count']}
+        if not agents:
+            return []
+
+        directory = DirectoryCache(self.supabase).get_many(agents)
+        performance = []
+        for agent_id, counts in agents.items():
+            entry = directory.get(agent_id)
+            email = (entry or {}).get('email') or 'Unknown'
+            performance.append({
+                'agent_id': agent_id,
+                'email': email,
+                'name': display_name(entry) or email,
+                **counts
+            })
+        performance.sort(key=lambda a: (-(a['resolved_count'] + a['closed_count']), a['name']))
+        return performance
+
+    def _payload(self, totals: dict, agents: dict[str, dict]) -> dict:
+        total = totals['total']
+        return {
+            'total_tickets': total,
+            'status_counts': {status: totals[column] for status, column in STATUS_COLUMNS.items()},
+            'bot_resolved': totals['bot_resolved'],
+            'agent_performance': self._agent_performance(agents),
+            'avg_first_response_hours': _average_hours(totals['first_response_seconds'], totals['first_response_count']),
+            'avg_resolution_hours': _average_hours(totals['resolution_seconds'], totals['resolution_count']),
+            'sla_compliance': round((total - totals['sla_breached']) / total * 100, 1) if total else 100.0,
+            'avg_hold_time_hours': _average_hours(totals['hold_seconds'], totals['hold_count'])
+        }
@@ -19,7 +19,7 @@ config = {
 
 async def handler(req, ctx):
     supabase = req['supabase']
-    store = PriorityStore(supabase)
+    store = PriorityStore(supabase, req['service'])
     try:
         priority_data = Priority(**req.get("body", {}))
         res = store.create(priority_data.model_dump(exclude_unset=True))
@@ -19,7 +19,7 @@ config = {
 
 async def handler(req, ctx):
     supabase = req['supabase']
-    store = SLAStore(supabase)
+    store = SLAStore(supabase, req['service'])
     try:
         sla_data = SLA(**req.get("body", {}))
         res = store.create(sla_data.model_dump(exclude_unset=True))
@@ -19,7 +19,7 @@ config = {
 
 async def handler(req, ctx):
     supabase = req['supabase']
-    store = TeamStore(supabase)
+    store = TeamStore(supabase, req['service'])
     try:
         team_data = Team(**req.get("body", {}))
         res = store.create(team_data.model_dump(exclude_unset=True))
@@ -17,6 +17,6 @@ config = {
 async def handler(req, ctx):
     name = req.get("pathParams", {}).get("name")
     supabase = req['supabase']
-    store = TeamStore(supabase)
+    store = TeamStore(supabase, req['service'])
     res = store.delete(name)
     return {"status": 200, "body": res}
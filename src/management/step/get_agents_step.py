@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 from src.middleware.auth import auth
+from src.management.store.directory import DirectoryCache
 
 config = {
     "name": "Get Agents",
@@ -15,8 +16,11 @@ config = {
 
 async def handler(req, ctx):
     supabase = req['supabase']
+    user_id = str(req['user'].id)
 
-    query = supabase.table('Role').select('user, name, Profile(*)').eq('name', 'Agent')
-    res = query.execute()
+    agents = DirectoryCache(req['service']).agents()
+    if not supabase.rpc('is_manager', {'user_uuid': user_id}).execute().data:
+        agents = [a for a in agents if a['id'] == user_id]
 
-    return {"status": 200, "body": res.data}
+    body = [{"user": a['id'], "name": a['role'], "Profile": a['profile']} for a in agents]
+    return {"status": 200, "body": body}
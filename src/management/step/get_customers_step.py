@@ -7,7 +7,7 @@ config = {
     "name": "Get Customers",
     "type": "api",
     "method": "GET",
-    "description": "Get all customers",
+    "description": "Get a page of customers, optionally filtered by a search term",
     "path": "/management/customers",
     "middleware": [auth],
     "emits": [],
@@ -18,18 +18,12 @@ async def handler(req, ctx):
     supabase = req['supabase']
     store = CustomerStore(supabase)
     query_params = req.get('queryParams', {})
-    search = query_params.get('search')
-    if search:
-        res = supabase.table('Customer').select('*').or_(f"name.ilike.%{search}%,full_name.ilike.%{search}%").execute()
-        customers = res.data
-    else:
-        customers = store.get_all()
-    return {
-        "status": 200,
-        "body": {
-            "data": customers,
-            "total": len(customers),
-            "page": 1,
-            "limit": len(customers)
-        }
-    }
+    try:
+        page = store.get_page(
+            search=query_params.get('search'),
+            limit=query_params.get('limit'),
+            cursor=query_params.get('cursor')
+        )
+    except ValueError as e:
+        return {"status": 400, "body": {"error": str(e)}}
+    return {"status": 200, "body": page}
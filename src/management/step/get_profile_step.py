@@ -16,10 +16,8 @@ config = {
 
 async def handler(req, ctx):
     supabase = req['supabase']
-    token = req['token']
-
-    user = supabase.auth.get_user(token)
-    user_id = user.user.id
+    user = req['user']
+    user_id = user.id
 
     store = ProfileStore(supabase)
     profile = store.get_by_id(user_id)
@@ -27,11 +25,11 @@ async def handler(req, ctx):
     if not profile:
         profile = {
             "id": user_id,
-            "email": user.user.email,
-            "full_name": user.user.user_metadata.get('full_name', ''),
-            "avatar_url": user.user.user_metadata.get('avatar_url', '')
+            "email": user.email,
+            "full_name": user.user_metadata.get('full_name', ''),
+            "avatar_url": user.user_metadata.get('avatar_url', '')
         }
     else:
-        profile['email'] = user.user.email
+        profile['email'] = user.email
 
     return {"status": 200, "body": profile}
@@ -16,8 +16,7 @@ config = {
 
 async def handler(req, ctx):
     supabase = req['supabase']
-    token = req['token']
-    user_id = supabase.auth.get_user(token).user.id
+    user_id = req['user'].id
     is_manager = supabase.rpc('is_manager', {'user_uuid': user_id}).execute().data
     is_admin = supabase.rpc('is_admin_agent', {'user_uuid': user_id}).execute().data
     if not (is_manager or is_admin):
@@ -17,6 +17,6 @@ config = {
 async def handler(req, ctx):
     team = req.get("pathParams", {}).get("team")
     supabase = req['supabase']
-    store = MembershipStore(supabase)
+    store = MembershipStore(supabase, req['service'])
     members = store.get_by_team(team)
     return {"status": 200, "body": members}
@@ -3,12 +3,13 @@
 import os
 from supabase import create_client, Client
 from src.middleware.auth import auth
+from src.management.store.directory import DirectoryCache
 
 config = {
     "name": "Get All Users",
     "type": "api",
     "method": "GET",
-    "description": "Get all users from Supabase Auth (Admin only)",
+    "description": "Get all users from the cached user directory (Admin only)",
     "path": "/management/users",
     "middleware": [auth],
     "emits": [],
@@ -29,16 +30,7 @@ async def handler(req, ctx):
     supabase: Client = create_client(supabase_url, service_role_key)
 
     try:
-        res = supabase.auth.admin.list_users()
-        users_data = res.users if hasattr(res, 'users') else res
-
-        users = []
-        for user in users_data:
-            users.append({
-                "id": user.id,
-                "email": user.email,
-            })
-
+        users = [{"id": e['id'], "email": e['email']} for e in DirectoryCache(supabase).get_all() if e['profile']]
         return {"status": 200, "body": users}
     except Exception as e:
         ctx.logger.error(f"Failed to list users: {str(e)}")
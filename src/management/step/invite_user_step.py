@@ -3,6 +3,8 @@
 import os
 from supabase import create_client, Client
 from src.middleware.auth import auth
+from src.management.store.directory import DirectoryCache
+from src.management.store.reference import ReferenceCache
 
 config = {
     "name": "Invite User",
@@ -17,8 +19,7 @@ config = {
 
 async def handler(req, ctx):
     supabase = req['supabase']
-    token = req['token']
-    user_id = supabase.auth.get_user(token).user.id
+    user_id = req['user'].id
 
     is_manager = supabase.rpc('is_manager', {'user_uuid': user_id}).execute().data
     is_admin = supabase.rpc('is_admin_agent', {'user_uuid': user_id}).execute().data
@@ -49,6 +50,9 @@ async def handler(req, ctx):
                 "name": "Agent"
             }).execute()
 
+            DirectoryCache(supabase).invalidate(user.id)
+            ReferenceCache(supabase).invalidate()
+
             return {
                 "status": 201,
                 "body": {
@@ -16,8 +16,7 @@ config = {
 
 async def handler(req, ctx):
     supabase = req['supabase']
-    token = req['token']
-    user_id = supabase.auth.get_user(token).user.id
+    user_id = req['user'].id
 
     is_manager = supabase.rpc('is_manager', {'user_uuid': user_id}).execute().data
     is_admin = supabase.rpc('is_admin_agent', {'user_uuid': user_id}).execute().data
@@ -27,6 +26,6 @@ async def handler(req, ctx):
 
     team = req.get("pathParams", {}).get("team")
     user = req.get("pathParams", {}).get("user")
-    store = MembershipStore(supabase)
+    store = MembershipStore(supabase, req['service'])
     res = store.remove_member(team, user)
     return {"status": 200, "body": res}
@@ -20,7 +20,7 @@ config = {
 async def handler(req, ctx):
     id = req.get("pathParams", {}).get("id")
     supabase = req['supabase']
-    store = PriorityStore(supabase)
+    store = PriorityStore(supabase, req['service'])
     try:
         priority_data = Priority(**req.get("body", {}))
         priority = store.update(id, priority_data.model_dump(exclude_unset=True))
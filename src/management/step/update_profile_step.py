@@ -2,6 +2,7 @@
 
 from src.management.store.profile import ProfileStore
 from src.middleware.auth import auth
+from src.management.store.directory import DirectoryCache
 
 config = {
     "name": "Update Profile",
@@ -16,13 +17,12 @@ config = {
 
 async def handler(req, ctx):
     supabase = req['supabase']
-    token = req['token']
-
-    user = supabase.auth.get_user(token)
-    user_id = user.user.id
+    user = req['user']
+    user_id = user.id
 
     store = ProfileStore(supabase)
     updated_profile = store.update(user_id, req.get('body', {}))
+    DirectoryCache(req['service']).invalidate(user_id)
 
     await ctx.emit({
         "topic": "profile.updated",
@@ -19,8 +19,7 @@ config = {
 
 async def handler(req, ctx):
     supabase = req['supabase']
-    token = req['token']
-    user_id = supabase.auth.get_user(token).user.id
+    user_id = req['user'].id
 
     is_manager = supabase.rpc('is_manager', {'user_uuid': user_id}).execute().data
     is_admin = supabase.rpc('is_admin_agent', {'user_uuid': user_id}).execute().data
@@ -28,7 +27,7 @@ async def handler(req, ctx):
     if not (is_manager or is_admin):
         return {"status": 403, "body": {"error": "Only System Managers and Admin Agents can update settings"}}
 
-    store = SettingsStore(supabase)
+    store = SettingsStore(supabase, req['service'])
     try:
         settings_data = SystemSettings(**req.get("body", {}))
         res = store.update_global(settings_data.model_dump(exclude_unset=True))
@@ -20,7 +20,7 @@ config = {
 async def handler(req, ctx):
     name = req.get("pathParams", {}).get("name")
     supabase = req['supabase']
-    store = SLAStore(supabase)
+    store = SLAStore(supabase, req['service'])
     try:
         sla_data = SLA(**req.get("body", {}))
         res = store.update(name, sla_data.model_dump(exclude_unset=True))
@@ -20,7 +20,7 @@ config = {
 async def handler(req, ctx):
     name = req.get("pathParams", {}).get("name")
     supabase = req['supabase']
-    store = TeamStore(supabase)
+    store = TeamStore(supabase, req['service'])
     try:
         team_data = Team(**req.get("body", {}))
         res = store.update(name, team_data.model_dump(exclude_unset=True))
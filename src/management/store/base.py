@@ -1,10 +1,14 @@
 #!/usr/bin/python3
 
 from supabase import Client
+from src.management.store.reference import ReferenceCache
 
 class BaseStore:
-    def __init__(self, supabase: Client, table_name: str):
+    reference = False
+
+    def __init__(self, supabase: Client, table_name: str, service: Client | None = None):
         self.supabase = supabase
+        self.service = service
         self.table_name = table_name
         self.table = self.supabase.table(self.table_name)
 
@@ -21,13 +25,27 @@ class BaseStore:
         return res.data[0] if res.data else {}
 
     def create(self, obj: dict) -> dict:
+        self._check_writable()
         res = self.table.insert(obj).execute()
+        self._changed()
         return res.data[0] if res.data else {}
 
     def update(self, id_val: any, obj: dict, id_col: str = 'name') -> dict:
+        self._check_writable()
         res = self.table.update(obj).eq(id_col, id_val).execute()
+        self._changed()
         return res.data[0] if res.data else {}
 
     def delete(self, id_val: any, id_col: str = 'name') -> dict:
+        self._check_writable()
         res = self.table.delete().eq(id_col, id_val).execute()
+        self._changed()
         return res.data[0] if res.data else {}
+
+    def _check_writable(self):
+        if self.reference and self.service is None:
+            raise RuntimeError(f"{type(self).__name__} writes require the service client (SUPABASE_SERVICE_ROLE_KEY)")
+
+    def _changed(self):
+        if self.reference:
+            ReferenceCache(self.service).invalidate()
@@ -1,7 +1,35 @@
 #!/usr/bin/python3
 
 from src.management.store.base import BaseStore
+from src.management.store.resolver import CustomerResolver
 
 class CustomerStore(BaseStore):
+    PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
     def __init__(self, supabase):
         super().__init__(supabase, 'Customer')
+
+    def get_page(self, search: str | None = None, limit: int | None = None, cursor: str | None = None) -> dict:
+        limit = max(1, min(int(limit or self.PAGE_SIZE), self.MAX_PAGE_SIZE))
+        count = None if cursor else 'estimated'
+        search = (search or '').strip()
+
+        if search:
+            query = self.supabase.rpc('search_customers', {'p_query': search}, count=count)
+        else:
+            query = self.supabase.table('Customer').select('*', count=count)
+        if cursor:
+            query = query.gt('name', cursor)
+
+        res = query.order('name').limit(limit + 1).execute()
+        customers = res.data
+        next_cursor = None
+        if len(customers) > limit:
+            customers = customers[:limit]
+            next_cursor = customers[-1]['name']
+
+        return {'data': customers, 'next_cursor': next_cursor, 'limit': limit, 'total': res.count}
+
+    def _changed(self):
+        CustomerResolver.clear()
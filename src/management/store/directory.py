@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+
+import os
+import time
+import threading
+from typing import Iterable
+from supabase import Client
+
+
+def _entry(user_id: str, profile: dict | None, role: str | None) -> dict:
+    profile = profile or {}
+    return {
+        'id': user_id,
+        'email': profile.get('email'),
+        'full_name': profile.get('full_name'),
+        'role': role,
+        'profile': profile or None
+    }
+
+
+def display_name(entry: dict | None) -> str | None:
+    if not entry:
+        return None
+    return entry.get('full_name') or entry.get('email')
+
+
+class DirectoryCache:
+    TTL = float(os.environ.get('DIRECTORY_CACHE_TTL', 300))
+    CHECK_INTERVAL = float(os.environ.get('DIRECTORY_CACHE_CHECK_INTERVAL', 30))
+    LOAD_PAGE = 1000
+    LOOKUP_BATCH = 200
+
+    _entries: dict[str, tuple[float, dict | None]] = {}
+    _loaded_at = 0.0
+    _version: int | None = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    def __init__(self, service: Client | None):
+        if service is None:
+            raise RuntimeError("DirectoryCache requires the service client (SUPABASE_SERVICE_ROLE_KEY)")
+        self.supabase = service
+
+    def get(self, user_id: str) -> dict | None:
+        return self.get_many([user_id]).get(str(user_id))
+
+    def get_many(self, user_ids: Iterable) -> dict[str, dict]:
+        ids = {str(i) for i in user_ids if i}
+        now = time.monotonic()
+        self._sync(now)
+        found = {}
+        missing = []
+        with self._lock:
+            for user_id in ids:
+                cached = DirectoryCache._entries.get(user_id)
+                if cached and now - cached[0] < self.TTL:
+                    if cached[1] is not None:
+                        found[user_id] = cached[1]
+                else:
+                    missing.append(user_id)
+
+        if missing:
+            loaded = self._lookup(missing)
+            with self._lock:
+                for user_id in missing:
+                    DirectoryCache._entries[user_id] = (now, loaded.get(user_id))
+            found.update(loaded)
+        return found
+
+    def get_all(self) -> list[dict]:
+        now = time.monotonic()
+        self._sync(now)
+        with self._lock:
+            if now - DirectoryCache._loaded_at < self.TTL:
+                entries = [e for _, e in DirectoryCache._entries.values() if e is not None]
+                return sorted(entries, key=lambda e: (e['email'] or '', e['id']))
+
+        profiles = self._paged('Profile', '*', 'id')
+        roles = self._paged('Role', 'user, name', 'user')
+        entries = self._build(profiles, roles)
+        with self._lock:
+            DirectoryCache._entries = {user_id: (now, e) for user_id, e in entries.items()}
+            DirectoryCache._loaded_at = now
+        return sorted(entries.values(), key=lambda e: (e['email'] or '', e['id']))
+
+    def agents(self) -> list[dict]:
+        return [e for e in self.get_all() if e['role'] == 'Agent']
+
+    def invalidate(self, user_id: str | None = None):
+        with self._lock:
+            if user_id:
+                DirectoryCache._entries.pop(str(user_id), None)
+            else:
+                DirectoryCache._entries = {}
+            DirectoryCache._loaded_at = 0.0
+
+    def _sync(self, now: float):
+        with self._lock:
+            if now - DirectoryCache._checked_at < self.CHECK_INTERVAL:
+                return
+            DirectoryCache._checked_at = now
+
+        version = self._current_version()
+        with self._lock:
+            if version != DirectoryCache._version:
+                DirectoryCache._entries = {}
+                DirectoryCache._loaded_at = 0.0
+                DirectoryCache._version = version
+
+    def _current_version(self) -> int:
+        res = self.supabase.table('System_Settings').select('directory_version').eq('name', 'GLOBAL').execute()
+        return res.data[0].get('directory_version', 0) if res.data else 0
+
+    def _lookup(self, user_ids: list[str]) -> dict[str, dict]:
+        profiles, roles = [], []
+        for i in range(0, len(user_ids), self.LOOKUP_BATCH):
+            batch = user_ids[i:i + self.LOOKUP_BATCH]
+            profiles += self.supabase.table('Profile').select('*').in_('id', batch).execute().data or []
+            roles += self.supabase.table('Role').select('user, name').in_('user', batch).execute().data or []
+        return self._build(profiles, roles)
+
+    def _paged(self, table: str, columns: str, order: str) -> list[dict]:
+        rows = []
+        offset = 0
+        while True:
+            page = self.supabase.table(table).select(columns)\
+                .order(order)\
+                .range(offset, offset + self.LOAD_PAGE - 1)\
+                .execute().data or []
+            rows.extend(page)
+            if len(page) < self.LOAD_PAGE:
+                return rows
+            offset += self.LOAD_PAGE
+
+    def _build(self, profiles: list[dict], roles: list[dict]) -> dict[str, dict]:
+        profile_map = {str(p['id']): p for p in profiles}
+        role_map = {str(r['user']): r['name'] for r in roles}
+        return {
+            user_id: _entry(user_id, profile_map.get(user_id), role_map.get(user_id))
+            for user_id in set(profile_map) | set(role_map)
+        }
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 from src.management.store.base import BaseStore
+from src.management.store.resolver import CustomerResolver, normalize_handle
 
 class HandleStore(BaseStore):
     def __init__(self, supabase):
@@ -10,8 +11,12 @@ class HandleStore(BaseStore):
         return self.get_all_filtered('customer', customer_name)
 
     def add_handle(self, customer_name: str, channel: str, handle: str):
+        channel, handle = normalize_handle(channel, handle)
         return self.create({
             "customer": customer_name,
             "channel": channel,
             "handle": handle
         })
+
+    def _changed(self):
+        CustomerResolver.clear()
@@ -1,10 +1,13 @@
 #!/usr/bin/python3
 
 from src.management.store.base import BaseStore
+from src.management.store.directory import DirectoryCache
 
 class MembershipStore(BaseStore):
-    def __init__(self, supabase):
-        super().__init__(supabase, 'Agent_Membership')
+    reference = True
+
+    def __init__(self, supabase, service=None):
+        super().__init__(supabase, 'Agent_Membership', service)
 
     def get_by_team(self, team_name: str):
         members = self.get_all_filtered('team', team_name)
@@ -14,16 +17,14 @@ class MembershipStore(BaseStore):
         user_ids = [m['user'] for m in members]
         if user_ids:
             try:
-                profiles_res = self.supabase.table('Profile').select('id, full_name, email').in_('id', user_ids).execute()
-                profile_map = {p['id']: p for p in profiles_res.data}
-
+                directory = DirectoryCache(self.service).get_many(user_ids)
                 for m in members:
-                    if m['user'] in profile_map:
-                        profile = profile_map[m['user']]
+                    entry = directory.get(str(m['user']))
+                    if entry and entry['profile']:
                         m['userInfo'] = {
-                            'id': profile['id'],
-                            'email': profile.get('email'),
-                            'full_name': profile.get('full_name')
+                            'id': entry['id'],
+                            'email': entry['email'],
+                            'full_name': entry['full_name']
                         }
             except Exception as e:
                 print(f"Error fetching member profiles: {e}")
@@ -37,5 +38,7 @@ class MembershipStore(BaseStore):
         })
 
     def remove_member(self, team_name: str, user: str):
+        self._check_writable()
         res = self.table.delete().eq('team', team_name).eq('user', user).execute()
+        self._changed()
         return res.data
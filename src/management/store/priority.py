@@ -3,5 +3,7 @@
 from src.management.store.base import BaseStore
 
 class PriorityStore(BaseStore):
-    def __init__(self, supabase):
-        super().__init__(supabase, 'Priority')
+    reference = True
+
+    def __init__(self, supabase, service=None):
+        super().__init__(supabase, 'Priority', service)
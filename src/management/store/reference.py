@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+
+import os
+import time
+import threading
+from supabase import Client
+
+
+class ReferenceData:
+    def __init__(self, version: int, slas: list[dict], priorities: list[dict], teams: list[dict], channels: list[dict], settings: dict, memberships: list[dict] | None = None, roles: list[dict] | None = None):
+        self.version = version
+        self.slas = slas
+        self.priorities = priorities
+        self.teams = teams
+        self.channels = channels
+        self.settings = settings
+        self.memberships = memberships or []
+        self.roles = roles or []
+        self.managers = {str(r['user']) for r in self.roles if r['name'] == 'System Manager'}
+        self.agents = {str(r['user']) for r in self.roles if r['name'] == 'Agent'}
+
+        self.slas_by_priority: dict[str, list[dict]] = {}
+        for sla in slas:
+            self.slas_by_priority.setdefault(sla['priority'], []).append(sla)
+        self.teams_by_name = {t['name']: t for t in teams}
+
+        self.rings: dict[str, list[str]] = {}
+        for m in sorted(memberships or [], key=lambda m: str(m['user'])):
+            self.rings.setdefault(m['team'], []).append(m['user'])
+
+    def sla_for(self, priority: str | None) -> dict | None:
+        slas = self.slas_by_priority.get(priority)
+        return slas[0] if slas else None
+
+    def active_channels(self) -> list[dict]:
+        return [c for c in self.channels if c.get('is_active')]
+
+    # Mirrors the SELECT policies on Team, Agent_Membership, Role, Priority, SLA,
+    # Channel and System_Settings in db_setup.sql, since the snapshot is loaded
+    # with the service role. A change to any of those policies must be made here too.
+    def visible_to(self, user_id: str | None) -> 'ReferenceData':
+        user_id = str(user_id) if user_id else None
+        manager = user_id in self.managers
+        teams = {m['team'] for m in self.memberships if str(m['user']) == user_id}
+        admin = manager or self.settings.get('admin_team') in teams
+        return ReferenceData(
+            self.version,
+            self.slas if manager else [],
+            self.priorities if manager or user_id in self.agents else [],
+            self.teams if admin else [t for t in self.teams if t['name'] in teams],
+            self.channels if manager else self.active_channels(),
+            self.settings if admin else {},
+            [m for m in self.memberships if manager or m['team'] in teams],
+            [r for r in self.roles if manager or str(r['user']) == user_id]
+        )
+
+
+class ReferenceCache:
+    CHECK_INTERVAL = float(os.environ.get('REFERENCE_CACHE_CHECK_INTERVAL', 30))
+    MAX_AGE = float(os.environ.get('REFERENCE_CACHE_MAX_AGE', 600))
+
+    _snapshot: ReferenceData | None = None
+    _loaded_at = 0.0
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    def __init__(self, service: Client | None):
+        if service is None:
+            raise RuntimeError("ReferenceCache requires the service client (SUPABASE_SERVICE_ROLE_KEY)")
+        self.supabase = service
+
+    def get(self) -> ReferenceData:
+        now = time.monotonic()
+        with self._lock:
+            snapshot = ReferenceCache._snapshot
+            if snapshot and now - ReferenceCache._loaded_at < self.MAX_AGE:
+                if now - ReferenceCache._checked_at < self.CHECK_INTERVAL:
+                    return snapshot
+                ReferenceCache._checked_at = now
+                if self._current_version() == snapshot.version:
+                    return snapshot
+
+            snapshot = self._load()
+            ReferenceCache._snapshot = snapshot
+            ReferenceCache._loaded_at = ReferenceCache._checked_at = now
+            return snapshot
+
+    def invalidate(self):
+        self.supabase.rpc('bump_reference_version', {}).execute()
+        with self._lock:
+            ReferenceCache._snapshot = None
+
+    def _current_version(self) -> int:
+        res = self.supabase.table('System_Settings').select('reference_version').eq('name', 'GLOBAL').execute()
+        return res.data[0].get('reference_version', 0) if res.data else 0
+
+    def _load(self) -> ReferenceData:
+        settings_res = self.supabase.table('System_Settings').select('*').eq('name', 'GLOBAL').execute()
+        settings = settings_res.data[0] if settings_res.data else {}
+        slas = self.supabase.table('SLA').select('*').order('creation').execute().data
+        priorities = self.supabase.table('Priority').select('*').order('sort_order').execute().data
+        teams = self.supabase.table('Team').select('*').order('name').execute().data
+        channels = self.supabase.table('Channel').select('*').execute().data
+        memberships = self.supabase.table('Agent_Membership').select('team, user').execute().data
+        roles = self.supabase.table('Role').select('user, name').in_('name', ['System Manager', 'Agent']).execute().data
+        return ReferenceData(settings.get('reference_version', 0), slas, priorities, teams, channels, settings, memberships, roles)
+
+
+def get_reference_data(service: Client | None) -> ReferenceData:
+    return ReferenceCache(service).get()
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from supabase import Client
+
+PHONE_CHANNELS = ('WhatsApp', 'SMS', 'Phone')
+
+
+def normalize_handle(channel: str, handle: str) -> tuple[str, str]:
+    channel = (channel or 'Email').strip()
+    handle = (handle or '').strip()
+    if channel == 'Email':
+        handle = handle.lower()
+    elif channel in PHONE_CHANNELS:
+        handle = re.sub(r'[^\d+]', '', handle)
+    return channel, handle
+
+
+class CustomerResolver:
+    MAX_ENTRIES = int(os.environ.get('CUSTOMER_CACHE_SIZE', 4096))
+    TTL = float(os.environ.get('CUSTOMER_CACHE_TTL', 300))
+    CHECK_INTERVAL = float(os.environ.get('CUSTOMER_CACHE_CHECK_INTERVAL', 30))
+
+    _cache: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+    _version: int | None = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    def __init__(self, service: Client | None):
+        if service is None:
+            raise RuntimeError("CustomerResolver requires the service client (SUPABASE_SERVICE_ROLE_KEY)")
+        self.supabase = service
+
+    def resolve(self, channel: str, handle: str) -> str:
+        key = normalize_handle(channel, handle)
+        customer = self._get(key)
+        if customer:
+            return customer
+
+        res = self.supabase.rpc('resolve_customer_handle', {
+            'p_channel': key[0],
+            'p_handle': key[1],
+            'p_full_name': key[1].split('@')[0] if '@' in key[1] else key[1]
+        }).execute()
+
+        customer = res.data[0] if isinstance(res.data, list) and res.data else res.data
+        if not customer:
+            raise Exception(f"Failed to resolve customer for {key[0]} handle {key[1]}")
+        self._put(key, customer)
+        return customer
+
+    def resolve_many(self, pairs: list[tuple[str, str]]) -> dict[tuple[str, str], str]:
+        resolved = {}
+        missing = {}
+        for channel, handle in pairs:
+            key = normalize_handle(channel, handle)
+            customer = self._get(key)
+            if customer:
+                resolved[(channel, handle)] = customer
+            else:
+                missing.setdefault(key, []).append((channel, handle))
+
+        if missing:
+            res = self.supabase.rpc('resolve_customer_handles', {
+                'p_handles': [{
+                    'channel': key[0],
+                    'handle': key[1],
+                    'full_name': key[1].split('@')[0] if '@' in key[1] else key[1]
+                } for key in missing]
+            }).execute()
+
+            for row in res.data or []:
+                key = (row['channel'], row['handle'])
+                self._put(key, row['customer'])
+                for pair in missing.get(key, []):
+                    resolved[pair] = row['customer']
+
+        return resolved
+
+    def _get(self, key: tuple[str, str]) -> str | None:
+        now = time.monotonic()
+        self._sync(now)
+        with self._lock:
+            cached = self._cache.get(key)
+            if not cached:
+                return None
+            if cached[1] <= now:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return cached[0]
+
+    def _put(self, key: tuple[str, str], customer: str):
+        with self._lock:
+            self._cache[key] = (customer, time.monotonic() + self.TTL)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def _sync(self, now: float):
+        with self._lock:
+            if now - CustomerResolver._checked_at < self.CHECK_INTERVAL:
+                return
+            CustomerResolver._checked_at = now
+
+        version = self._current_version()
+        with self._lock:
+            if version != CustomerResolver._version:
+                CustomerResolver._cache.clear()
+                CustomerResolver._version = version
+
+    def _current_version(self) -> int:
+        res = self.supabase.table('System_Settings').select('customer_version').eq('name', 'GLOBAL').execute()
+        return res.data[0].get('customer_version', 0) if res.data else 0
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._cache.clear()
@@ -3,8 +3,10 @@
 from src.management.store.base import BaseStore
 
 class SettingsStore(BaseStore):
-    def __init__(self, supabase):
-        super().__init__(supabase, 'System_Settings')
+    reference = True
+
+    def __init__(self, supabase, service=None):
+        super().__init__(supabase, 'System_Settings', service)
 
     def get_global(self) -> dict:
         return self.get_by_id('GLOBAL', 'name')
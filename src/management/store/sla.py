@@ -3,8 +3,10 @@
 from src.management.store.base import BaseStore
 
 class SLAStore(BaseStore):
-    def __init__(self, supabase):
-        super().__init__(supabase, 'SLA')
+    reference = True
+
+    def __init__(self, supabase, service=None):
+        super().__init__(supabase, 'SLA', service)
 
     def get_by_priority(self, priority: str):
         return self.get_all_filtered('priority', priority)
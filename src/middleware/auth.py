@@ -3,6 +3,20 @@
 import os
 import traceback
 from supabase import create_client, Client
+from src.middleware.identity import resolve_identity
+
+_service_client: Client | None = None
+
+
+def get_service_client() -> Client | None:
+    global _service_client
+    if _service_client is None:
+        supabase_url = os.environ.get('SUPABASE_URL')
+        service_role_key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY')
+        if not supabase_url or not service_role_key:
+            return None
+        _service_client = create_client(supabase_url, service_role_key)
+    return _service_client
 
 
 async def auth(req, ctx, next_fn):
@@ -20,6 +34,8 @@ async def auth(req, ctx, next_fn):
         supabase.postgrest.auth(token)
         req['supabase'] = supabase
         req['token'] = token
+        req['service'] = get_service_client()
+        req['user'] = resolve_identity(supabase, token)
     except Exception as e:
         error_msg = f"{str(e)}\n{traceback.format_exc()}"
         ctx.logger.error('An exception occurred during auth', error_msg)
@@ -27,4 +43,9 @@ async def auth(req, ctx, next_fn):
             'status': 401,
             'body': { 'error': 'Unauthorized', 'details': str(e) }
         }
+    if req['user'] is None:
+        return {
+            'status': 401,
+            'body': { 'error': 'Unauthorized', 'details': 'Invalid or expired token' }
+        }
     return await next_fn()
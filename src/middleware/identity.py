@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from supabase import Client
+
+
+class Identity:
+    def __init__(self, id: str, email: str | None = None, user_metadata: dict | None = None, role: str | None = None):
+        self.id = id
+        self.email = email
+        self.user_metadata = user_metadata or {}
+        self.role = role
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> 'Identity':
+        return cls(
+            claims['sub'],
+            claims.get('email'),
+            claims.get('user_metadata'),
+            claims.get('role')
+        )
+
+    @classmethod
+    def from_user(cls, user) -> 'Identity':
+        return cls(str(user.id), user.email, user.user_metadata, getattr(user, 'role', None))
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+def _decode_claims(token: str) -> tuple[dict, dict, bytes, bytes]:
+    header_b64, payload_b64, signature_b64 = token.split('.')
+    header = json.loads(_b64decode(header_b64))
+    claims = json.loads(_b64decode(payload_b64))
+    signing_input = f"{header_b64}.{payload_b64}".encode()
+    return header, claims, signing_input, _b64decode(signature_b64)
+
+
+class IdentityResolver:
+    MAX_ENTRIES = 1024
+    FALLBACK_TTL = 60
+
+    _cache: OrderedDict[str, tuple[Identity, float]] = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, supabase: Client):
+        self.supabase = supabase
+        self.jwt_secret = os.environ.get('SUPABASE_JWT_SECRET')
+
+    def resolve(self, token: str | None) -> Identity | None:
+        if not token:
+            return None
+
+        now = time.time()
+        with self._lock:
+            cached = self._cache.get(token)
+            if cached:
+                if cached[1] > now:
+                    self._cache.move_to_end(token)
+                    return cached[0]
+                del self._cache[token]
+
+        try:
+            header, claims, signing_input, signature = _decode_claims(token)
+        except Exception:
+            return None
+
+        expires_at = claims.get('exp') or now + self.FALLBACK_TTL
+        if expires_at <= now:
+            return None
+
+        identity = self._verify_locally(header, claims, signing_input, signature)
+        if identity is None:
+            identity = self._fetch_user(token)
+        if identity is None:
+            return None
+
+        with self._lock:
+            self._cache[token] = (identity, expires_at)
+            while len(self._cache) > self.MAX_ENTRIES:
+                self._cache.popitem(last=False)
+        return identity
+
+    def _verify_locally(self, header: dict, claims: dict, signing_input: bytes, signature: bytes) -> Identity | None:
+        if not self.jwt_secret or header.get('alg') != 'HS256' or not claims.get('sub'):
+            return None
+        expected = hmac.new(self.jwt_secret.encode(), signing_input, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, signature):
+            return None
+        return Identity.from_claims(claims)
+
+    def _fetch_user(self, token: str) -> Identity | None:
+        try:
+            user_res = self.supabase.auth.get_user(token)
+            if user_res and user_res.user:
+                return Identity.from_user(user_res.user)
+        except Exception:
+            pass
+        return None
+
+
+def resolve_identity(supabase: Client, token: str | None) -> Identity | None:
+    return IdentityResolver(supabase).resolve(token)
@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+
+import re
+from datetime import timedelta
+from functools import lru_cache
+from typing import Iterable
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+MONTH = 30 * DAY
+YEAR = 365.25 * DAY
+
+UNITS = {
+    'microsecond': 1e-6, 'microseconds': 1e-6, 'usec': 1e-6, 'usecs': 1e-6, 'us': 1e-6,
+    'millisecond': 1e-3, 'milliseconds': 1e-3, 'msec': 1e-3, 'msecs': 1e-3, 'ms': 1e-3,
+    'second': 1, 'seconds': 1, 'sec': 1, 'secs': 1, 's': 1,
+    'minute': MINUTE, 'minutes': MINUTE, 'min': MINUTE, 'mins': MINUTE, 'm': MINUTE,
+    'hour': HOUR, 'hours': HOUR, 'hr': HOUR, 'hrs': HOUR, 'h': HOUR,
+    'day': DAY, 'days': DAY, 'd': DAY,
+    'week': 7 * DAY, 'weeks': 7 * DAY, 'w': 7 * DAY,
+    'month': MONTH, 'months': MONTH, 'mon': MONTH, 'mons': MONTH,
+    'year': YEAR, 'years': YEAR, 'yr': YEAR, 'yrs': YEAR, 'y': YEAR,
+}
+
+_NUMBER = re.compile(r'[+-]?\d+(?:\.\d*)?|[+-]?\.\d+')
+_NUMBER_UNIT = re.compile(r'([+-]?(?:\d+(?:\.\d*)?|\.\d+))([a-z]+)')
+_CLOCK = re.compile(r'([+-])?(\d+):(\d+)(?::(\d+(?:\.\d*)?))?')
+_YEAR_MONTH = re.compile(r'([+-])?(\d+)-(\d+)')
+_ISO = re.compile(
+    r'([+-])?p(?:([+-]?[\d.]+)y)?(?:([+-]?[\d.]+)m)?(?:([+-]?[\d.]+)w)?(?:([+-]?[\d.]+)d)?'
+    r'(?:t(?:([+-]?[\d.]+)h)?(?:([+-]?[\d.]+)m)?(?:([+-]?[\d.]+)s)?)?'
+)
+_ISO_UNITS = (YEAR, MONTH, 7 * DAY, DAY, HOUR, MINUTE, 1)
+
+
+def _signed(token: str) -> bool:
+    return token[:1] in '+-'
+
+
+def _parse_iso(text: str) -> float | None:
+    match = _ISO.fullmatch(text)
+    if not match or text in ('p', 'pt'):
+        return None
+    sign = -1 if match.group(1) == '-' else 1
+    return sign * sum(float(v) * unit for v, unit in zip(match.groups()[1:], _ISO_UNITS) if v)
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str) -> float:
+    text = text.strip().lower().replace(',', ' ')
+    if text.startswith(('p', '-p', '+p')):
+        seconds = _parse_iso(text)
+        if seconds is None:
+            raise ValueError(f"Invalid interval: {text!r}")
+        return seconds
+
+    ago = text.endswith(' ago')
+    if ago:
+        text = text[:-4]
+    tokens = text.lstrip('@').split()
+    if not tokens:
+        raise ValueError(f"Invalid interval: {text!r}")
+
+    has_units = any(t.isalpha() for t in tokens)
+    inherit = -1 if not has_units and tokens[0].startswith('-') else 1
+
+    total = 0.0
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        sign = 1 if _signed(token) else inherit
+        next_token = tokens[i + 1] if i + 1 < len(tokens) else None
+
+        if _NUMBER.fullmatch(token) and next_token in UNITS:
+            total += float(token) * UNITS[next_token]
+            i += 2
+            continue
+
+        if match := _CLOCK.fullmatch(token):
+            neg, hours, minutes, seconds = match.groups()
+            value = int(hours) * HOUR + int(minutes) * MINUTE + float(seconds or 0)
+            total += -value if neg == '-' else sign * value
+        elif match := _YEAR_MONTH.fullmatch(token):
+            neg, years, months = match.groups()
+            value = int(years) * YEAR + int(months) * MONTH
+            total += -value if neg == '-' else sign * value
+        elif match := _NUMBER_UNIT.fullmatch(token):
+            if match.group(2) not in UNITS:
+                raise ValueError(f"Invalid interval unit: {match.group(2)!r}")
+            total += float(match.group(1)) * UNITS[match.group(2)]
+        elif _NUMBER.fullmatch(token):
+            value = abs(float(token)) * (-1 if token.startswith('-') else sign)
+            total += value * (DAY if next_token and ':' in next_token else 1)
+        else:
+            raise ValueError(f"Invalid interval: {text!r}")
+        i += 1
+
+    return -total if ago else total
+
+
+def interval_seconds(value) -> float | None:
+    if value is None or value == '':
+        return None
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return _parse(str(value))
+    except ValueError:
+        return None
+
+
+def to_timedelta(value) -> timedelta:
+    seconds = interval_seconds(value)
+    return timedelta(seconds=seconds) if seconds is not None else timedelta(0)
+
+
+def to_hours(value) -> float | None:
+    seconds = interval_seconds(value)
+    return seconds / HOUR if seconds is not None else None
+
+
+def column_seconds(values: Iterable) -> list[float | None]:
+    values = list(values)
+    decoded = {}
+    for value in values:
+        key = value if isinstance(value, (str, int, float)) or value is None else str(value)
+        if key not in decoded:
+            decoded[key] = interval_seconds(value)
+    return [decoded[v if isinstance(v, (str, int, float)) or v is None else str(v)] for v in values]
+
+
+def column_hours(values: Iterable) -> list[float | None]:
+    return [s / HOUR if s is not None else None for s in column_seconds(values)]
+
+
+def format_interval(value: timedelta) -> str:
+    micros = round(value.total_seconds() * 1_000_000)
+    sign = '-' if micros < 0 else ''
+    seconds, micros = divmod(abs(micros), 1_000_000)
+    days, seconds = divmod(seconds, DAY)
+    hours, seconds = divmod(seconds, HOUR)
+    minutes, seconds = divmod(seconds, MINUTE)
+
+    clock = f"{sign}{hours:02}:{minutes:02}:{seconds:02}"
+    if micros:
+        clock += f".{micros:06}".rstrip('0')
+    if days:
+        return f"{sign}{days} {'day' if days == 1 else 'days'} {clock}"
+    return clock
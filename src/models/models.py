@@ -32,6 +32,10 @@ class AgreementStatus(str, Enum):
     FULFILLED = 'Fulfilled'
     PAUSED = 'Paused'
 
+class AssignmentStrategy(str, Enum):
+    ROUND_ROBIN = 'round_robin'
+    LEAST_LOADED = 'least_loaded'
+
 class CommunicationDirection(str, Enum):
     INBOUND = 'Inbound'
     OUTBOUND = 'Outbound'
@@ -168,6 +172,7 @@ class Team(BaseModel):
     description: str | None
     escalation_team: str | None = Field(None, max_length=140)
     last_agent: uuid.UUID | None
+    assignment_strategy: AssignmentStrategy = AssignmentStrategy.ROUND_ROBIN
     creation: datetime
     modified: datetime
 
@@ -222,7 +227,8 @@ class Attachment(BaseModel):
     filename: str
     mime_type: str
     size_bytes: int
-    data: str
+    sha256: str | None = None
+    data: str | None = None
 
 class InboundEmail(BaseModel):
     unique_id: str
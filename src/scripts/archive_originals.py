@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.middleware.auth import get_service_client
+from src.storage.service.archive import get_archive_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move Communication raw headers and full bodies into the compressed archive')
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--after-id', type=int, default=0, help='Resume after this communication id')
+    args = parser.parse_args()
+
+    supabase = get_service_client()
+    if supabase is None:
+        sys.exit('SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required')
+
+    store = get_archive_store(supabase)
+    last_id = args.after_id
+    archived = 0
+    while True:
+        rows = supabase.table('Communication')\
+            .select('id, raw_headers')\
+            .gt('id', last_id)\
+            .not_.is_('raw_headers', 'null')\
+            .order('id')\
+            .limit(args.batch_size)\
+            .execute().data
+        if not rows:
+            break
+
+        for row in rows:
+            store.put(row['id'], row['raw_headers'])
+        supabase.table('Communication')\
+            .update({'raw_headers': None, 'has_original': True})\
+            .in_('id', [row['id'] for row in rows])\
+            .execute()
+
+        archived += len(rows)
+        last_id = rows[-1]['id']
+        print(f"Archived {archived} communications, last id {last_id}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+
+import os
+import sys
+import random
+import timeit
+from datetime import timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.models.interval import interval_seconds, column_hours, _parse
+
+SAMPLES = [
+    '04:00:00', '1 day', '3 days', '1 day 02:00:00', '-1 days +02:03:00', '00:42:17.25',
+    '2 hours', '30 minutes', '1 mon 2 days 03:00:00', 'PT4H30M', '@ 2 days 3 hours ago', '1-2 3 4:05:06',
+]
+
+
+def legacy_ticket(interval_str):
+    if not interval_str:
+        return timedelta(0)
+    try:
+        if ':' in interval_str:
+            parts = list(map(int, interval_str.split(':')))
+            if len(parts) == 3:
+                return timedelta(hours=parts[0], minutes=parts[1], seconds=parts[2])
+        val = int(interval_str.split()[0])
+        if 'day' in interval_str:
+            return timedelta(days=val)
+        if 'hour' in interval_str:
+            return timedelta(hours=val)
+        if 'minute' in interval_str:
+            return timedelta(minutes=val)
+    except Exception:
+        pass
+    return timedelta(0)
+
+
+def legacy_stats(interval_str):
+    try:
+        hours = 0.0
+        if 'day' in interval_str:
+            parts = interval_str.split()
+            hours += int(parts[0]) * 24
+            if len(parts) > 2:
+                time_part = parts[2]
+            else:
+                return hours
+        else:
+            time_part = interval_str
+        if ':' in time_part:
+            time_parts = time_part.split(':')
+            hours += int(time_parts[0])
+            hours += int(time_parts[1]) / 60
+            if len(time_parts) > 2:
+                hours += float(time_parts[2]) / 3600
+        return hours
+    except Exception:
+        return None
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    column = [random.choice(SAMPLES) for _ in range(rows)]
+
+    print(f"{'format':<44}{'codec h':>10}{'ticket h':>10}{'stats h':>10}")
+    for sample in SAMPLES:
+        legacy = legacy_stats(sample)
+        print(f"{sample:<44}{interval_seconds(sample) / 3600:>10.3f}"
+              f"{legacy_ticket(sample).total_seconds() / 3600:>10.3f}"
+              f"{'-' if legacy is None else f'{legacy:.3f}':>10}")
+
+    timings = {
+        'legacy ticket parser': lambda: [legacy_ticket(v) for v in column],
+        'legacy stats parser': lambda: [legacy_stats(v) for v in column],
+        'codec per row (cold)': lambda: (_parse.cache_clear(), [interval_seconds(v) for v in column]),
+        'codec per row (warm)': lambda: [interval_seconds(v) for v in column],
+        'codec column': lambda: column_hours(column),
+    }
+    print(f"\n{rows} rows")
+    for name, fn in timings.items():
+        best = min(timeit.repeat(fn, number=1, repeat=5))
+        print(f"{name:<28}{best * 1000:>10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/python3
+
+import base64
+import copy
+import itertools
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.ticket.store.ticket import Ticket
+from src.management.store.reference import ReferenceCache
+from src.middleware.identity import IdentityResolver
+
+BEFORE = {
+    'resolve': 7,
+    'change_priority': 7,
+    'put_on_hold': 7,
+    'release_hold': 9,
+    'reassign_and_escalate': 13,
+}
+
+
+class Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class RecordingQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.op = 'select'
+        self.payload = None
+        self.filters = []
+        self.order_by = None
+        self.max_rows = None
+        self.embeds = []
+
+    def select(self, columns='*', **kwargs):
+        self.op = 'select'
+        self.embeds = [part.split('(')[0].strip() for part in columns.split(',') if '(' in part]
+        return self
+
+    def insert(self, payload, **kwargs):
+        self.op, self.payload = 'insert', payload
+        return self
+
+    def update(self, payload, **kwargs):
+        self.op, self.payload = 'update', payload
+        return self
+
+    def eq(self, col, val):
+        self.filters.append(lambda r: str(r.get(col)) == str(val))
+        return self
+
+    def in_(self, col, vals):
+        vals = {str(v) for v in vals}
+        self.filters.append(lambda r: str(r.get(col)) in vals)
+        return self
+
+    def is_(self, col, val):
+        if '.' not in col:
+            self.filters.append(lambda r: r.get(col) is None)
+        return self
+
+    def order(self, col, desc=False, **kwargs):
+        if not kwargs:
+            self.order_by = (col, desc)
+        return self
+
+    def limit(self, n, **kwargs):
+        if not kwargs:
+            self.max_rows = n
+        return self
+
+    def execute(self):
+        self.client.round_trips.append(f"{self.op} {self.table}")
+        rows = self.client.tables.setdefault(self.table, [])
+        if self.op == 'insert':
+            payload = self.payload if isinstance(self.payload, list) else [self.payload]
+            inserted = []
+            for row in payload:
+                row = {'id': next(self.client.ids), **row}
+                rows.append(row)
+                inserted.append(copy.deepcopy(row))
+            return Result(inserted)
+
+        matched = [r for r in rows if all(f(r) for f in self.filters)]
+        if self.op == 'update':
+            for row in matched:
+                row.update(self.payload)
+            return Result(copy.deepcopy(matched))
+
+        if self.order_by:
+            col, desc = self.order_by
+            matched = sorted(matched, key=lambda r: str(r.get(col)), reverse=desc)
+        if self.max_rows is not None:
+            matched = matched[:self.max_rows]
+        matched = copy.deepcopy(matched)
+        for embed in self.embeds:
+            children = self.client.tables.get(embed, [])
+            for row in matched:
+                row[embed] = [copy.deepcopy(c) for c in children if c.get('ticket') == row.get('name') and not c.get('hold_end')]
+        return Result(matched)
+
+
+class RecordingRpc:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        self.client.round_trips.append(f"rpc {self.name}")
+        return Result(self.client.rpcs[self.name](self.client, **self.params))
+
+
+class RecordingUser:
+    id = '00000000-0000-0000-0000-000000000001'
+    email = 'agent@helpdesk.com'
+    user_metadata = {'full_name': 'Bench Agent'}
+
+
+class RecordingAuth:
+    def __init__(self, client):
+        self.client = client
+
+    def get_user(self, token):
+        self.client.round_trips.append('auth get_user')
+        return type('UserResponse', (), {'user': RecordingUser()})()
+
+
+class RecordingClient:
+    def __init__(self, tables: dict):
+        self.tables = copy.deepcopy(tables)
+        self.round_trips: list[str] = []
+        self.ids = itertools.count(1000)
+        self.auth = RecordingAuth(self)
+        self.rpcs = {}
+
+    def table(self, name):
+        return RecordingQuery(self, name)
+
+    def rpc(self, name, params=None):
+        return RecordingRpc(self, name, params or {})
+
+
+def bench_token() -> str:
+    def encode(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b'=').decode()
+    return f"{encode({'alg': 'HS256'})}.{encode({'sub': RecordingUser.id, 'exp': 4102444800})}.c2ln"
+
+
+AGENTS = ['00000000-0000-0000-0000-00000000000a', '00000000-0000-0000-0000-00000000000b']
+
+FIXTURE = {
+    'System_Settings': [{'name': 'GLOBAL', 'reference_version': 1}],
+    'SLA': [
+        {'name': 'Silver-High', 'priority': 'High', 'first_response_time': '04:00:00', 'resolution_time': '1 day'},
+        {'name': 'Gold-Critical', 'priority': 'Critical', 'first_response_time': '01:00:00', 'resolution_time': '04:00:00'},
+    ],
+    'Priority': [{'name': 'Critical', 'sort_order': 1}, {'name': 'High', 'sort_order': 2}],
+    'Team': [
+        {'name': 'Level 1 Support', 'last_assigned_agent': None},
+        {'name': 'Level 2 Support', 'last_assigned_agent': None},
+    ],
+    'Channel': [{'name': 'Email', 'is_active': True}],
+    'Agent_Membership': [{'team': 'Level 2 Support', 'user': a} for a in AGENTS],
+    'Profile': [{'id': a, 'full_name': f'Agent {a[-1]}', 'email': f'{a[-1]}@helpdesk.com'} for a in AGENTS],
+    'Customer': [{'name': 'CUST-000001', 'full_name': 'Jane', 'email': 'jane@example.com', 'phone': None}],
+    'Communication': [],
+    'Ticket_Hold': [],
+}
+
+
+def ticket_row(**overrides) -> dict:
+    row = {
+        'name': 'TIK-260101-00001',
+        'subject': 'Cannot log in',
+        'description': 'Password reset loop',
+        'raised_by': 'jane@example.com',
+        'channel': 'Email',
+        'customer': 'CUST-000001',
+        'status': 'Open',
+        'priority': 'High',
+        'team': 'Level 1 Support',
+        'agent': AGENTS[0],
+        'creation': '2026-01-01T08:00:00+00:00',
+        'modified': '2026-01-01T08:00:00+00:00',
+        'response_by': '2026-01-01T12:00:00+00:00',
+        'resolution_by': '2099-01-02T08:00:00+00:00',
+        'agreement_status': 'Resolution Due',
+        'total_hold_time': None,
+        'escalation_count': 0,
+    }
+    row.update(overrides)
+    return row
+
+
+SCENARIOS = {
+    'resolve': (ticket_row(), {'status': 'Resolved'}, []),
+    'change_priority': (ticket_row(), {'priority': 'Critical'}, []),
+    'put_on_hold': (ticket_row(), {'status': 'On Hold'}, []),
+    'release_hold': (
+        ticket_row(status='On Hold', total_hold_time='01:00:00'),
+        {'status': 'Open'},
+        [{'id': 1, 'ticket': 'TIK-260101-00001', 'hold_start': '2026-01-01T09:00:00+00:00', 'hold_end': None}],
+    ),
+    'reassign_and_escalate': (
+        ticket_row(),
+        {'team': 'Level 2 Support', 'priority': 'Critical', 'status': 'Replied', 'escalation_count': 1},
+        [],
+    ),
+}
+
+
+def advance_team_cursor(client, p_team):
+    p_ring = sorted(m['user'] for m in client.tables['Agent_Membership'] if m['team'] == p_team)
+    team = next(t for t in client.tables['Team'] if t['name'] == p_team)
+    last = team.get('last_assigned_agent')
+    team['last_assigned_agent'] = p_ring[(p_ring.index(last) + 1) % len(p_ring) if last in p_ring else 0]
+    return team['last_assigned_agent']
+
+
+def run(name: str) -> list[str]:
+    ticket, changes, holds = SCENARIOS[name]
+    tables = copy.deepcopy(FIXTURE)
+    tables['Ticket'] = [ticket]
+    tables['Ticket_Hold'] = holds
+    client = RecordingClient(tables)
+    client.rpcs['advance_team_cursor'] = advance_team_cursor
+
+    ReferenceCache._snapshot = None
+    ReferenceCache(client).get()
+    IdentityResolver._cache.clear()
+    client.round_trips.clear()
+
+    Ticket(client, bench_token(), client).update(ticket['name'], dict(changes))
+    return client.round_trips
+
+
+def main():
+    os.environ.pop('SUPABASE_SERVICE_ROLE_KEY', None)
+    verbose = '-v' in sys.argv
+    print(f"{'scenario':<24}{'before':>8}{'after':>8}")
+    for name in SCENARIOS:
+        round_trips = run(name)
+        print(f"{name:<24}{BEFORE[name]:>8}{len(round_trips):>8}")
+        if verbose:
+            for call in round_trips:
+                print(f"    {call}")
+
+
+if __name__ == '__main__':
+    main()
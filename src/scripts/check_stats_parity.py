@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+
+import os
+import sys
+import json
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.middleware.auth import get_service_client
+from src.management.service.stats import StatsService, period_start, PERIOD_DAYS
+
+TOLERANCE = 0.011
+SEED_PREFIX = 'PARITY-'
+STATUSES = ['Open', 'Replied', 'On Hold', 'Resolved', 'Closed', None]
+INTERVALS = [None, '00:00:00', '00:42:10', '03:15:00', '1 day 02:00:00', '2 days']
+
+
+def _diff(path: str, expected, actual) -> list[str]:
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return [d for key in sorted(set(expected) | set(actual)) for d in _diff(f"{path}.{key}", expected.get(key), actual.get(key))]
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)) and not isinstance(expected, bool):
+        return [] if abs(float(expected) - float(actual)) <= TOLERANCE else [f"{path}: python={expected} other={actual}"]
+    return [] if expected == actual else [f"{path}: python={expected!r} other={actual!r}"]
+
+
+def compare(python: dict, other: dict) -> list[str]:
+    python, other = dict(python), dict(other)
+    agents = [{a['agent_id']: a for a in stats.pop('agent_performance') or []} for stats in (python, other)]
+    return _diff('stats', python, other) + _diff('agent_performance', *agents)
+
+
+def seed(supabase, count: int) -> list[str]:
+    rng = random.Random(count)
+    agents = [r['user'] for r in supabase.table('Role').select('user').eq('name', 'Agent').execute().data]
+    now = datetime.now(timezone.utc)
+    tickets = []
+    for i in range(count):
+        creation = now - timedelta(days=rng.randint(0, 400), seconds=rng.randint(0, 86399))
+        status = rng.choice(STATUSES)
+        resolved = status in ('Resolved', 'Closed')
+        tickets.append({
+            'name': f"{SEED_PREFIX}{i:06}",
+            'owner': 'system@helpdesk.com',
+            'subject': f"Parity ticket {i}",
+            'raised_by': f"parity{i}@example.com",
+            'channel': 'Email',
+            'creation': creation.isoformat(),
+            'status': status,
+            'resolved_by_bot': resolved and rng.random() < 0.2,
+            'resolved_by': rng.choice(agents) if resolved and agents else None,
+            'resolution_date': (creation + timedelta(minutes=rng.randint(1, 20000))).isoformat() if resolved else None,
+            'agreement_status': rng.choice([None, 'Fulfilled', 'Failed', 'Resolution Due']),
+            'first_response_time': rng.choice(INTERVALS),
+            'total_hold_time': rng.choice(INTERVALS)
+        })
+    for i in range(0, len(tickets), 500):
+        supabase.table('Ticket').insert(tickets[i:i + 500]).execute()
+    return [t['name'] for t in tickets]
+
+
+def unseed(supabase, names: list[str]):
+    for i in range(0, len(names), 500):
+        supabase.table('Ticket').delete().in_('name', names[i:i + 500]).execute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the ticket_stats RPC and the daily rollups against the Python stats reducer')
+    parser.add_argument('--period', action='append', choices=['all', 'today', *PERIOD_DAYS],
+                        help='Period to check (repeatable, defaults to every period)')
+    parser.add_argument('--start-date', help='Also check an explicit ISO start timestamp')
+    parser.add_argument('--end-date', help='Also check an explicit ISO end timestamp')
+    parser.add_argument('--seed', type=int, default=0, help='Insert this many synthetic tickets before comparing')
+    parser.add_argument('--keep', action='store_true', help='Keep the seeded tickets afterwards')
+    args = parser.parse_args()
+
+    supabase = get_service_client()
+    if supabase is None:
+        sys.exit('SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required')
+
+    service = StatsService(supabase)
+    ranges = []
+    for period in args.period or ['all', 'today', *PERIOD_DAYS]:
+        start = period_start(period)
+        ranges.append((period, datetime.combine(start, datetime.min.time(), timezone.utc) if start else None, None))
+    if args.start_date or args.end_date:
+        ranges.append(('custom', *(datetime.fromisoformat(v.replace('Z', '+00:00')) if v else None
+                                   for v in (args.start_date, args.end_date))))
+
+    seeded = seed(supabase, args.seed) if args.seed else []
+    failures = 0
+    try:
+        for label, start, end in ranges:
+            python = service.scan_tickets(start, end)
+            checks = [('sql', service.from_tickets(start, end))]
+            if label == 'all':
+                checks.append(('rollups', service.from_rollups()))
+            for source, stats in checks:
+                differences = compare(python, stats)
+                status = 'ok' if not differences else 'MISMATCH'
+                print(f"{label} {source}: {status} ({python['total_tickets']} tickets)", file=sys.stderr)
+                for line in differences:
+                    print(f"  {line}", file=sys.stderr)
+                if differences:
+                    failures += 1
+                    print(json.dumps({'range': label, 'source': source, 'python': python, source: stats}, default=str))
+    finally:
+        if seeded and not args.keep:
+            unseed(supabase, seeded)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
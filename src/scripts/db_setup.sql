@@ -1,3 +1,5 @@
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE "Profile" (
     "id" UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
     "full_name" VARCHAR(255),
@@ -14,9 +16,12 @@ CREATE TABLE "Team" (
     "description" TEXT,
     "escalation_team" VARCHAR(140),
     "last_assigned_agent" UUID,
+    "assignment_strategy" VARCHAR(20) DEFAULT 'round_robin',
     "creation" TIMESTAMPTZ DEFAULT NOW(),
     "modified" TIMESTAMPTZ DEFAULT NOW(),
 
+    CONSTRAINT chk_team_assignment_strategy
+        CHECK ("assignment_strategy" IN ('round_robin', 'least_loaded')),
     CONSTRAINT fk_team_last_agent
         FOREIGN KEY ("last_assigned_agent") REFERENCES auth.users (id),
     CONSTRAINT fk_team_escalation
@@ -136,8 +141,14 @@ CREATE TABLE "Ticket" (
     "merged_with" VARCHAR(140),
     "original_team" VARCHAR(140),
     "escalation_count" INTEGER DEFAULT 0,
+    "next_deadline" TIMESTAMPTZ GENERATED ALWAYS AS (
+        CASE WHEN "status" IN ('Open', 'Replied') AND "agreement_status" IN ('First Response Due', 'Resolution Due')
+            THEN LEAST(CASE WHEN "first_responded_on" IS NULL THEN "response_by" END, "resolution_by")
+        END
+    ) STORED,
 
     CONSTRAINT fk_ticket_agent FOREIGN KEY ("agent") REFERENCES auth.users (id),
+    CONSTRAINT fk_ticket_agent_profile FOREIGN KEY ("agent") REFERENCES "Profile" (id),
     CONSTRAINT fk_ticket_resolved_by FOREIGN KEY ("resolved_by") REFERENCES auth.users (id),
     CONSTRAINT fk_ticket_team FOREIGN KEY ("team") REFERENCES "Team" (name),
     CONSTRAINT fk_ticket_original_team FOREIGN KEY ("original_team") REFERENCES "Team" (name),
@@ -160,6 +171,7 @@ CREATE TABLE "Communication" (
     "raw_headers" JSONB,
     "attachments" JSONB,
     "event_type" VARCHAR(140),
+    "has_original" BOOLEAN NOT NULL DEFAULT FALSE,
 
     CONSTRAINT fk_communication_parent_ticket
         FOREIGN KEY ("ticket") REFERENCES "Ticket" (name) ON DELETE CASCADE,
@@ -188,6 +200,9 @@ CREATE TABLE "System_Settings" (
     "current_customer_count" INTEGER DEFAULT 1,
     "admin_team" VARCHAR(140) REFERENCES "Team"("name"),
     "last_reset_date" TIMESTAMPTZ DEFAULT NOW(),
+    "reference_version" BIGINT DEFAULT 0,
+    "directory_version" BIGINT DEFAULT 0,
+    "customer_version" BIGINT DEFAULT 0,
 
     CONSTRAINT singleton_check CHECK (name = 'GLOBAL')
 );
@@ -203,6 +218,102 @@ CREATE TABLE "Ticket_Hold" (
     "modified" TIMESTAMPTZ DEFAULT NOW()
 );
 
+CREATE TABLE "Communication_Archive" (
+    "communication" INTEGER NOT NULL PRIMARY KEY,
+    "codec" VARCHAR(16) NOT NULL,
+    "size" INTEGER NOT NULL,
+    "payload" BYTEA NOT NULL,
+    "creation" TIMESTAMPTZ DEFAULT NOW(),
+
+    CONSTRAINT fk_archive_communication
+        FOREIGN KEY ("communication") REFERENCES "Communication" (id) ON DELETE CASCADE
+);
+ALTER TABLE "Communication_Archive" ALTER COLUMN "payload" SET STORAGE EXTERNAL;
+
+CREATE TABLE "Agent_Workload" (
+    "agent" UUID NOT NULL PRIMARY KEY,
+    "open_tickets" INTEGER NOT NULL DEFAULT 0,
+    "modified" TIMESTAMPTZ DEFAULT NOW(),
+
+    CONSTRAINT fk_workload_agent
+        FOREIGN KEY ("agent") REFERENCES auth.users (id) ON DELETE CASCADE
+);
+
+CREATE TABLE "Ticket_Daily_Stats" (
+    "day" DATE NOT NULL PRIMARY KEY,
+    "total" INTEGER NOT NULL DEFAULT 0,
+    "open" INTEGER NOT NULL DEFAULT 0,
+    "replied" INTEGER NOT NULL DEFAULT 0,
+    "on_hold" INTEGER NOT NULL DEFAULT 0,
+    "resolved" INTEGER NOT NULL DEFAULT 0,
+    "closed" INTEGER NOT NULL DEFAULT 0,
+    "bot_resolved" INTEGER NOT NULL DEFAULT 0,
+    "sla_breached" INTEGER NOT NULL DEFAULT 0,
+    "first_response_count" INTEGER NOT NULL DEFAULT 0,
+    "first_response_seconds" NUMERIC NOT NULL DEFAULT 0,
+    "resolution_count" INTEGER NOT NULL DEFAULT 0,
+    "resolution_seconds" NUMERIC NOT NULL DEFAULT 0,
+    "hold_count" INTEGER NOT NULL DEFAULT 0,
+    "hold_seconds" NUMERIC NOT NULL DEFAULT 0,
+    "modified" TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE "Ticket_Daily_Agent_Stats" (
+    "day" DATE NOT NULL,
+    "agent" UUID NOT NULL,
+    "resolved_count" INTEGER NOT NULL DEFAULT 0,
+    "closed_count" INTEGER NOT NULL DEFAULT 0,
+
+    PRIMARY KEY ("day", "agent")
+);
+
+CREATE TABLE "Ticket_Daily_Sketch" (
+    "day" DATE NOT NULL,
+    "team" VARCHAR(140) NOT NULL DEFAULT '',
+    "priority" VARCHAR(140) NOT NULL DEFAULT '',
+    "metric" VARCHAR(32) NOT NULL,
+    "count" BIGINT NOT NULL DEFAULT 0,
+    "zero_count" BIGINT NOT NULL DEFAULT 0,
+    "bins" JSONB NOT NULL DEFAULT '{}',
+    "modified" TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY ("day", "team", "priority", "metric")
+);
+
+CREATE INDEX idx_ticket_modified_name ON "Ticket" ("modified" DESC, "name" DESC);
+CREATE INDEX idx_ticket_status_modified ON "Ticket" ("status", "modified" DESC, "name" DESC);
+CREATE INDEX idx_ticket_team_modified ON "Ticket" ("team", "modified" DESC, "name" DESC);
+CREATE INDEX idx_ticket_agent_modified ON "Ticket" ("agent", "modified" DESC, "name" DESC);
+CREATE INDEX idx_ticket_creation ON "Ticket" ("creation");
+CREATE INDEX idx_ticket_next_deadline ON "Ticket" ("next_deadline") WHERE "next_deadline" IS NOT NULL;
+CREATE INDEX idx_communication_ticket_creation ON "Communication" ("ticket", "creation" DESC, "id" DESC);
+
+CREATE OR REPLACE FUNCTION ticket_document(p_subject VARCHAR, p_description TEXT)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('english', COALESCE(p_subject, '')), 'A')
+        || setweight(to_tsvector('english', COALESCE(p_description, '')), 'B');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION communication_document(p_body TEXT)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('english', COALESCE(p_body, '')), 'C');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE INDEX idx_customer_name_trgm ON "Customer" USING GIN ("name" gin_trgm_ops);
+CREATE INDEX idx_customer_full_name_trgm ON "Customer" USING GIN ("full_name" gin_trgm_ops);
+CREATE INDEX idx_customer_email_trgm ON "Customer" USING GIN ("email" gin_trgm_ops);
+CREATE INDEX idx_customer_phone_trgm ON "Customer" USING GIN ("phone" gin_trgm_ops);
+CREATE INDEX idx_customer_handle_trgm ON "Customer_Handle" USING GIN ("handle" gin_trgm_ops);
+
+ALTER TABLE "Ticket" ADD COLUMN "search_document" TSVECTOR
+    GENERATED ALWAYS AS (ticket_document("subject", "description")) STORED;
+ALTER TABLE "Communication" ADD COLUMN "search_document" TSVECTOR
+    GENERATED ALWAYS AS (communication_document("body")) STORED;
+
+CREATE INDEX idx_ticket_search ON "Ticket" USING GIN ("search_document");
+CREATE INDEX idx_communication_search ON "Communication" USING GIN ("search_document")
+    WHERE "event_type" IS NULL;
+
 CREATE OR REPLACE FUNCTION is_manager(user_uuid uuid)
 RETURNS BOOLEAN
 LANGUAGE SQL
@@ -234,6 +345,762 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql SECURITY DEFINER;
 
+DROP FUNCTION IF EXISTS lease_ticket_numbers(integer, date);
+
+CREATE OR REPLACE FUNCTION lease_ticket_numbers(p_block INTEGER)
+RETURNS TABLE (first_number INTEGER, prefix VARCHAR, day DATE) AS $$
+DECLARE
+    v_day DATE := (now() AT TIME ZONE 'UTC')::date;
+BEGIN
+    RETURN QUERY
+    UPDATE "System_Settings" s
+    SET "current_count" = (CASE WHEN (s."last_reset_date" AT TIME ZONE 'UTC')::date < v_day THEN 1 ELSE s."current_count" END) + p_block,
+        "last_reset_date" = CASE WHEN (s."last_reset_date" AT TIME ZONE 'UTC')::date < v_day THEN v_day::timestamp AT TIME ZONE 'UTC' ELSE s."last_reset_date" END
+    WHERE s."name" = 'GLOBAL'
+    RETURNING s."current_count" - p_block, s."ticket_prefix", v_day;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION lease_customer_numbers(p_block INTEGER)
+RETURNS TABLE (first_number INTEGER, prefix VARCHAR) AS $$
+BEGIN
+    RETURN QUERY
+    UPDATE "System_Settings" s
+    SET "current_customer_count" = s."current_customer_count" + p_block
+    WHERE s."name" = 'GLOBAL'
+    RETURNING s."current_customer_count" - p_block, s."customer_prefix";
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION normalize_customer_handle(p_channel VARCHAR, p_handle VARCHAR)
+RETURNS VARCHAR AS $$
+    SELECT CASE
+        WHEN p_channel = 'Email' THEN lower(btrim(p_handle))
+        WHEN p_channel IN ('WhatsApp', 'SMS', 'Phone') THEN regexp_replace(p_handle, '[^0-9+]', '', 'g')
+        ELSE btrim(p_handle)
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION resolve_customer_handle(p_channel VARCHAR, p_handle VARCHAR, p_full_name VARCHAR)
+RETURNS VARCHAR AS $$
+DECLARE
+    v_customer VARCHAR;
+    v_email VARCHAR := CASE WHEN p_channel = 'Email' THEN p_handle END;
+    v_phone VARCHAR := CASE WHEN p_channel IN ('WhatsApp', 'SMS', 'Phone') THEN p_handle END;
+BEGIN
+    SELECT h."customer" INTO v_customer FROM "Customer_Handle" h
+    WHERE h."channel" = p_channel AND h."handle" = p_handle;
+    IF v_customer IS NOT NULL THEN
+        RETURN v_customer;
+    END IF;
+
+    SELECT c."name" INTO v_customer FROM "Customer" c
+    WHERE lower(c."email") = v_email OR c."phone" = v_phone
+    LIMIT 1;
+
+    IF v_customer IS NULL THEN
+        INSERT INTO "Customer" ("name", "full_name", "email", "phone")
+        SELECT COALESCE(l.prefix, 'CUST') || '-' || lpad(l.first_number::text, 6, '0'), p_full_name, v_email, v_phone
+        FROM lease_customer_numbers(1) l
+        ON CONFLICT DO NOTHING
+        RETURNING "name" INTO v_customer;
+
+        IF v_customer IS NULL THEN
+            SELECT c."name" INTO v_customer FROM "Customer" c
+            WHERE lower(c."email") = v_email OR c."phone" = v_phone
+            LIMIT 1;
+        END IF;
+    END IF;
+
+    INSERT INTO "Customer_Handle" ("customer", "channel", "handle")
+    VALUES (v_customer, p_channel, p_handle)
+    ON CONFLICT ("channel", "handle") DO NOTHING;
+
+    SELECT h."customer" INTO v_customer FROM "Customer_Handle" h
+    WHERE h."channel" = p_channel AND h."handle" = p_handle;
+    RETURN v_customer;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION resolve_customer_handles(p_handles JSONB)
+RETURNS TABLE (channel VARCHAR, handle VARCHAR, customer VARCHAR) AS $$
+    SELECT x.channel, x.handle, resolve_customer_handle(x.channel, x.handle, x.full_name)
+    FROM jsonb_to_recordset(p_handles) AS x(channel VARCHAR, handle VARCHAR, full_name VARCHAR);
+$$ LANGUAGE sql SECURITY DEFINER;
+
+DELETE FROM "Customer_Handle" h
+USING "Customer_Handle" k
+WHERE k."channel" = h."channel"
+  AND k."id" < h."id"
+  AND normalize_customer_handle(k."channel", k."handle") = normalize_customer_handle(h."channel", h."handle");
+
+UPDATE "Customer_Handle"
+SET "handle" = normalize_customer_handle("channel", "handle"), "modified" = NOW()
+WHERE "handle" <> normalize_customer_handle("channel", "handle");
+
+UPDATE "Customer" c
+SET "phone" = n."phone", "modified" = NOW()
+FROM (
+    SELECT DISTINCT ON (normalize_customer_handle('Phone', "phone"))
+        "name", NULLIF(normalize_customer_handle('Phone', "phone"), '') AS "phone"
+    FROM "Customer"
+    WHERE "phone" IS NOT NULL
+    ORDER BY normalize_customer_handle('Phone', "phone"), "phone" = normalize_customer_handle('Phone', "phone") DESC, "creation", "name"
+) n
+WHERE c."name" = n."name"
+  AND c."phone" IS DISTINCT FROM n."phone"
+  AND NOT EXISTS (SELECT 1 FROM "Customer" o WHERE o."phone" = n."phone");
+
+CREATE OR REPLACE FUNCTION bump_reference_version()
+RETURNS BIGINT AS $$
+    UPDATE "System_Settings"
+    SET "reference_version" = "reference_version" + 1
+    WHERE "name" = 'GLOBAL'
+    RETURNING "reference_version";
+$$ LANGUAGE sql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION bump_directory_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE "System_Settings" SET "directory_version" = "directory_version" + 1 WHERE "name" = 'GLOBAL';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS profile_directory_version ON "Profile";
+CREATE TRIGGER profile_directory_version
+  AFTER INSERT OR UPDATE OR DELETE ON "Profile"
+  FOR EACH STATEMENT EXECUTE PROCEDURE bump_directory_version();
+
+DROP TRIGGER IF EXISTS role_directory_version ON "Role";
+CREATE TRIGGER role_directory_version
+  AFTER INSERT OR UPDATE OR DELETE ON "Role"
+  FOR EACH STATEMENT EXECUTE PROCEDURE bump_directory_version();
+
+CREATE OR REPLACE FUNCTION bump_customer_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE "System_Settings" SET "customer_version" = "customer_version" + 1 WHERE "name" = 'GLOBAL';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS customer_customer_version ON "Customer";
+CREATE TRIGGER customer_customer_version
+  AFTER UPDATE OF "name" OR DELETE ON "Customer"
+  FOR EACH STATEMENT EXECUTE PROCEDURE bump_customer_version();
+
+DROP TRIGGER IF EXISTS handle_customer_version ON "Customer_Handle";
+CREATE TRIGGER handle_customer_version
+  AFTER UPDATE OR DELETE ON "Customer_Handle"
+  FOR EACH STATEMENT EXECUTE PROCEDURE bump_customer_version();
+
+CREATE OR REPLACE FUNCTION team_ring(p_team VARCHAR)
+RETURNS UUID[] AS $$
+    SELECT array_agg(m."user" ORDER BY m."user")
+    FROM "Agent_Membership" m
+    WHERE m."team" = p_team;
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+DROP FUNCTION IF EXISTS advance_team_cursor(varchar, uuid[]);
+
+CREATE OR REPLACE FUNCTION advance_team_cursor(p_team VARCHAR)
+RETURNS UUID AS $$
+    UPDATE "Team" t
+    SET "last_assigned_agent" = r.ring[COALESCE(array_position(r.ring, t."last_assigned_agent"), 0) % array_length(r.ring, 1) + 1]
+    FROM (SELECT team_ring(p_team) AS ring) r
+    WHERE t."name" = p_team AND array_length(r.ring, 1) > 0
+    RETURNING t."last_assigned_agent";
+$$ LANGUAGE sql SECURITY DEFINER;
+
+DROP FUNCTION IF EXISTS assign_least_loaded(varchar, uuid[]);
+
+CREATE OR REPLACE FUNCTION assign_least_loaded(p_team VARCHAR)
+RETURNS UUID AS $$
+DECLARE
+    v_last UUID;
+    v_next UUID;
+    v_ring UUID[];
+    v_size INTEGER;
+BEGIN
+    SELECT t."last_assigned_agent" INTO v_last FROM "Team" t WHERE t."name" = p_team FOR UPDATE;
+
+    v_ring := team_ring(p_team);
+    v_size := array_length(v_ring, 1);
+    IF v_size IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT r.agent INTO v_next
+    FROM unnest(v_ring) WITH ORDINALITY AS r(agent, pos)
+    LEFT JOIN "Agent_Workload" w ON w."agent" = r.agent
+    ORDER BY COALESCE(w."open_tickets", 0),
+             (r.pos - COALESCE(array_position(v_ring, v_last), 0) - 1 + v_size) % v_size
+    LIMIT 1;
+
+    UPDATE "Team" SET "last_assigned_agent" = v_next WHERE "name" = p_team;
+    RETURN v_next;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION track_agent_workload()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_old UUID;
+    v_new UUID;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND COALESCE(OLD."status", 'Open') NOT IN ('Resolved', 'Closed') THEN
+        v_old := OLD."agent";
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND COALESCE(NEW."status", 'Open') NOT IN ('Resolved', 'Closed') THEN
+        v_new := NEW."agent";
+    END IF;
+
+    IF v_old IS NOT DISTINCT FROM v_new THEN
+        RETURN NULL;
+    END IF;
+
+    IF v_old IS NOT NULL THEN
+        UPDATE "Agent_Workload"
+        SET "open_tickets" = GREATEST("open_tickets" - 1, 0), "modified" = NOW()
+        WHERE "agent" = v_old;
+    END IF;
+    IF v_new IS NOT NULL THEN
+        INSERT INTO "Agent_Workload" ("agent", "open_tickets") VALUES (v_new, 1)
+        ON CONFLICT ("agent") DO UPDATE
+        SET "open_tickets" = "Agent_Workload"."open_tickets" + 1, "modified" = NOW();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS ticket_agent_workload ON "Ticket";
+CREATE TRIGGER ticket_agent_workload
+  AFTER INSERT OR UPDATE OF "status", "agent" OR DELETE ON "Ticket"
+  FOR EACH ROW EXECUTE PROCEDURE track_agent_workload();
+
+CREATE OR REPLACE FUNCTION rebuild_agent_workload()
+RETURNS INTEGER AS $$
+DECLARE
+    v_agents INTEGER;
+BEGIN
+    LOCK TABLE "Ticket" IN SHARE MODE;
+    DELETE FROM "Agent_Workload";
+
+    INSERT INTO "Agent_Workload" ("agent", "open_tickets")
+    SELECT t."agent", COUNT(*)
+    FROM "Ticket" t
+    WHERE t."agent" IS NOT NULL
+      AND COALESCE(t."status", 'Open') NOT IN ('Resolved', 'Closed')
+    GROUP BY t."agent";
+    GET DIAGNOSTICS v_agents = ROW_COUNT;
+    RETURN v_agents;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION apply_ticket_daily_stats(t "Ticket", p_sign INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    v_day DATE;
+    v_status TEXT := lower(COALESCE(t."status", ''));
+BEGIN
+    IF t."creation" IS NULL THEN
+        RETURN;
+    END IF;
+    v_day := (t."creation" AT TIME ZONE 'UTC')::date;
+
+    INSERT INTO "Ticket_Daily_Stats" AS s (
+        "day", "total", "open", "replied", "on_hold", "resolved", "closed", "bot_resolved",
+        "sla_breached", "first_response_count", "first_response_seconds", "resolution_count",
+        "resolution_seconds", "hold_count", "hold_seconds"
+    ) VALUES (
+        v_day,
+        p_sign,
+        p_sign * (v_status = 'open')::int,
+        p_sign * (v_status = 'replied')::int,
+        p_sign * (v_status = 'on hold')::int,
+        p_sign * (v_status = 'resolved')::int,
+        p_sign * (v_status = 'closed')::int,
+        p_sign * COALESCE(t."resolved_by_bot", FALSE)::int,
+        p_sign * (t."agreement_status" IS NOT DISTINCT FROM 'Failed')::int,
+        p_sign * (t."first_response_time" IS NOT NULL)::int,
+        p_sign * COALESCE(EXTRACT(EPOCH FROM t."first_response_time"), 0),
+        p_sign * (t."resolution_date" IS NOT NULL)::int,
+        p_sign * COALESCE(EXTRACT(EPOCH FROM t."resolution_date" - t."creation"), 0),
+        p_sign * (t."total_hold_time" IS NOT NULL)::int,
+        p_sign * COALESCE(EXTRACT(EPOCH FROM t."total_hold_time"), 0)
+    )
+    ON CONFLICT ("day") DO UPDATE SET
+        "total" = s."total" + EXCLUDED."total",
+        "open" = s."open" + EXCLUDED."open",
+        "replied" = s."replied" + EXCLUDED."replied",
+        "on_hold" = s."on_hold" + EXCLUDED."on_hold",
+        "resolved" = s."resolved" + EXCLUDED."resolved",
+        "closed" = s."closed" + EXCLUDED."closed",
+        "bot_resolved" = s."bot_resolved" + EXCLUDED."bot_resolved",
+        "sla_breached" = s."sla_breached" + EXCLUDED."sla_breached",
+        "first_response_count" = s."first_response_count" + EXCLUDED."first_response_count",
+        "first_response_seconds" = s."first_response_seconds" + EXCLUDED."first_response_seconds",
+        "resolution_count" = s."resolution_count" + EXCLUDED."resolution_count",
+        "resolution_seconds" = s."resolution_seconds" + EXCLUDED."resolution_seconds",
+        "hold_count" = s."hold_count" + EXCLUDED."hold_count",
+        "hold_seconds" = s."hold_seconds" + EXCLUDED."hold_seconds",
+        "modified" = NOW();
+
+    IF t."resolved_by" IS NOT NULL AND t."status" IN ('Resolved', 'Closed') THEN
+        INSERT INTO "Ticket_Daily_Agent_Stats" AS s ("day", "agent", "resolved_count", "closed_count")
+        VALUES (v_day, t."resolved_by", p_sign * (t."status" = 'Resolved')::int, p_sign * (t."status" = 'Closed')::int)
+        ON CONFLICT ("day", "agent") DO UPDATE SET
+            "resolved_count" = s."resolved_count" + EXCLUDED."resolved_count",
+            "closed_count" = s."closed_count" + EXCLUDED."closed_count";
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION track_ticket_daily_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (
+        OLD."creation", OLD."status", OLD."resolved_by_bot", OLD."resolved_by", OLD."agreement_status",
+        OLD."first_response_time", OLD."resolution_date", OLD."total_hold_time"
+    ) IS NOT DISTINCT FROM (
+        NEW."creation", NEW."status", NEW."resolved_by_bot", NEW."resolved_by", NEW."agreement_status",
+        NEW."first_response_time", NEW."resolution_date", NEW."total_hold_time"
+    ) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_ticket_daily_stats(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_ticket_daily_stats(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS ticket_daily_stats ON "Ticket";
+CREATE TRIGGER ticket_daily_stats
+  AFTER INSERT OR UPDATE OF "creation", "status", "resolved_by_bot", "resolved_by", "agreement_status",
+    "first_response_time", "resolution_date", "total_hold_time" OR DELETE ON "Ticket"
+  FOR EACH ROW EXECUTE PROCEDURE track_ticket_daily_stats();
+
+CREATE OR REPLACE FUNCTION rebuild_ticket_daily_stats()
+RETURNS INTEGER AS $$
+DECLARE
+    v_days INTEGER;
+BEGIN
+    LOCK TABLE "Ticket" IN SHARE MODE;
+    DELETE FROM "Ticket_Daily_Agent_Stats";
+    DELETE FROM "Ticket_Daily_Stats";
+
+    INSERT INTO "Ticket_Daily_Stats" (
+        "day", "total", "open", "replied", "on_hold", "resolved", "closed", "bot_resolved",
+        "sla_breached", "first_response_count", "first_response_seconds", "resolution_count",
+        "resolution_seconds", "hold_count", "hold_seconds"
+    )
+    SELECT
+        (t."creation" AT TIME ZONE 'UTC')::date,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE lower(t."status") = 'open'),
+        COUNT(*) FILTER (WHERE lower(t."status") = 'replied'),
+        COUNT(*) FILTER (WHERE lower(t."status") = 'on hold'),
+        COUNT(*) FILTER (WHERE lower(t."status") = 'resolved'),
+        COUNT(*) FILTER (WHERE lower(t."status") = 'closed'),
+        COUNT(*) FILTER (WHERE t."resolved_by_bot"),
+        COUNT(*) FILTER (WHERE t."agreement_status" = 'Failed'),
+        COUNT(t."first_response_time"),
+        COALESCE(SUM(EXTRACT(EPOCH FROM t."first_response_time")), 0),
+        COUNT(t."resolution_date"),
+        COALESCE(SUM(EXTRACT(EPOCH FROM t."resolution_date" - t."creation")), 0),
+        COUNT(t."total_hold_time"),
+        COALESCE(SUM(EXTRACT(EPOCH FROM t."total_hold_time")), 0)
+    FROM "Ticket" t
+    WHERE t."creation" IS NOT NULL
+    GROUP BY 1;
+    GET DIAGNOSTICS v_days = ROW_COUNT;
+
+    INSERT INTO "Ticket_Daily_Agent_Stats" ("day", "agent", "resolved_count", "closed_count")
+    SELECT
+        (t."creation" AT TIME ZONE 'UTC')::date,
+        t."resolved_by",
+        COUNT(*) FILTER (WHERE t."status" = 'Resolved'),
+        COUNT(*) FILTER (WHERE t."status" = 'Closed')
+    FROM "Ticket" t
+    WHERE t."creation" IS NOT NULL
+      AND t."resolved_by" IS NOT NULL
+      AND t."status" IN ('Resolved', 'Closed')
+    GROUP BY 1, 2;
+
+    DELETE FROM "Ticket_Daily_Sketch";
+    INSERT INTO "Ticket_Daily_Sketch" ("day", "team", "priority", "metric", "count", "zero_count", "bins")
+    SELECT day, team, priority, metric, SUM(n), COALESCE(SUM(n) FILTER (WHERE key IS NULL), 0),
+        COALESCE(jsonb_object_agg(key, n) FILTER (WHERE key IS NOT NULL), '{}'::jsonb)
+    FROM (
+        SELECT
+            (t."creation" AT TIME ZONE 'UTC')::date AS day,
+            COALESCE(t."team", '') AS team,
+            COALESCE(t."priority", '') AS priority,
+            v.metric,
+            sketch_key(v.seconds)::text AS key,
+            COUNT(*) AS n
+        FROM "Ticket" t
+        CROSS JOIN LATERAL ticket_sketch_values(t) v
+        GROUP BY 1, 2, 3, 4, 5
+    ) g
+    GROUP BY day, team, priority, metric;
+
+    RETURN v_days;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION ticket_stats(p_start TIMESTAMPTZ DEFAULT NULL, p_end TIMESTAMPTZ DEFAULT NULL)
+RETURNS JSONB AS $$
+    WITH t AS (
+        SELECT "status", "resolved_by_bot", "resolved_by", "agreement_status", "creation",
+            "resolution_date", "first_response_time", "total_hold_time"
+        FROM "Ticket"
+        WHERE (p_start IS NULL OR "creation" >= p_start)
+          AND (p_end IS NULL OR "creation" <= p_end)
+    ),
+    totals AS (
+        SELECT
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE lower("status") = 'open') AS open,
+            COUNT(*) FILTER (WHERE lower("status") = 'replied') AS replied,
+            COUNT(*) FILTER (WHERE lower("status") = 'on hold') AS on_hold,
+            COUNT(*) FILTER (WHERE lower("status") = 'resolved') AS resolved,
+            COUNT(*) FILTER (WHERE lower("status") = 'closed') AS closed,
+            COUNT(*) FILTER (WHERE "resolved_by_bot") AS bot_resolved,
+            COUNT(*) FILTER (WHERE "agreement_status" = 'Failed') AS sla_breached,
+            ROUND(AVG(EXTRACT(EPOCH FROM "first_response_time")) / 3600, 2) AS first_response_hours,
+            ROUND(AVG(EXTRACT(EPOCH FROM "resolution_date" - "creation")) / 3600, 2) AS resolution_hours,
+            ROUND(AVG(EXTRACT(EPOCH FROM "total_hold_time")) / 3600, 2) AS hold_hours
+        FROM t
+    ),
+    agents AS (
+        SELECT
+            a.agent,
+            a.resolved_count,
+            a.closed_count,
+            COALESCE(u.email, 'Unknown') AS email,
+            COALESCE(NULLIF(p."full_name", ''), NULLIF(p."email", ''), u.email, 'Unknown') AS name
+        FROM (
+            SELECT "resolved_by" AS agent,
+                COUNT(*) FILTER (WHERE "status" = 'Resolved') AS resolved_count,
+                COUNT(*) FILTER (WHERE "status" = 'Closed') AS closed_count
+            FROM t
+            WHERE "resolved_by" IS NOT NULL AND "status" IN ('Resolved', 'Closed')
+            GROUP BY "resolved_by"
+        ) a
+        LEFT JOIN auth.users u ON u.id = a.agent
+        LEFT JOIN "Profile" p ON p.id = a.agent
+    )
+    SELECT jsonb_build_object(
+        'total_tickets', s.total,
+        'status_counts', jsonb_build_object(
+            'open', s.open, 'replied', s.replied, 'on hold', s.on_hold,
+            'resolved', s.resolved, 'closed', s.closed
+        ),
+        'bot_resolved', s.bot_resolved,
+        'agent_performance', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'agent_id', a.agent::text,
+                'email', a.email,
+                'name', a.name,
+                'resolved_count', a.resolved_count,
+                'closed_count', a.closed_count
+            ) ORDER BY a.resolved_count + a.closed_count DESC, a.name)
+            FROM agents a
+        ), '[]'::jsonb),
+        'avg_first_response_hours', s.first_response_hours,
+        'avg_resolution_hours', s.resolution_hours,
+        'sla_compliance', CASE WHEN s.total > 0
+            THEN ROUND((s.total - s.sla_breached) * 100.0 / s.total, 1)
+            ELSE 100.0 END,
+        'avg_hold_time_hours', s.hold_hours
+    )
+    FROM totals s;
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION sketch_key(p_seconds NUMERIC)
+RETURNS INTEGER AS $$
+    SELECT CASE WHEN p_seconds >= 1 THEN ceil(ln(p_seconds) / ln(1.01 / 0.99))::int END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION ticket_sketch_values(t "Ticket")
+RETURNS TABLE (metric VARCHAR, seconds NUMERIC) AS $$
+    SELECT v.m, v.x
+    FROM (VALUES
+        ('first_response'::varchar, EXTRACT(EPOCH FROM t."first_response_time")),
+        ('resolution'::varchar, EXTRACT(EPOCH FROM t."resolution_date" - t."creation")),
+        ('hold'::varchar, EXTRACT(EPOCH FROM t."total_hold_time"))
+    ) v(m, x)
+    WHERE v.x IS NOT NULL AND t."creation" IS NOT NULL;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION apply_ticket_sketches(t "Ticket", p_sign INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    v_metric VARCHAR;
+    v_seconds NUMERIC;
+    v_key TEXT;
+BEGIN
+    FOR v_metric, v_seconds IN SELECT * FROM ticket_sketch_values(t) LOOP
+        v_key := sketch_key(v_seconds)::text;
+
+        INSERT INTO "Ticket_Daily_Sketch" AS s ("day", "team", "priority", "metric", "count", "zero_count", "bins")
+        VALUES (
+            (t."creation" AT TIME ZONE 'UTC')::date,
+            COALESCE(t."team", ''),
+            COALESCE(t."priority", ''),
+            v_metric,
+            p_sign,
+            CASE WHEN v_key IS NULL THEN p_sign ELSE 0 END,
+            CASE WHEN v_key IS NULL THEN '{}'::jsonb ELSE jsonb_build_object(v_key, p_sign) END
+        )
+        ON CONFLICT ("day", "team", "priority", "metric") DO UPDATE SET
+            "count" = s."count" + EXCLUDED."count",
+            "zero_count" = s."zero_count" + EXCLUDED."zero_count",
+            "bins" = CASE
+                WHEN v_key IS NULL THEN s."bins"
+                WHEN COALESCE((s."bins" ->> v_key)::bigint, 0) + p_sign = 0 THEN s."bins" - v_key
+                ELSE jsonb_set(s."bins", ARRAY[v_key], to_jsonb(COALESCE((s."bins" ->> v_key)::bigint, 0) + p_sign))
+            END,
+            "modified" = NOW();
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION track_ticket_sketches()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (
+        OLD."creation", OLD."team", OLD."priority", OLD."first_response_time",
+        OLD."resolution_date", OLD."total_hold_time"
+    ) IS NOT DISTINCT FROM (
+        NEW."creation", NEW."team", NEW."priority", NEW."first_response_time",
+        NEW."resolution_date", NEW."total_hold_time"
+    ) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_ticket_sketches(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_ticket_sketches(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS ticket_sketches ON "Ticket";
+CREATE TRIGGER ticket_sketches
+  AFTER INSERT OR UPDATE OF "creation", "team", "priority", "first_response_time",
+    "resolution_date", "total_hold_time" OR DELETE ON "Ticket"
+  FOR EACH ROW EXECUTE PROCEDURE track_ticket_sketches();
+
+CREATE OR REPLACE FUNCTION merge_ticket_sketches(p_start DATE DEFAULT NULL, p_end DATE DEFAULT NULL, p_dimension TEXT DEFAULT NULL)
+RETURNS TABLE (sketch_group VARCHAR, sketch_metric VARCHAR, total BIGINT, zeros BIGINT, merged JSONB) AS $$
+    WITH s AS (
+        SELECT
+            CASE p_dimension WHEN 'team' THEN d."team" WHEN 'priority' THEN d."priority" ELSE '' END AS g,
+            d."metric" AS m, d."count" AS n, d."zero_count" AS z, d."bins" AS b
+        FROM "Ticket_Daily_Sketch" d
+        WHERE (p_start IS NULL OR d."day" >= p_start)
+          AND (p_end IS NULL OR d."day" <= p_end)
+    ),
+    totals AS (
+        SELECT g, m, SUM(n)::bigint AS n, SUM(z)::bigint AS z FROM s GROUP BY g, m
+    ),
+    buckets AS (
+        SELECT s.g, s.m, e.key AS k, SUM(e.value::bigint) AS c
+        FROM s, jsonb_each_text(s.b) e
+        GROUP BY s.g, s.m, e.key
+        HAVING SUM(e.value::bigint) <> 0
+    )
+    SELECT t.g, t.m, t.n, t.z,
+        COALESCE(jsonb_object_agg(b.k, b.c) FILTER (WHERE b.k IS NOT NULL), '{}'::jsonb)
+    FROM totals t
+    LEFT JOIN buckets b ON b.g = t.g AND b.m = t.m
+    WHERE t.n > 0
+    GROUP BY t.g, t.m, t.n, t.z
+    ORDER BY t.g, t.m;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION bulk_update_tickets(p_changes JSONB, p_expected JSONB)
+RETURNS SETOF "Ticket" AS $$
+    UPDATE "Ticket" t
+    SET (
+        "subject", "description", "raised_by", "status", "priority", "team", "external_thread_id",
+        "agent", "channel", "resolution_date", "resolved_by_bot", "resolved_by",
+        "first_responded_on", "bot_first_responded_on", "customer", "sla", "agreement_status",
+        "response_by", "resolution_by", "total_hold_time", "bot_first_response_time",
+        "first_response_time", "is_merged", "merged_with", "original_team", "escalation_count"
+    ) = (
+        SELECT
+            r."subject", r."description", r."raised_by", r."status", r."priority", r."team",
+            r."external_thread_id", r."agent", r."channel", r."resolution_date", r."resolved_by_bot",
+            r."resolved_by", r."first_responded_on", r."bot_first_responded_on", r."customer",
+            r."sla", r."agreement_status", r."response_by", r."resolution_by", r."total_hold_time",
+            r."bot_first_response_time", r."first_response_time", r."is_merged", r."merged_with",
+            r."original_team", r."escalation_count"
+        FROM jsonb_populate_record(t, c.value) r
+    )
+    FROM jsonb_each(p_changes) c
+    WHERE t."name" = c.key
+      AND t."modified" = (p_expected ->> c.key)::timestamptz
+    RETURNING t.*;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION import_ticket_chunk(p_tickets JSONB, p_communications JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    INSERT INTO "Ticket" (
+        "name", "owner", "creation", "modified", "subject", "description", "raised_by", "status",
+        "priority", "team", "external_thread_id", "agent", "channel", "resolution_date",
+        "resolved_by_bot", "resolved_by", "first_responded_on", "bot_first_responded_on", "customer",
+        "sla", "agreement_status", "response_by", "resolution_by", "total_hold_time",
+        "bot_first_response_time", "first_response_time", "original_team", "escalation_count"
+    )
+    SELECT
+        t."name", t."owner", COALESCE(t."creation", NOW()), COALESCE(t."modified", t."creation", NOW()),
+        t."subject", t."description", t."raised_by", COALESCE(t."status", 'Open'), t."priority",
+        t."team", t."external_thread_id", t."agent", t."channel", t."resolution_date",
+        COALESCE(t."resolved_by_bot", FALSE), t."resolved_by", t."first_responded_on",
+        t."bot_first_responded_on", t."customer", t."sla", t."agreement_status", t."response_by",
+        t."resolution_by", t."total_hold_time", t."bot_first_response_time", t."first_response_time",
+        t."original_team", COALESCE(t."escalation_count", 0)
+    FROM jsonb_populate_recordset(NULL::"Ticket", p_tickets) t;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+
+    INSERT INTO "Communication" (
+        "ticket", "creation", "sender", "raised_by", "body", "direction", "channel", "message_id",
+        "attachments", "event_type"
+    )
+    SELECT
+        c."ticket", COALESCE(c."creation", NOW()), c."sender", c."raised_by", c."body", c."direction",
+        c."channel", c."message_id", c."attachments", c."event_type"
+    FROM jsonb_populate_recordset(NULL::"Communication", p_communications) c;
+
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION attachment_names(c "Communication")
+RETURNS TEXT[] AS $$
+    SELECT CASE WHEN jsonb_typeof(c."attachments") = 'object'
+        THEN ARRAY(SELECT jsonb_object_keys(c."attachments"))
+    END;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION customer_search_pattern(p_query TEXT)
+RETURNS TEXT AS $$
+    SELECT CASE WHEN length(p_query) < 3 THEN '' ELSE '%' END
+        || replace(replace(replace(p_query, '\', '\\'), '%', '\%'), '_', '\_')
+        || '%';
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION search_customers(p_query TEXT)
+RETURNS SETOF "Customer" AS $$
+    SELECT c.*
+    FROM "Customer" c
+    WHERE c."name" ILIKE customer_search_pattern(p_query)
+       OR c."full_name" ILIKE customer_search_pattern(p_query)
+       OR c."email" ILIKE customer_search_pattern(p_query)
+       OR c."phone" ILIKE customer_search_pattern(p_query)
+       OR c."name" IN (
+           SELECT h."customer" FROM "Customer_Handle" h
+           WHERE h."handle" ILIKE customer_search_pattern(p_query)
+       );
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION ticket_status_counts()
+RETURNS TABLE ("status" VARCHAR, "total" BIGINT) AS $$
+    SELECT t."status", count(*) FROM "Ticket" t GROUP BY t."status";
+$$ LANGUAGE sql STABLE;
+
+DROP FUNCTION IF EXISTS search_tickets(text, varchar[], varchar[], timestamptz, timestamptz, integer, integer);
+
+CREATE OR REPLACE FUNCTION search_tickets(
+    p_query TEXT,
+    p_status VARCHAR[] DEFAULT NULL,
+    p_team VARCHAR[] DEFAULT NULL,
+    p_from TIMESTAMPTZ DEFAULT NULL,
+    p_to TIMESTAMPTZ DEFAULT NULL,
+    p_limit INTEGER DEFAULT 20,
+    p_after_rank REAL DEFAULT NULL,
+    p_after_modified TIMESTAMPTZ DEFAULT NULL,
+    p_after_name VARCHAR DEFAULT NULL
+)
+RETURNS TABLE (
+    "name" VARCHAR, "subject" VARCHAR, "status" VARCHAR, "priority" VARCHAR, "team" VARCHAR,
+    "agent" UUID, "customer" VARCHAR, "raised_by" VARCHAR, "creation" TIMESTAMPTZ,
+    "modified" TIMESTAMPTZ, "rank" REAL, "matched_communication" INTEGER, "headline" TEXT
+) AS $$
+    WITH q AS (
+        SELECT websearch_to_tsquery('english', p_query) AS query
+    ),
+    hits AS (
+        SELECT t."name", t."search_document" AS document, NULL::INTEGER AS comm
+        FROM "Ticket" t, q
+        WHERE t."search_document" @@ q.query
+          AND (p_status IS NULL OR t."status" = ANY(p_status))
+          AND (p_team IS NULL OR t."team" = ANY(p_team))
+          AND (p_from IS NULL OR t."creation" >= p_from)
+          AND (p_to IS NULL OR t."creation" < p_to)
+        UNION ALL
+        SELECT t."name", c."search_document", c."id"
+        FROM "Communication" c
+        JOIN "Ticket" t ON t."name" = c."ticket", q
+        WHERE c."event_type" IS NULL AND c."search_document" @@ q.query
+          AND (p_status IS NULL OR t."status" = ANY(p_status))
+          AND (p_team IS NULL OR t."team" = ANY(p_team))
+          AND (p_from IS NULL OR t."creation" >= p_from)
+          AND (p_to IS NULL OR t."creation" < p_to)
+    ),
+    best AS (
+        SELECT DISTINCT ON (h."name") h."name", ts_rank(h.document, q.query) AS rank, h.comm
+        FROM hits h, q
+        ORDER BY h."name", rank DESC
+    ),
+    page AS (
+        SELECT t."name", t."subject", t."status", t."priority", t."team", t."agent", t."customer",
+            t."raised_by", t."creation", t."modified", t."description", b.rank, b.comm
+        FROM best b
+        JOIN "Ticket" t ON t."name" = b."name"
+        WHERE p_after_name IS NULL
+           OR (b.rank, t."modified", t."name") < (p_after_rank, p_after_modified, p_after_name)
+        ORDER BY b.rank DESC, t."modified" DESC, t."name" DESC
+        LIMIT LEAST(GREATEST(p_limit, 1), 200)
+    )
+    SELECT p."name", p."subject", p."status", p."priority", p."team", p."agent", p."customer",
+        p."raised_by", p."creation", p."modified", p.rank, p.comm,
+        ts_headline('english', COALESCE(c."body", p."description", p."subject"), q.query,
+            'MaxFragments=1, MinWords=8, MaxWords=25, StartSel=<mark>, StopSel=</mark>')
+    FROM page p
+    CROSS JOIN q
+    LEFT JOIN "Communication" c ON c."id" = p.comm
+    ORDER BY p.rank DESC, p."modified" DESC, p."name" DESC;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION touch_modified()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW."modified" = clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS ticket_touch_modified ON "Ticket";
+CREATE TRIGGER ticket_touch_modified
+  BEFORE UPDATE ON "Ticket"
+  FOR EACH ROW EXECUTE PROCEDURE touch_modified();
+
 CREATE OR REPLACE FUNCTION public.handle_new_user()
 RETURNS TRIGGER AS $$
 BEGIN
@@ -257,6 +1124,26 @@ CREATE TRIGGER on_auth_user_created
 GRANT EXECUTE ON FUNCTION is_manager(uuid) TO authenticated;
 GRANT EXECUTE ON FUNCTION is_admin_agent(uuid) TO authenticated;
 GRANT EXECUTE ON FUNCTION get_agent_teams(uuid) TO authenticated;
+GRANT EXECUTE ON FUNCTION bulk_update_tickets(jsonb, jsonb) TO authenticated;
+GRANT EXECUTE ON FUNCTION attachment_names("Communication") TO authenticated;
+GRANT EXECUTE ON FUNCTION customer_search_pattern(text) TO authenticated;
+GRANT EXECUTE ON FUNCTION search_customers(text) TO authenticated;
+GRANT EXECUTE ON FUNCTION ticket_status_counts() TO authenticated;
+GRANT EXECUTE ON FUNCTION search_tickets(text, varchar[], varchar[], timestamptz, timestamptz, integer, real, timestamptz, varchar) TO authenticated;
+REVOKE EXECUTE ON FUNCTION bump_reference_version() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION team_ring(varchar) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION advance_team_cursor(varchar) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION assign_least_loaded(varchar) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION lease_ticket_numbers(integer) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION lease_customer_numbers(integer) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION resolve_customer_handle(varchar, varchar, varchar) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION resolve_customer_handles(jsonb) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION apply_ticket_daily_stats("Ticket", integer) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION rebuild_agent_workload() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION rebuild_ticket_daily_stats() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION ticket_stats(timestamptz, timestamptz) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION apply_ticket_sketches("Ticket", integer) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION merge_ticket_sketches(date, date, text) FROM PUBLIC, anon, authenticated;
 
 ALTER TABLE "Team" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "Agent_Membership" ENABLE ROW LEVEL SECURITY;
@@ -272,9 +1159,18 @@ ALTER TABLE "Knowledge_Base" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "System_Settings" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "Profile" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "Ticket_Hold" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "Agent_Workload" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "Ticket_Daily_Stats" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "Ticket_Daily_Agent_Stats" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "Ticket_Daily_Sketch" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "Communication_Archive" ENABLE ROW LEVEL SECURITY;
 
 CREATE POLICY "System Manager Bypass" ON "Ticket" AS PERMISSIVE FOR ALL TO authenticated USING ( is_manager(auth.uid()) );
 
+-- The SELECT policies on Team, Agent_Membership, Role, Priority, SLA, Channel and
+-- System_Settings are mirrored by ReferenceData.visible_to() in
+-- src/management/store/reference.py, which filters the service-role reference
+-- snapshot per caller. Change both together.
 CREATE POLICY "System Manager Bypass" ON "Team" AS PERMISSIVE FOR ALL TO authenticated USING ( is_manager(auth.uid()) );
 
 CREATE POLICY "System Manager Bypass" ON "Agent_Membership" AS PERMISSIVE FOR ALL TO authenticated USING ( is_manager(auth.uid()) );
@@ -439,3 +1335,11 @@ WITH CHECK ( EXISTS (SELECT 1 FROM "Role" WHERE "user" = auth.uid() AND name = '
 CREATE POLICY "Agents can update hold records"
 ON "Ticket_Hold" FOR UPDATE
 USING ( EXISTS (SELECT 1 FROM "Role" WHERE "user" = auth.uid() AND name = 'Agent') );
+
+CREATE POLICY "Agents can view workload"
+ON "Agent_Workload" FOR SELECT
+USING ( EXISTS (SELECT 1 FROM "Role" WHERE "user" = auth.uid() AND name IN ('Agent', 'System Manager')) );
+
+CREATE POLICY "Users can view originals of visible communication"
+ON "Communication_Archive" FOR SELECT
+USING ( EXISTS (SELECT 1 FROM "Communication" c WHERE c.id = "Communication_Archive"."communication") );
@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.ticket.store.ticket import Ticket
+from src.ticket.service.export import TicketExporter
+from src.middleware.auth import get_service_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream tickets as NDJSON or CSV')
+    parser.add_argument('--format', choices=TicketExporter.FORMATS, default='ndjson')
+    parser.add_argument('--fields', help='Comma separated ticket columns')
+    parser.add_argument('--chunk-size', type=int, default=TicketExporter.CHUNK_SIZE)
+    parser.add_argument('--output', help='Write to this file instead of stdout')
+    for col in Ticket.LIST_FILTERS:
+        parser.add_argument(f'--{col}', help=f'Filter by {col} (comma separated)')
+    args = parser.parse_args()
+
+    supabase = get_service_client()
+    if supabase is None:
+        sys.exit('SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required')
+
+    exporter = TicketExporter(
+        Ticket(supabase, None, supabase),
+        format=args.format,
+        fields=args.fields,
+        filters={col: getattr(args, col) for col in Ticket.LIST_FILTERS},
+        chunk_size=args.chunk_size
+    )
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        for chunk in exporter.stream():
+            out.write(chunk)
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.ticket.service.importer import TicketImporter
+from src.middleware.auth import get_service_client
+
+
+def report(stats: dict):
+    print(
+        f"offset {stats['offset']:>9}  imported {stats['imported']:>9}  skipped {stats['skipped']:>6}  "
+        f"{stats['tickets_per_second'] or 0:>9.1f} tickets/s",
+        file=sys.stderr
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import historical tickets from a JSONL or CSV file')
+    parser.add_argument('path', help='Input file (.jsonl or .csv)')
+    parser.add_argument('--chunk-size', type=int, default=TicketImporter.CHUNK_SIZE)
+    parser.add_argument('--checkpoint', help='Checkpoint file (defaults to <path>.checkpoint)')
+    args = parser.parse_args()
+
+    supabase = get_service_client()
+    if supabase is None:
+        sys.exit('SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required')
+
+    importer = TicketImporter(
+        supabase,
+        checkpoint_path=args.checkpoint or f"{args.path}.checkpoint",
+        chunk_size=args.chunk_size,
+        progress=report
+    )
+    stats = importer.run(args.path)
+    print(f"Imported {stats['imported']} tickets in {stats['elapsed']}s ({stats['tickets_per_second'] or 0} tickets/s), "
+          f"{stats['skipped']} skipped", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
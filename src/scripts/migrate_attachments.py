@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.middleware.auth import get_service_client
+from src.storage.service.blob import get_blob_store, is_blob_ref, store_attachments
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move inline data URL attachments into the blob store')
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    supabase = get_service_client()
+    if supabase is None:
+        sys.exit('SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required')
+
+    store = get_blob_store()
+    last_id = 0
+    migrated = 0
+    while True:
+        rows = supabase.table('Communication')\
+            .select('id, attachments')\
+            .gt('id', last_id)\
+            .not_.is_('attachments', 'null')\
+            .order('id')\
+            .limit(args.batch_size)\
+            .execute().data
+        if not rows:
+            break
+
+        for row in rows:
+            attachments = row['attachments']
+            if not isinstance(attachments, dict) or all(is_blob_ref(v) for v in attachments.values()):
+                continue
+            try:
+                refs = store_attachments(attachments, store)
+            except ValueError as e:
+                print(f"Communication {row['id']}: {e}", file=sys.stderr)
+                continue
+            supabase.table('Communication').update({'attachments': refs}).eq('id', row['id']).execute()
+            migrated += 1
+
+        last_id = rows[-1]['id']
+        print(f"Scanned up to {last_id}, migrated {migrated}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+#!/usr/bin/python3
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.middleware.auth import get_service_client
+
+
+def main():
+    supabase = get_service_client()
+    if supabase is None:
+        sys.exit('SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required')
+
+    days = supabase.rpc('rebuild_ticket_daily_stats', {}).execute().data
+    print(f"Rebuilt ticket stats rollups for {days} days", file=sys.stderr)
+
+    agents = supabase.rpc('rebuild_agent_workload', {}).execute().data
+    print(f"Rebuilt open ticket workload for {agents} agents", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
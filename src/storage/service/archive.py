@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+
+import os
+import gzip
+import json
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from supabase import Client
+from src.middleware.auth import get_service_client
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP = 'gzip'
+ZSTD = 'zstd'
+
+
+def compress(value: dict, codec: str) -> bytes:
+    data = json.dumps(value, default=str, separators=(',', ':')).encode()
+    if codec == ZSTD:
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=9)
+
+
+def decompress(data: bytes, codec: str) -> dict:
+    if codec == ZSTD:
+        if zstandard is None:
+            raise ValueError("zstandard is required to read zstd archives")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def default_codec() -> str:
+    codec = os.environ.get('ARCHIVE_CODEC') or (ZSTD if zstandard else GZIP)
+    if codec not in (GZIP, ZSTD):
+        raise ValueError(f"Unknown archive codec: {codec}")
+    if codec == ZSTD and zstandard is None:
+        raise ValueError("ARCHIVE_CODEC=zstd requires the zstandard package")
+    return codec
+
+
+class ArchiveStore(ABC):
+    def __init__(self, codec: str | None = None):
+        self.codec = codec or default_codec()
+
+    @abstractmethod
+    def put(self, comm_id: int, original: dict):
+        ...
+
+    @abstractmethod
+    def get(self, comm_id: int) -> dict | None:
+        ...
+
+
+class TableArchiveStore(ArchiveStore):
+    def __init__(self, supabase: Client, codec: str | None = None):
+        super().__init__(codec)
+        self.supabase = supabase
+
+    def put(self, comm_id: int, original: dict):
+        payload = compress(original, self.codec)
+        self.supabase.table('Communication_Archive').upsert({
+            'communication': comm_id,
+            'codec': self.codec,
+            'size': len(payload),
+            'payload': '\\x' + payload.hex()
+        }, on_conflict='communication').execute()
+
+    def get(self, comm_id: int) -> dict | None:
+        res = self.supabase.table('Communication_Archive')\
+            .select('codec, payload')\
+            .eq('communication', comm_id)\
+            .execute()
+        if not res.data:
+            return None
+        row = res.data[0]
+        return decompress(bytes.fromhex(row['payload'].removeprefix('\\x')), row['codec'])
+
+
+class FileArchiveStore(ArchiveStore):
+    def __init__(self, root: str, codec: str | None = None):
+        super().__init__(codec)
+        self.root = root
+
+    def _path(self, comm_id: int, codec: str) -> str:
+        comm_id = int(comm_id)
+        return os.path.join(self.root, f"{comm_id % 256:02x}", f"{comm_id}.json.{codec}")
+
+    def put(self, comm_id: int, original: dict):
+        path = self._path(comm_id, self.codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.archive-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(compress(original, self.codec))
+        os.replace(tmp, path)
+        for codec in (GZIP, ZSTD):
+            stale = self._path(comm_id, codec)
+            if codec != self.codec and os.path.exists(stale):
+                os.unlink(stale)
+
+    def get(self, comm_id: int) -> dict | None:
+        for codec in (self.codec, ZSTD if self.codec == GZIP else GZIP):
+            path = self._path(comm_id, codec)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return decompress(f.read(), codec)
+        return None
+
+
+_store: ArchiveStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_archive_store(supabase: Client | None = None) -> ArchiveStore:
+    global _store
+    backend = os.environ.get('ARCHIVE_STORE', 'table')
+    if backend == 'file':
+        with _store_lock:
+            if _store is None:
+                _store = FileArchiveStore(os.environ.get('ARCHIVE_STORE_PATH', '.archive'))
+            return _store
+    client = get_service_client() or supabase
+    if client is None:
+        raise ValueError("ARCHIVE_STORE=table requires a Supabase client")
+    return TableArchiveStore(client)
+
@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+
+import os
+import io
+import re
+import base64
+import hashlib
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Iterator
+from src.middleware.auth import get_service_client
+
+CHUNK_SIZE = 1024 * 1024
+_SHA256 = re.compile(r'[0-9a-f]{64}')
+_DATA_URL = re.compile(r'data:([^;,]+)?(?:;[^,]*)?,(.*)', re.DOTALL)
+
+
+def is_blob_ref(value) -> bool:
+    return isinstance(value, dict) and bool(_SHA256.fullmatch(str(value.get('sha256', ''))))
+
+
+def parse_range(header: str | None, size: int, limit: int) -> tuple[int, int] | None:
+    if not header:
+        return 0, min(size, limit) - 1
+    match = re.fullmatch(r'bytes=(\d*)-(\d*)', header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start, end = int(first), int(last) if last else size - 1
+    else:
+        start, end = max(0, size - int(last)), size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1, start + limit - 1)
+
+
+def _chunks(data: bytes | BinaryIO) -> Iterator[bytes]:
+    if isinstance(data, (bytes, bytearray)):
+        data = io.BytesIO(data)
+    while chunk := data.read(CHUNK_SIZE):
+        yield chunk
+
+
+class BlobStore(ABC):
+    @abstractmethod
+    def put(self, data: bytes | BinaryIO, mime_type: str | None = None) -> dict:
+        ...
+
+    @abstractmethod
+    def exists(self, sha256: str) -> bool:
+        ...
+
+    @abstractmethod
+    def read(self, sha256: str, start: int = 0, end: int | None = None) -> bytes:
+        ...
+
+    @abstractmethod
+    def iter_chunks(self, sha256: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        ...
+
+    def _ref(self, sha256: str, size: int, mime_type: str | None) -> dict:
+        return {'sha256': sha256, 'size': size, 'mime_type': mime_type or 'application/octet-stream'}
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, sha256: str) -> str:
+        if not _SHA256.fullmatch(sha256):
+            raise ValueError("Invalid blob id")
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def put(self, data: bytes | BinaryIO, mime_type: str | None = None) -> dict:
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in _chunks(data):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+
+            sha256 = digest.hexdigest()
+            path = self.path(sha256)
+            if os.path.exists(path):
+                os.unlink(tmp)
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return self._ref(sha256, size, mime_type)
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self.path(sha256))
+
+    def read(self, sha256: str, start: int = 0, end: int | None = None) -> bytes:
+        with open(self.path(sha256), 'rb') as f:
+            f.seek(start)
+            return f.read() if end is None else f.read(max(0, end - start + 1))
+
+    def iter_chunks(self, sha256: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        with open(self.path(sha256), 'rb') as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+
+class SupabaseBlobStore(BlobStore):
+    def __init__(self, supabase, bucket: str):
+        self.supabase = supabase
+        self.bucket = bucket
+
+    def _bucket(self):
+        return self.supabase.storage.from_(self.bucket)
+
+    def put(self, data: bytes | BinaryIO, mime_type: str | None = None) -> dict:
+        if not isinstance(data, (bytes, bytearray)):
+            data = b''.join(_chunks(data))
+        sha256 = hashlib.sha256(data).hexdigest()
+        if not self.exists(sha256):
+            self._bucket().upload(sha256, bytes(data), {
+                'content-type': mime_type or 'application/octet-stream',
+                'upsert': 'true'
+            })
+        return self._ref(sha256, len(data), mime_type)
+
+    def exists(self, sha256: str) -> bool:
+        return bool(self._bucket().list('', {'search': sha256, 'limit': 1}))
+
+    def read(self, sha256: str, start: int = 0, end: int | None = None) -> bytes:
+        import httpx
+        url = self._bucket().create_signed_url(sha256, 60)['signedURL']
+        headers = {'Range': f"bytes={start}-{'' if end is None else end}"}
+        res = httpx.get(url, headers=headers)
+        res.raise_for_status()
+        return res.content if res.status_code == 206 else res.content[start:None if end is None else end + 1]
+
+    def iter_chunks(self, sha256: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        import httpx
+        url = self._bucket().create_signed_url(sha256, 60)['signedURL']
+        with httpx.stream('GET', url) as res:
+            res.raise_for_status()
+            yield from res.iter_bytes(chunk_size)
+
+
+_store: BlobStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = os.environ.get('BLOB_STORE', 'local')
+            if backend == 'supabase':
+                client = get_service_client()
+                if not client:
+                    raise ValueError("BLOB_STORE=supabase requires SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY")
+                _store = SupabaseBlobStore(client, os.environ.get('BLOB_STORE_BUCKET', 'attachments'))
+            else:
+                _store = LocalBlobStore(os.environ.get('BLOB_STORE_PATH', '.blobs'))
+        return _store
+
+
+def store_attachments(attachments: dict | list | None, store: BlobStore | None = None) -> dict | None:
+    if not attachments:
+        return attachments or None
+    store = store or get_blob_store()
+
+    if isinstance(attachments, list):
+        items = [(a.get('filename'), a) for a in attachments if isinstance(a, dict)]
+    else:
+        items = list(attachments.items())
+
+    refs = {}
+    for filename, value in items:
+        if not filename:
+            continue
+        if is_blob_ref(value):
+            refs[filename] = value
+        elif isinstance(value, dict) and value.get('data'):
+            refs[filename] = store.put(base64.b64decode(value['data']), value.get('mime_type'))
+        elif isinstance(value, str) and (match := _DATA_URL.fullmatch(value)):
+            refs[filename] = store.put(base64.b64decode(match.group(2)), match.group(1))
+        else:
+            raise ValueError(f"Invalid attachment: {filename}")
+    return refs
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+
+import os
+import json
+import time
+import threading
+from src.storage.service.blob import LocalBlobStore
+
+CLAIM_KEY = '$claim'
+THRESHOLD = int(os.environ.get('CLAIM_CHECK_THRESHOLD', 2048))
+TTL = float(os.environ.get('PAYLOAD_STORE_TTL', 7 * 86400))
+
+
+class PayloadStore(LocalBlobStore):
+    def put_json(self, value) -> dict:
+        data = json.dumps(value, default=str, separators=(',', ':')).encode()
+        ref = self.put(data, 'application/json')
+        return {CLAIM_KEY: ref['sha256'], 'size': ref['size']}
+
+    def get_json(self, claim: dict):
+        return json.loads(self.read(claim[CLAIM_KEY]))
+
+    def prune(self, max_age: float = TTL) -> int:
+        cutoff = time.time() - max_age
+        removed = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.unlink(path)
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        return removed
+
+
+_store: PayloadStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_payload_store() -> PayloadStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PayloadStore(os.environ.get('PAYLOAD_STORE_PATH', '.payloads'))
+        return _store
+
+
+def is_claim(value) -> bool:
+    return isinstance(value, dict) and CLAIM_KEY in value
+
+
+def check_in(data: dict, threshold: int = THRESHOLD) -> dict:
+    store = get_payload_store()
+    checked = {}
+    for key, value in data.items():
+        if isinstance(value, (str, dict, list)) and not is_claim(value):
+            size = len(value.encode()) if isinstance(value, str) else len(json.dumps(value, default=str))
+            if size > threshold:
+                value = store.put_json(value)
+        checked[key] = value
+    return checked
+
+
+def claim(value):
+    return get_payload_store().get_json(value) if is_claim(value) else value
+
+
+def check_out(data: dict, *fields: str) -> dict:
+    return {
+        key: claim(value) if not fields or key in fields else value
+        for key, value in data.items()
+    }
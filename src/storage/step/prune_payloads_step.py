@@ -0,0 +1,17 @@
+#!/usr/bin/python3
+
+from src.storage.service.payload import get_payload_store
+
+config = {
+    "name": "Prune Event Payloads",
+    "description": "Remove claim-checked event payloads older than PAYLOAD_STORE_TTL every hour",
+    "type": "cron",
+    "cron": "0 * * * *",
+    "emits": [],
+    "flows": ["HelpDesk"]
+}
+
+async def handler(ctx):
+    removed = get_payload_store().prune()
+    if removed:
+        ctx.logger.info(f"Pruned {removed} event payloads")
@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+
+from supabase import Client
+from src.models.models import AssignmentStrategy
+from src.management.store.reference import get_reference_data
+
+
+class AssignmentService:
+    STRATEGY_RPCS = {
+        AssignmentStrategy.ROUND_ROBIN: 'advance_team_cursor',
+        AssignmentStrategy.LEAST_LOADED: 'assign_least_loaded',
+    }
+
+    def __init__(self, supabase: Client, service: Client | None):
+        self.supabase = supabase
+        self.service = service
+
+    def next_agent(self, team_name: str) -> str | None:
+        reference = get_reference_data(self.service)
+        if not reference.rings.get(team_name):
+            return None
+
+        team = reference.teams_by_name.get(team_name, {})
+        try:
+            strategy = AssignmentStrategy(team.get('assignment_strategy') or AssignmentStrategy.ROUND_ROBIN)
+        except ValueError:
+            strategy = AssignmentStrategy.ROUND_ROBIN
+
+        res = self.service.rpc(self.STRATEGY_RPCS[strategy], {'p_team': team_name}).execute()
+        agent = res.data[0] if isinstance(res.data, list) and res.data else res.data
+        return agent or None
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+
+import os
+import io
+import csv
+import json
+from typing import Iterator
+from src.ticket.store.ticket import Ticket
+
+
+class TicketExporter:
+    FORMATS = ('ndjson', 'csv')
+    CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', Ticket.MAX_PAGE_SIZE))
+    COLUMNS = [
+        'name', 'subject', 'status', 'priority', 'team', 'agent', 'channel', 'customer', 'raised_by',
+        'creation', 'modified', 'response_by', 'resolution_by', 'first_responded_on', 'resolution_date',
+        'agreement_status', 'total_hold_time', 'escalation_count'
+    ]
+    ENRICHED_COLUMNS = ['assigneeName', 'customerName', 'customerEmail', 'customerPhone']
+
+    def __init__(self, ticket_store: Ticket, format: str = 'ndjson', fields: str | None = None, filters: dict | None = None, chunk_size: int | None = None):
+        if format not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        self.ticket_store = ticket_store
+        self.format = format
+        self.fields = fields
+        self.filters = filters or {}
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+
+        requested = [f.strip() for f in fields.split(',') if f.strip()] if fields else self.COLUMNS
+        self.requested = list(dict.fromkeys(['name', *requested]))
+        self.columns = self.requested + self.ENRICHED_COLUMNS
+
+    def chunks(self, cursor: str | None = None) -> Iterator[tuple[list[dict], str | None]]:
+        while True:
+            page = self.ticket_store.export_page(
+                self.requested,
+                limit=self.chunk_size,
+                cursor=cursor,
+                filters=self.filters
+            )
+            cursor = page['next_cursor']
+            yield page['data'], cursor
+            if not cursor:
+                return
+
+    def stream(self, cursor: str | None = None) -> Iterator[str]:
+        header = cursor is None
+        for rows, _ in self.chunks(cursor):
+            yield self.encode(rows, header)
+            header = False
+
+    def encode(self, rows: list[dict], header: bool = False) -> str:
+        if self.format == 'ndjson':
+            return ''.join(json.dumps({col: row.get(col) for col in self.columns}, default=str) + '\n' for row in rows)
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.columns, extrasaction='ignore')
+        if header:
+            writer.writeheader()
+        for row in rows:
+            writer.writerow({
+                col: json.dumps(val, default=str) if isinstance(val, (dict, list)) else val
+                for col, val in row.items()
+            })
+        return buffer.getvalue()
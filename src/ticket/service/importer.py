@@ -0,0 +1,207 @@
+#!/usr/bin/python3
+
+import os
+import csv
+import json
+import time
+from datetime import datetime, timezone
+from typing import Iterator, Callable
+from supabase import Client
+from src.models.models import AgreementStatus, CommunicationDirection
+from src.models.interval import to_timedelta
+from src.ticket.store.sequence import SequenceAllocator
+from src.management.store.reference import get_reference_data
+from src.management.store.resolver import CustomerResolver
+from src.storage.service.blob import store_attachments
+
+
+def _parse_timestamp(value) -> datetime:
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class ImportCheckpoint:
+    def __init__(self, path: str | None):
+        self.path = path
+        self.offset = 0
+        self.imported = 0
+        self.skipped: list[dict] = []
+        self.pending: dict | None = None
+        if path and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self.offset = state.get('offset', 0)
+            self.imported = state.get('imported', 0)
+            self.skipped = state.get('skipped', [])
+            self.pending = state.get('pending')
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({
+                'offset': self.offset,
+                'imported': self.imported,
+                'skipped': self.skipped,
+                'pending': self.pending
+            }, f)
+        os.replace(tmp, self.path)
+
+
+class TicketImporter:
+    CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 500))
+    DEFAULT_OWNER = 'system@helpdesk.com'
+    TICKET_COLUMNS = (
+        'owner', 'creation', 'modified', 'subject', 'description', 'raised_by', 'status', 'priority',
+        'team', 'external_thread_id', 'agent', 'channel', 'resolution_date', 'resolved_by_bot',
+        'resolved_by', 'first_responded_on', 'bot_first_responded_on', 'sla', 'agreement_status',
+        'response_by', 'resolution_by', 'total_hold_time', 'bot_first_response_time',
+        'first_response_time', 'original_team', 'escalation_count'
+    )
+    COMMUNICATION_COLUMNS = ('creation', 'sender', 'raised_by', 'body', 'direction', 'channel', 'message_id', 'attachments')
+
+    def __init__(self, supabase: Client, checkpoint_path: str | None = None, chunk_size: int | None = None, progress: Callable[[dict], None] | None = None):
+        self.supabase = supabase
+        self.checkpoint = ImportCheckpoint(checkpoint_path)
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.progress = progress
+
+    def read(self, path: str) -> Iterator[dict]:
+        with open(path, newline='') as f:
+            if path.endswith('.csv'):
+                for row in csv.DictReader(f):
+                    record = {k: v for k, v in row.items() if v not in ('', None)}
+                    if 'communications' in record:
+                        record['communications'] = json.loads(record['communications'])
+                    yield record
+            else:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def run(self, path: str) -> dict:
+        checkpoint = self.checkpoint
+        started = time.monotonic()
+        imported_at_start = checkpoint.imported
+
+        chunk = []
+        offset = checkpoint.offset
+        for index, record in enumerate(self.read(path)):
+            if index < checkpoint.offset:
+                continue
+            chunk.append(record)
+            if len(chunk) == self.chunk_size:
+                self._import_chunk(offset, chunk, started, imported_at_start)
+                offset += len(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(offset, chunk, started, imported_at_start)
+
+        return self._stats(started, imported_at_start)
+
+    def _import_chunk(self, offset: int, records: list[dict], started: float, imported_at_start: int):
+        checkpoint = self.checkpoint
+        pending = checkpoint.pending
+        if pending and pending['offset'] == offset and len(pending['names']) == len(records):
+            names = pending['names']
+            existing = self.supabase.table('Ticket').select('name').in_('name', names).execute().data
+            if existing:
+                self._commit(offset, records, pending.get('count', len(records)), started, imported_at_start)
+                return
+        else:
+            names = SequenceAllocator(self.supabase).lease_ticket_names(len(records))
+
+        tickets, communications, skipped = self._build_rows(offset, records, names)
+        checkpoint.pending = {'offset': offset, 'names': names, 'count': len(tickets)}
+        checkpoint.skipped = [s for s in checkpoint.skipped if not offset <= s['offset'] < offset + len(records)] + skipped
+        checkpoint.save()
+
+        if tickets:
+            self.supabase.rpc('import_ticket_chunk', {
+                'p_tickets': tickets,
+                'p_communications': communications
+            }).execute()
+
+        self._commit(offset, records, len(tickets), started, imported_at_start)
+
+    def _commit(self, offset: int, records: list[dict], count: int, started: float, imported_at_start: int):
+        checkpoint = self.checkpoint
+        checkpoint.offset = offset + len(records)
+        checkpoint.imported += count
+        checkpoint.pending = None
+        checkpoint.save()
+        if self.progress:
+            self.progress(self._stats(started, imported_at_start))
+
+    def _stats(self, started: float, imported_at_start: int) -> dict:
+        elapsed = time.monotonic() - started
+        imported = self.checkpoint.imported - imported_at_start
+        return {
+            'offset': self.checkpoint.offset,
+            'imported': self.checkpoint.imported,
+            'skipped': len(self.checkpoint.skipped),
+            'elapsed': round(elapsed, 2),
+            'tickets_per_second': round(imported / elapsed, 1) if elapsed else None
+        }
+
+    def _build_rows(self, offset: int, records: list[dict], names: list[str]) -> tuple[list[dict], list[dict], list[dict]]:
+        reference = get_reference_data(self.supabase)
+        handles = list({
+            (r.get('channel') or 'Email', r['raised_by'])
+            for r in records if r.get('raised_by')
+        })
+        customers = CustomerResolver(self.supabase).resolve_many(handles)
+
+        tickets, communications, skipped = [], [], []
+        for i, (record, name) in enumerate(zip(records, names)):
+            if not record.get('subject') or not record.get('raised_by'):
+                skipped.append({'offset': offset + i, 'error': 'subject and raised_by are required'})
+                continue
+
+            ticket = {col: record[col] for col in self.TICKET_COLUMNS if record.get(col) is not None}
+            ticket['name'] = name
+            ticket['owner'] = ticket.get('owner') or self.DEFAULT_OWNER
+            ticket['channel'] = ticket.get('channel') or 'Email'
+            ticket['customer'] = customers.get((ticket['channel'], record['raised_by']))
+            self._apply_sla(ticket, reference.sla_for(ticket.get('priority')))
+
+            rows = []
+            try:
+                for comm in record.get('communications') or []:
+                    row = {col: comm[col] for col in self.COMMUNICATION_COLUMNS if comm.get(col) is not None}
+                    row['ticket'] = name
+                    row['attachments'] = store_attachments(row.get('attachments'))
+                    row.setdefault('raised_by', ticket['raised_by'])
+                    row.setdefault('direction', CommunicationDirection.INBOUND.value)
+                    row.setdefault('channel', ticket['channel'])
+                    rows.append(row)
+            except ValueError as e:
+                skipped.append({'offset': offset + i, 'error': str(e)})
+                continue
+
+            tickets.append(ticket)
+            communications.extend(rows)
+
+        return tickets, communications, skipped
+
+    def _apply_sla(self, ticket: dict, sla: dict | None):
+        if not sla or not ticket.get('creation'):
+            return
+
+        creation = _parse_timestamp(ticket['creation'])
+        if sla.get('first_response_time') and not ticket.get('response_by'):
+            ticket['response_by'] = (creation + to_timedelta(sla['first_response_time'])).isoformat()
+        if sla.get('resolution_time') and not ticket.get('resolution_by'):
+            hold = to_timedelta(ticket.get('total_hold_time'))
+            ticket['resolution_by'] = (creation + to_timedelta(sla['resolution_time']) + hold).isoformat()
+
+        if ticket.get('agreement_status'):
+            return
+        if ticket.get('resolution_date') and ticket.get('resolution_by'):
+            met = _parse_timestamp(ticket['resolution_date']) <= _parse_timestamp(ticket['resolution_by'])
+            ticket['agreement_status'] = AgreementStatus.FULFILLED.value if met else AgreementStatus.FAILED.value
+        elif ticket.get('response_by') and not ticket.get('first_responded_on'):
+            ticket['agreement_status'] = AgreementStatus.FIRST_RESPONSE_DUE.value
+        elif ticket.get('resolution_by'):
+            ticket['agreement_status'] = AgreementStatus.RESOLUTION_DUE.value
@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+
+import time
+from datetime import datetime, timezone
+from supabase import Client
+from src.models.models import AgreementStatus
+
+class SLAScheduler:
+    BATCH_SIZE = 200
+
+    def __init__(self, supabase: Client):
+        self.supabase = supabase
+
+    def flush(self, now: float | None = None) -> list[dict]:
+        cutoff = datetime.fromtimestamp(now or time.time(), timezone.utc).isoformat()
+        breached = []
+        while True:
+            due = self.supabase.table('Ticket').select('name')\
+                .lte('next_deadline', cutoff)\
+                .order('next_deadline')\
+                .limit(self.BATCH_SIZE)\
+                .execute().data or []
+            if due:
+                breached += self._mark_failed([row['name'] for row in due], cutoff)
+            if len(due) < self.BATCH_SIZE:
+                return breached
+
+    def _mark_failed(self, names: list[str], cutoff: str) -> list[dict]:
+        return self.supabase.table('Ticket')\
+            .update({'agreement_status': AgreementStatus.FAILED.value})\
+            .in_('name', names)\
+            .lte('next_deadline', cutoff)\
+            .execute().data or []
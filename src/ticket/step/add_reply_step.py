@@ -4,6 +4,7 @@ from datetime import datetime
 from src.ticket.store.ticket import Ticket
 from src.middleware.auth import auth
 from src.models.models import ReplyRequest
+from src.storage.service.payload import check_in
 from pydantic import ValidationError
 
 config = {
@@ -22,19 +23,21 @@ async def handler(req, ctx):
     id = req.get("pathParams", {}).get("id")
     supabase = req['supabase']
     token = req['token']
-    ticket_store = Ticket(supabase, token)
+    ticket_store = Ticket(supabase, token, req['service'])
     try:
         reply_data = ReplyRequest(**req.get('body', {}))
         reply = ticket_store.add_reply(id, reply_data.model_dump(exclude_unset=True))
     except ValidationError as e:
         return {"status": 400, "body": {"error": e.errors()}}
+    except ValueError as e:
+        return {"status": 400, "body": {"error": str(e)}}
 
     await ctx.emit({
         "topic": "ticket.replied",
-        "data": reply
+        "data": check_in(reply)
     })
 
-    full_ticket = ticket_store.get_by_id(id)
+    full_ticket = ticket_store.get_by_id(id, Ticket.SUMMARY_FIELDS)
     current_status = full_ticket.get('status')
     new_status = current_status
 
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+
+from src.ticket.store.ticket import Ticket
+from src.middleware.auth import auth
+from src.storage.service.payload import check_in
+
+config = {
+    "name": "Bulk Update Tickets",
+    "type": "api",
+    "method": "PATCH",
+    "description": "Apply one change set to many tickets",
+    "path": "/tickets/bulk",
+    "middleware": [auth],
+    "emits": ["ticket.updated"],
+    "flows": ["HelpDesk"]
+}
+
+
+async def handler(req, ctx):
+    supabase = req['supabase']
+    token = req['token']
+    body = req.get('body', {})
+    ticket_store = Ticket(supabase, token, req['service'])
+    try:
+        updated, conflicts = ticket_store.bulk_update(
+            body.get('changes') or {},
+            ids=body.get('ids'),
+            filters=body.get('filter')
+        )
+    except ValueError as e:
+        return {"status": 400, "body": {"error": str(e)}}
+
+    for ticket in updated:
+        await ctx.emit({
+            "topic": "ticket.updated",
+            "data": check_in(ticket)
+        })
+
+        await ctx.streams.tickets.set("all", ticket['name'], {
+            "name": ticket['name'],
+            "subject": ticket['subject'],
+            "status": ticket['status'],
+            "priority": ticket.get('priority'),
+            "team": ticket.get('team'),
+            "agent": str(ticket.get('agent')) if ticket.get('agent') else None,
+            "customer": ticket.get('customer'),
+            "agreement_status": ticket.get('agreement_status'),
+            "creation": str(ticket['creation']),
+            "modified": str(ticket['modified'])
+        })
+
+    return {"status": 200, "body": {"updated": updated, "count": len(updated), "conflicts": conflicts}}
@@ -3,6 +3,7 @@
 from src.ticket.store.ticket import Ticket
 from src.models.models import TicketCreate
 from src.middleware.auth import auth
+from src.storage.service.payload import check_in
 from pydantic import ValidationError
 
 config = {
@@ -21,7 +22,7 @@ config = {
 async def handler(req, ctx):
     supabase = req['supabase']
     token = req['token']
-    ticket_store = Ticket(supabase, token)
+    ticket_store = Ticket(supabase, token, req['service'])
     try:
         ticket_data = TicketCreate(**req['body'])
         ticket = ticket_store.create_from_dict(ticket_data.model_dump(exclude_unset=True))
@@ -29,7 +30,7 @@ async def handler(req, ctx):
         return {"status": 400, "body": {"error": e.errors()}}
     await ctx.emit({
         "topic": "ticket.created",
-        "data": ticket
+        "data": check_in(ticket)
     })
 
     await ctx.streams.tickets.set("all", ticket['name'], {
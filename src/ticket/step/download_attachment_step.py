@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+
+import os
+import base64
+from urllib.parse import unquote
+from src.ticket.store.ticket import Ticket
+from src.middleware.auth import auth
+from src.storage.service.blob import get_blob_store, is_blob_ref, parse_range
+
+MAX_RANGE = int(os.environ.get('ATTACHMENT_MAX_RANGE', 4 * 1024 * 1024))
+
+config = {
+    "name": "Download Attachment",
+    "type": "api",
+    "method": "GET",
+    "description": "Download a byte range of a communication attachment",
+    "path": "/tickets/:id/communications/:commId/attachments/:filename",
+    "middleware": [auth],
+    "emits": [],
+    "flows": ["HelpDesk"]
+}
+
+async def handler(req, ctx=None):
+    path_params = req.get("pathParams", {})
+    comm_id = str(path_params.get("commId", ""))
+    if not comm_id.isdigit():
+        return {"status": 400, "body": {"error": "Invalid communication id"}}
+
+    ticket = Ticket(req['supabase'], req['token'], req['service'])
+    comm = ticket.get_communication(path_params.get("id"), comm_id, 'attachments')
+    filename = unquote(path_params.get("filename", ""))
+    ref = (comm.get('attachments') or {}).get(filename)
+    if not is_blob_ref(ref):
+        return {"status": 404, "body": {"error": "Attachment not found"}}
+
+    headers = req.get('headers', {})
+    size = int(ref['size'])
+    byte_range = parse_range(headers.get('range') or headers.get('Range'), size, MAX_RANGE)
+    if size and byte_range is None:
+        return {"status": 416, "headers": {"Content-Range": f"bytes */{size}"}, "body": {"error": "Range not satisfiable"}}
+
+    start, end = byte_range if size else (0, -1)
+    data = get_blob_store().read(ref['sha256'], start, end) if size else b''
+    partial = end - start + 1 < size
+    return {
+        "status": 206 if partial else 200,
+        "headers": {
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "ETag": f'"{ref["sha256"]}"',
+            "Cache-Control": "private, max-age=31536000, immutable"
+        },
+        "body": {
+            "filename": filename,
+            "mime_type": ref.get('mime_type'),
+            "size": size,
+            "start": start,
+            "end": end,
+            "data": base64.b64encode(data).decode()
+        }
+    }
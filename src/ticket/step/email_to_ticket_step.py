@@ -1,10 +1,11 @@
 #!/usr/bin/python3
 
-import os
-from supabase import create_client, Client
 from datetime import datetime
 from src.ticket.store.ticket import Ticket
+from src.middleware.auth import get_service_client
 from src.models.models import CommunicationDirection
+from src.storage.service.blob import store_attachments
+from src.storage.service.payload import check_in, check_out, claim
 
 config = {
     "name": "Email to Ticket",
@@ -16,21 +17,18 @@ config = {
 }
 
 async def handler(input, ctx):
-    supabase_url = os.environ.get('SUPABASE_URL')
-    supabase_key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or os.environ.get('SUPABASE_KEY')
-
-    if not supabase_url or not supabase_key:
-        ctx.logger.error("SUPABASE_URL or SUPABASE_KEY/SUPABASE_SERVICE_ROLE_KEY not set")
+    supabase = get_service_client()
+    if supabase is None:
+        ctx.logger.error("SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY not set")
         return
 
-    supabase: Client = create_client(supabase_url, supabase_key)
-    ticket_store = Ticket(supabase, None)
+    ticket_store = Ticket(supabase, None, supabase)
 
     email_data = input
 
     message_id = email_data.get('message_id')
     in_reply_to = email_data.get('in_reply_to')
-    references = email_data.get('references', [])
+    references = claim(email_data.get('references')) or []
 
     target_ticket_id = None
 
@@ -60,19 +58,21 @@ async def handler(input, ctx):
             if ticket_res.data:
                 target_ticket_id = ticket_res.data[0]['name']
 
+    email_data = check_out(input)
+
     attachments_dict = {}
     if email_data.get('attachments'):
         for att in email_data.get('attachments'):
-            if isinstance(att, dict):
-                filename = att.get('filename')
-                mime_type = att.get('mime_type')
-                data = att.get('data')
-            else:
-                filename = att.filename
-                mime_type = att.mime_type
-                data = att.data
-            if filename and data:
-                attachments_dict[filename] = f"data:{mime_type};base64,{data}"
+            if not isinstance(att, dict):
+                att = att.model_dump()
+            filename = att.get('filename')
+            if not filename:
+                continue
+            if att.get('sha256'):
+                attachments_dict[filename] = {'sha256': att['sha256'], 'size': att.get('size_bytes'), 'mime_type': att.get('mime_type')}
+            elif att.get('data'):
+                attachments_dict[filename] = att
+        attachments_dict = store_attachments(attachments_dict)
 
     if target_ticket_id:
         ctx.logger.info(f"Adding email as reply to ticket: {target_ticket_id}")
@@ -89,13 +89,12 @@ async def handler(input, ctx):
             'attachments': attachments_dict
         }
 
-        res = supabase.table('Communication').insert({
+        c = ticket_store.insert_communication({
             'ticket': target_ticket_id,
             **reply_obj
-        }).execute()
+        })
 
-        if res.data:
-            c = res.data[0]
+        if c:
 
             await ctx.streams.communications.set(target_ticket_id, str(c['id']), {
                 "id": str(c['id']),
@@ -110,7 +109,7 @@ async def handler(input, ctx):
 
             await ctx.emit({
                 "topic": "ticket.replied",
-                "data": c
+                "data": check_in(c)
             })
     else:
         ctx.logger.info(f"Creating new ticket from email: {email_data.get('subject')}")
@@ -152,5 +151,5 @@ async def handler(input, ctx):
 
         await ctx.emit({
             "topic": "ticket.created",
-            "data": new_ticket
+            "data": check_in(new_ticket)
         })
@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+
+from src.ticket.store.ticket import Ticket
+from src.ticket.service.export import TicketExporter
+from src.middleware.auth import auth
+
+config = {
+    "name": "Export Tickets",
+    "type": "api",
+    "method": "GET",
+    "description": "Export tickets as NDJSON or CSV, one chunk per call",
+    "path": "/exports/tickets",
+    "middleware": [auth],
+    "emits": [],
+    "flows": ["HelpDesk"]
+}
+
+async def handler(req, ctx=None):
+    supabase = req['supabase']
+    token = req['token']
+    ticket_store = Ticket(supabase, token, req['service'])
+    query_params = req.get('queryParams', {})
+    cursor = query_params.get('cursor')
+    try:
+        exporter = TicketExporter(
+            ticket_store,
+            format=query_params.get('format', 'ndjson'),
+            fields=query_params.get('fields'),
+            filters={col: query_params.get(col) for col in Ticket.LIST_FILTERS},
+            chunk_size=query_params.get('limit')
+        )
+        rows, next_cursor = next(exporter.chunks(cursor))
+    except ValueError as e:
+        return {"status": 400, "body": {"error": str(e)}}
+
+    return {"status": 200, "body": {
+        "format": exporter.format,
+        "data": exporter.encode(rows, header=cursor is None),
+        "next_cursor": next_cursor
+    }}
@@ -17,6 +17,6 @@ config = {
 async def handler(req, ctx):
     supabase = req['supabase']
     token = req['token']
-    ticket = Ticket(supabase, token)
+    ticket = Ticket(supabase, token, req['service'])
     channels = ticket.get_channels()
     return {"status": 200, "body": channels}
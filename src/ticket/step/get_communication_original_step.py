@@ -0,0 +1,27 @@
+#!/usr/bin/python3
+
+from src.ticket.store.ticket import Ticket
+from src.middleware.auth import auth
+
+config = {
+    "name": "Get Communication Original",
+    "type": "api",
+    "method": "GET",
+    "description": "Get the archived raw headers and full body of a communication",
+    "path": "/tickets/:id/communications/:commId/original",
+    "middleware": [auth],
+    "emits": [],
+    "flows": ["HelpDesk"]
+}
+
+async def handler(req, ctx=None):
+    path_params = req.get("pathParams", {})
+    comm_id = str(path_params.get("commId", ""))
+    if not comm_id.isdigit():
+        return {"status": 400, "body": {"error": "Invalid communication id"}}
+
+    ticket = Ticket(req['supabase'], req['token'], req['service'])
+    original = ticket.get_original(path_params.get("id"), comm_id)
+    if not original:
+        return {"status": 404, "body": {"error": "Original message not found"}}
+    return {"status": 200, "body": original}
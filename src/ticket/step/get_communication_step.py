@@ -0,0 +1,32 @@
+#!/usr/bin/python3
+
+from src.ticket.store.ticket import Ticket
+from src.middleware.auth import auth
+
+config = {
+    "name": "Get Ticket Communication",
+    "type": "api",
+    "method": "GET",
+    "description": "Get the attachments and raw headers of a single communication",
+    "path": "/tickets/:id/communications/:commId",
+    "middleware": [auth],
+    "emits": [],
+    "flows": ["HelpDesk"]
+}
+
+async def handler(req, ctx=None):
+    path_params = req.get("pathParams", {})
+    comm_id = str(path_params.get("commId", ""))
+    if not comm_id.isdigit():
+        return {"status": 400, "body": {"error": "Invalid communication id"}}
+
+    supabase = req['supabase']
+    token = req['token']
+    ticket = Ticket(supabase, token, req['service'])
+    try:
+        comm = ticket.get_communication(path_params.get("id"), comm_id, req.get('queryParams', {}).get('include'))
+    except ValueError as e:
+        return {"status": 400, "body": {"error": str(e)}}
+    if not comm:
+        return {"status": 404, "body": {"error": "Communication not found"}}
+    return {"status": 200, "body": comm}
@@ -0,0 +1,27 @@
+#!/usr/bin/python3
+
+from src.ticket.store.ticket import Ticket
+from src.middleware.auth import auth
+
+config = {
+    "name": "Get Ticket Conversation",
+    "type": "api",
+    "method": "GET",
+    "description": "Get a page of a ticket's communications, newest first, without attachments or raw headers",
+    "path": "/tickets/:id/communications",
+    "middleware": [auth],
+    "emits": [],
+    "flows": ["HelpDesk"]
+}
+
+async def handler(req, ctx=None):
+    id = req.get("pathParams", {}).get("id")
+    supabase = req['supabase']
+    token = req['token']
+    ticket = Ticket(supabase, token, req['service'])
+    query_params = req.get('queryParams', {})
+    try:
+        page = ticket.get_conversation(id, limit=query_params.get('limit'), cursor=query_params.get('cursor'))
+    except ValueError as e:
+        return {"status": 400, "body": {"error": str(e)}}
+    return {"status": 200, "body": page}
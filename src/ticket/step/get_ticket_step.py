@@ -7,7 +7,7 @@ config = {
     "name": "Get Ticket By ID",
     "type": "api",
     "method": "GET",
-    "description": "Get Ticket Details and Communication By ID",
+    "description": "Get Ticket Details By ID",
     "path": "/tickets/:id",
     "middleware": [auth],
     "emits": [],
@@ -18,6 +18,6 @@ async def handler(req, ctx=None):
     id = req.get("pathParams", {}).get("id")
     supabase = req['supabase']
     token = req['token']
-    ticket = Ticket(supabase, token)
+    ticket = Ticket(supabase, token, req['service'])
     return {"status": 200, "body": ticket.get_by_id(id)}
 
@@ -7,7 +7,7 @@ config = {
     "name": "Get Tickets",
     "type": "api",
     "method": "GET",
-    "description": "Get All Tickets",
+    "description": "Get a page of tickets, newest activity first",
     "path": "/tickets",
     "middleware": [auth],
     "emits": [],
@@ -17,5 +17,16 @@ config = {
 async def handler(req, ctx=None):
     supabase = req['supabase']
     token = req['token']
-    ticket = Ticket(supabase, token)
-    return {"status": 200, "body": ticket.get_all()}
+    ticket = Ticket(supabase, token, req['service'])
+    query_params = req.get('queryParams', {})
+    try:
+        page = ticket.get_page(
+            limit=query_params.get('limit'),
+            cursor=query_params.get('cursor'),
+            filters={col: query_params.get(col) for col in Ticket.LIST_FILTERS},
+            fields=query_params.get('fields'),
+            counts=query_params.get('counts') in ('1', 'true')
+        )
+    except ValueError as e:
+        return {"status": 400, "body": {"error": str(e)}}
+    return {"status": 200, "body": page}
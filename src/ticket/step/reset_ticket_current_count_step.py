@@ -1,7 +1,6 @@
 #!/usr/bin/python3
 
-import os
-from supabase import Client, create_client
+from src.middleware.auth import get_service_client
 
 config = {
     "name": "Reset Ticket Current Count",
@@ -13,12 +12,8 @@ config = {
 }
 
 async def handler(ctx):
-    supabase_url = os.environ.get('SUPABASE_URL')
-    supabase_key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or os.environ.get('SUPABASE_KEY')
-
-    if not supabase_url or not supabase_key:
-        ctx.logger.error("SUPABASE_URL or SUPABASE_KEY/SUPABASE_SERVICE_ROLE_KEY not set")
+    supabase = get_service_client()
+    if supabase is None:
+        ctx.logger.error("SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY not set")
         return
-    supabase: Client = create_client(supabase_url, supabase_key)
-    supabase.table("System_Setting")\
-    .update({'current_count': 1}).eq('name', 'GLOBAL').execute()
+    supabase.rpc('lease_ticket_numbers', {'p_block': 0}).execute()
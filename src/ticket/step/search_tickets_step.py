@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+
+from src.ticket.store.ticket import Ticket
+from src.middleware.auth import auth
+
+config = {
+    "name": "Search Tickets",
+    "type": "api",
+    "method": "GET",
+    "description": "Full-text search over ticket subjects, descriptions and conversation bodies",
+    "path": "/search/tickets",
+    "middleware": [auth],
+    "emits": [],
+    "flows": ["HelpDesk"]
+}
+
+async def handler(req, ctx=None):
+    supabase = req['supabase']
+    token = req['token']
+    ticket = Ticket(supabase, token, req['service'])
+    query_params = req.get('queryParams', {})
+    try:
+        results = ticket.search(
+            query_params.get('q'),
+            filters={key: query_params.get(key) for key in (*Ticket.SEARCH_FILTERS, 'from', 'to')},
+            limit=query_params.get('limit'),
+            cursor=query_params.get('cursor')
+        )
+    except ValueError as e:
+        return {"status": 400, "body": {"error": str(e)}}
+    return {"status": 200, "body": results}
@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+
+from src.ticket.service.sla_scheduler import SLAScheduler
+from src.middleware.auth import get_service_client
+
+config = {
+    "type": "cron",
+    "name": "SLA Deadline Tick",
+    "description": "Mark tickets whose SLA deadline has passed as Failed",
+    "cron": "*/5 * * * * *",
+    "emits": [],
+    "flows": ["HelpDesk"]
+}
+
+async def handler(ctx):
+    supabase = get_service_client()
+    if supabase is None:
+        ctx.logger.error("SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY not set")
+        return
+
+    breached = SLAScheduler(supabase).flush()
+    if not breached:
+        return
+
+    ctx.logger.info(f"SLA breached on {len(breached)} tickets")
+    for ticket in breached:
+        await ctx.streams.tickets.set("all", ticket['name'], {
+            "name": ticket['name'],
+            "subject": ticket['subject'],
+            "status": ticket['status'],
+            "priority": ticket.get('priority'),
+            "team": ticket.get('team'),
+            "agent": str(ticket.get('agent')) if ticket.get('agent') else None,
+            "customer": ticket.get('customer'),
+            "agreement_status": ticket.get('agreement_status'),
+            "creation": str(ticket['creation']),
+            "modified": str(ticket['modified'])
+        })
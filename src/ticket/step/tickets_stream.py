@@ -12,6 +12,7 @@ config = {
             "team": {"type": ["string", "null"]},
             "agent": {"type": ["string", "null"]},
             "customer": {"type": ["string", "null"]},
+            "agreement_status": {"type": ["string", "null"]},
             "creation": {"type": "string"},
             "modified": {"type": "string"}
         },
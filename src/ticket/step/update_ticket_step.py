@@ -1,7 +1,8 @@
 #!/usr/bin/python3
 
-from src.ticket.store.ticket import Ticket
+from src.ticket.store.ticket import Ticket, ConcurrentUpdateError
 from src.middleware.auth import auth
+from src.storage.service.payload import check_in
 
 config = {
     "name": "Update Ticket",
@@ -19,12 +20,15 @@ async def handler(req, ctx):
     id = req.get("pathParams", {}).get("id")
     supabase = req['supabase']
     token = req['token']
-    ticket_store = Ticket(supabase, token)
-    updated_ticket = ticket_store.update(id, req.get('body', {}))
+    ticket_store = Ticket(supabase, token, req['service'])
+    try:
+        updated_ticket = ticket_store.update(id, req.get('body', {}))
+    except ConcurrentUpdateError as e:
+        return {"status": 409, "body": {"error": str(e)}}
 
     await ctx.emit({
         "topic": "ticket.updated",
-        "data": updated_ticket
+        "data": check_in(updated_ticket)
     })
 
     await ctx.streams.tickets.set("all", updated_ticket['name'], {
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+
+import os
+import threading
+from datetime import date, datetime, timezone
+from supabase import Client
+
+
+class Lease:
+    def __init__(self, first: int, size: int, prefix: str, day: date | None = None):
+        self.next = first
+        self.end = first + size
+        self.prefix = prefix
+        self.day = day
+
+    def exhausted(self, day: date | None = None) -> bool:
+        return self.next >= self.end or (day is not None and self.day is not None and self.day < day)
+
+    def take(self) -> int:
+        number = self.next
+        self.next += 1
+        return number
+
+
+class SequenceAllocator:
+    TICKET_BLOCK = int(os.environ.get('TICKET_NUMBER_BLOCK', 10))
+    CUSTOMER_BLOCK = int(os.environ.get('CUSTOMER_NUMBER_BLOCK', 10))
+
+    _leases: dict[str, Lease] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, service: Client | None):
+        if service is None:
+            raise RuntimeError("SequenceAllocator requires the service client (SUPABASE_SERVICE_ROLE_KEY)")
+        self.supabase = service
+
+    def next_ticket_name(self) -> str:
+        number, prefix, day = self._next('ticket', datetime.now(timezone.utc).date())
+        return self._ticket_name(prefix, day, number)
+
+    def lease_ticket_names(self, count: int) -> list[str]:
+        lease = self._lease('ticket', count)
+        return [self._ticket_name(lease.prefix, lease.day, lease.take()) for _ in range(count)]
+
+    def _ticket_name(self, prefix: str | None, day: date, number: int) -> str:
+        return f"{(prefix or '').upper()}-{day.strftime('%y%m%d')}-{str(number).zfill(5)}"
+
+    def next_customer_id(self) -> str:
+        number, prefix, _ = self._next('customer')
+        return f"{prefix or 'CUST'}-{str(number).zfill(6)}"
+
+    def _next(self, counter: str, day: date | None = None) -> tuple[int, str, date | None]:
+        with self._lock:
+            lease = self._leases.get(counter)
+            if lease is None or lease.exhausted(day):
+                size = self.TICKET_BLOCK if counter == 'ticket' else self.CUSTOMER_BLOCK
+                lease = self._lease(counter, size)
+                self._leases[counter] = lease
+            return lease.take(), lease.prefix, lease.day
+
+    def _lease(self, counter: str, size: int) -> Lease:
+        if counter == 'ticket':
+            res = self.supabase.rpc('lease_ticket_numbers', {'p_block': size}).execute()
+        else:
+            res = self.supabase.rpc('lease_customer_numbers', {'p_block': size}).execute()
+
+        if not res.data:
+            raise Exception(f"Failed to lease {counter} numbers: No data returned from Supabase")
+
+        row = res.data[0] if isinstance(res.data, list) else res.data
+        day = date.fromisoformat(str(row['day'])[:10]) if row.get('day') else None
+        return Lease(row['first_number'], size, row.get('prefix'), day)
@@ -1,38 +1,76 @@
 #!/usr/bin/python3
 
 import os
+import json
+import base64
 from supabase import Client
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from src.models.models import CommunicationDirection, AgreementStatus, TicketCreate
+from src.models.interval import to_timedelta, format_interval
+from src.ticket.store.sequence import SequenceAllocator
+from src.ticket.service.assignment import AssignmentService
+from src.middleware.identity import resolve_identity
+from src.management.store.reference import get_reference_data
+from src.management.store.resolver import CustomerResolver
+from src.management.store.directory import DirectoryCache, display_name
+from src.storage.service.blob import store_attachments
+from src.storage.service.archive import get_archive_store
 from pydantic import ValidationError
 
+class ConcurrentUpdateError(Exception):
+    pass
+
+
 class Ticket:
-    def __init__(self, supabase: Client, token: str):
+    ENRICHMENT = 'assignee:Profile!fk_ticket_agent_profile(full_name, email), Customer(full_name, email, phone)'
+    FIRST_RESPONSE_FIELDS = 'creation, first_responded_on, bot_first_response_time, response_by, resolution_by'
+    SUMMARY_FIELDS = f'name, subject, status, priority, team, agent, customer, raised_by, creation, modified, {ENRICHMENT}'
+
+    CONVERSATION_FIELDS = 'id, ticket, creation, sender, raised_by, body, direction, channel, message_id, event_type, has_original, attachment_names'
+    HEAVY_FIELDS = ('attachments',)
+
+    PAGE_SIZE = 50
+    CONVERSATION_PAGE_SIZE = 30
+    MAX_BULK_SIZE = 500
+    MAX_UPDATE_ATTEMPTS = 5
+    BULK_FIELDS = ('status', 'priority', 'team', 'agent')
+    MAX_PAGE_SIZE = 200
+    SEARCH_PAGE_SIZE = 20
+    MAX_SEARCH_PAGE_SIZE = 100
+    SEARCH_FILTERS = ('status', 'team')
+    LIST_FILTERS = ('status', 'team', 'agent', 'priority', 'channel', 'customer')
+    COLUMNS = {
+        'name', 'owner', 'creation', 'modified', 'subject', 'description', 'raised_by', 'status',
+        'priority', 'team', 'external_thread_id', 'agent', 'channel', 'resolution_date',
+        'resolved_by_bot', 'resolved_by', 'first_responded_on', 'bot_first_responded_on', 'customer',
+        'sla', 'agreement_status', 'response_by', 'resolution_by', 'total_hold_time',
+        'bot_first_response_time', 'first_response_time', 'is_merged', 'merged_with',
+        'original_team', 'escalation_count'
+    }
+    FIELDS = ', '.join(sorted(COLUMNS))
+
+    def __init__(self, supabase: Client, token: str, service: Client | None = None):
         self.supabase = supabase
         self.token = token
+        self.service = service
 
     @property
     def name(self):
-        today = datetime.now()
-        date = today.strftime("%y%m%d")
-
-        ticket_info = self.supabase.table('System_Settings')\
-        .select('current_count, ticket_prefix')\
-        .eq('name', 'GLOBAL').execute()
-        ticket_info = ticket_info.data[0]
-        count = str(ticket_info.get('current_count', 1)).zfill(5)
-        self.supabase.table("System_Settings")\
-        .update({"current_count": ticket_info.get('current_count', 0) + 1})\
-        .eq("name", 'GLOBAL').execute()
-        return f"{ticket_info.get('ticket_prefix','').upper()}-{date}-{count}"
-
-    def _generate_customer_id(self) -> str:
-        settings = self.supabase.table('System_Settings').select('current_customer_count, customer_prefix').eq('name', 'GLOBAL').execute()
-        settings = settings.data[0]
-        prefix = settings.get('customer_prefix', 'CUST')
-        count = settings.get('current_customer_count', 1)
-        self.supabase.table('System_Settings').update({'current_customer_count': count + 1}).eq('name', 'GLOBAL').execute()
-        return f"{prefix}-{str(count).zfill(6)}"
+        return SequenceAllocator(self.service).next_ticket_name()
+
+    def _current_user(self):
+        return resolve_identity(self.supabase, self.token)
+
+    @property
+    def reference(self):
+        return get_reference_data(self.service)
+
+    @property
+    def visible_reference(self):
+        if self.token is None:
+            return self.reference
+        user = self._current_user()
+        return self.reference.visible_to(user.id if user else None)
 
     def create_from_dict(self, obj: dict) -> dict:
         try:
@@ -41,85 +79,37 @@ class Ticket:
             raise ValueError(f"Invalid ticket data: {e}")
 
         obj['name'] = self.name
-        if self.token:
-            try:
-                user = self.supabase.auth.get_user(self.token)
-                if user and user.user:
-                    obj['owner'] = user.user.email
-            except Exception:
-                pass
+        user = self._current_user()
+        if user and user.email:
+            obj['owner'] = user.email
         if not obj.get('owner'):
             obj['owner'] = 'system@helpdesk.com'
 
         if obj.get('team') and not obj.get('agent'):
-            agent = self.get_next_agent_for_team(obj['team'])
+            agent = AssignmentService(self.supabase, self.service).next_agent(obj['team'])
             if agent:
                 obj['agent'] = agent
 
         if obj.get('raised_by'):
-            handle = obj['raised_by']
-            channel = obj.get('channel', 'Email')
-
-            handle_res = self.supabase.table('Customer_Handle').select('customer').eq('channel', channel).eq('handle', handle).execute()
-
-            customer_id = None
-            if handle_res.data:
-                customer_id = handle_res.data[0]['customer']
-            else:
-                if channel == 'Email':
-                    cust_res = self.supabase.table('Customer').select('name').eq('email', handle).execute()
-                    if cust_res.data:
-                        customer_id = cust_res.data[0]['name']
-                elif channel in ['WhatsApp', 'SMS', 'Phone']:
-                    cust_res = self.supabase.table('Customer').select('name').eq('phone', handle).execute()
-                    if cust_res.data:
-                        customer_id = cust_res.data[0]['name']
-
-                if customer_id:
-                    self.supabase.table('Customer_Handle').insert({
-                        'customer': customer_id,
-                        'channel': channel,
-                        'handle': handle
-                    }).execute()
-                else:
-                    customer_id = self._generate_customer_id()
-                    new_customer = {
-                        'name': customer_id,
-                        'full_name': handle.split('@')[0] if '@' in handle else handle
-                    }
-                    if channel == 'Email':
-                        new_customer['email'] = handle
-                    elif channel in ['WhatsApp', 'SMS', 'Phone']:
-                        new_customer['phone'] = handle
-
-                    self.supabase.table('Customer').insert(new_customer).execute()
-
-                    self.supabase.table('Customer_Handle').insert({
-                        'customer': customer_id,
-                        'channel': channel,
-                        'handle': handle
-                    }).execute()
-
-            obj['customer'] = customer_id
+            obj['customer'] = CustomerResolver(self.service).resolve(obj.get('channel', 'Email'), obj['raised_by'])
 
         if obj.get('priority'):
-            sla_res = self.supabase.table('SLA').select('*').eq('priority', obj['priority']).execute()
-            if sla_res.data:
-                sla = sla_res.data[0]
+            sla = self.reference.sla_for(obj['priority'])
+            if sla:
                 creation = datetime.now()
 
                 if sla.get('first_response_time'):
-                    delta = self._parse_interval(sla['first_response_time'])
+                    delta = to_timedelta(sla['first_response_time'])
                     obj['response_by'] = (creation + delta).isoformat()
                     obj['agreement_status'] = AgreementStatus.FIRST_RESPONSE_DUE
 
                 if sla.get('resolution_time'):
-                    delta = self._parse_interval(sla['resolution_time'])
+                    delta = to_timedelta(sla['resolution_time'])
                     obj['resolution_by'] = (creation + delta).isoformat()
                     if not obj.get('agreement_status'):
                          obj['agreement_status'] = AgreementStatus.RESOLUTION_DUE
 
-        attachments = obj.pop('attachments', None)
+        attachments = store_attachments(obj.pop('attachments', None))
         message_id = obj.pop('message_id', None)
         raw_headers = obj.pop('raw_headers', None)
 
@@ -140,266 +130,479 @@ class Ticket:
             'message_id': message_id,
             'raw_headers': raw_headers
         }
-        comm = self.supabase.table('Communication')\
-        .insert(comm).execute()
-        res['Communication'] = comm.data[-1]
+        res['Communication'] = self.insert_communication(comm)
         return res
 
-    def update(self, id: str, obj: dict) -> dict:
-        current = self.get_by_id(id)
-        now = datetime.now()
-
-        if 'team' in obj and obj['team'] and 'agent' not in obj:
-            if current.get('team') != obj['team']:
-                agent = self.get_next_agent_for_team(obj['team'])
-                if agent:
-                    obj['agent'] = agent
-
-        if 'status' in obj and obj['status'] in ['Resolved', 'Closed']:
-            updates = {}
-
-            if not current.get('resolved_by'):
-                if self.token:
-                    try:
-                        user_res = self.supabase.auth.get_user(self.token)
-                        if user_res and user_res.user:
-                            updates['resolved_by'] = user_res.user.id
-                    except Exception:
-                        pass
+    def insert_communication(self, comm: dict) -> dict:
+        raw_headers = comm.pop('raw_headers', None)
+        if raw_headers:
+            comm['has_original'] = True
 
-            if not current.get('resolution_date'):
-                updates['resolution_date'] = now.isoformat()
-
-            if current.get('resolution_by'):
-                resolution_by = datetime.fromisoformat(current['resolution_by'].replace('Z', '+00:00'))
-                if resolution_by.tzinfo and not now.tzinfo:
-                    now = now.replace(tzinfo=timezone.utc)
-
-                if now > resolution_by:
-                    updates['agreement_status'] = AgreementStatus.FAILED
-                elif current.get('agreement_status') != AgreementStatus.FAILED:
-                    updates['agreement_status'] = AgreementStatus.FULFILLED
+        res = self.supabase.table('Communication').insert(comm).execute()
+        row = res.data[-1] if res.data else {}
+        if raw_headers and row:
+            try:
+                get_archive_store(self.supabase).put(row['id'], raw_headers)
+            except Exception:
+                self.supabase.table('Communication').update({'raw_headers': raw_headers}).eq('id', row['id']).execute()
+        return row
 
-            if updates:
-                obj.update(updates)
-                self.supabase.table('Ticket').update(updates).eq('name', id).execute()
+    def update(self, id: str, obj: dict) -> dict:
+        assignees = {}
+        for _ in range(self.MAX_UPDATE_ATTEMPTS):
+            res = self._select_for_update().eq('name', id).execute()
+            if not res.data:
+                return {}
+
+            current = res.data[0]
+            open_holds = current.pop('Ticket_Hold', None) or []
+            plan = self._plan_update(id, current, obj, open_holds, assignees)
+            updated = self._apply_update(id, current, plan)
+            if updated is not None:
+                return updated
+
+        raise ConcurrentUpdateError(f"Ticket {id} kept changing while it was being updated")
+
+    def _select_for_update(self):
+        return self.supabase.table('Ticket')\
+        .select(f'{self.FIELDS}, Ticket_Hold(id, hold_start)')\
+        .is_('Ticket_Hold.hold_end', 'null')
+
+    def _plan_update(self, id: str, current: dict, obj: dict, open_holds: list[dict], assignees: dict) -> dict:
+        now = datetime.now(timezone.utc)
+        changes = dict(obj)
+        plan = {'changes': changes, 'hold': None}
+
+        if changes.get('team') and 'agent' not in obj and current.get('team') != changes['team']:
+            key = (id, changes['team'])
+            if key not in assignees:
+                assignees[key] = AssignmentService(self.supabase, self.service).next_agent(changes['team'])
+            agent = assignees[key]
+            if agent:
+                changes['agent'] = agent
 
-        if 'priority' in obj and obj['priority'] != current.get('priority'):
-            sla_res = self.supabase.table('SLA').select('*').eq('priority', obj['priority']).execute()
-            if sla_res.data:
-                sla = sla_res.data[0]
-                creation = datetime.fromisoformat(current['creation'].replace('Z', '+00:00'))
-                if creation.tzinfo and not now.tzinfo:
-                    now = now.replace(tzinfo=timezone.utc)
+        if 'priority' in changes and changes['priority'] != current.get('priority'):
+            sla = self.reference.sla_for(changes['priority'])
+            if sla:
+                creation = self._parse_timestamp(current['creation'])
 
                 updates = {}
                 if sla.get('first_response_time'):
-                    delta = self._parse_interval(sla['first_response_time'])
+                    delta = to_timedelta(sla['first_response_time'])
                     updates['response_by'] = (creation + delta).isoformat()
                     if not current.get('first_responded_on'):
                         updates['agreement_status'] = AgreementStatus.FIRST_RESPONSE_DUE
 
                 if sla.get('resolution_time'):
-                    delta = self._parse_interval(sla['resolution_time'])
-                    if current.get('total_hold_time'):
-                        hold_delta = self._parse_interval(current['total_hold_time'])
-                        updates['resolution_by'] = (creation + delta + hold_delta).isoformat()
-                    else:
-                        updates['resolution_by'] = (creation + delta).isoformat()
+                    delta = to_timedelta(sla['resolution_time'])
+                    hold_delta = to_timedelta(current.get('total_hold_time'))
+                    updates['resolution_by'] = (creation + delta + hold_delta).isoformat()
 
                     if not updates.get('agreement_status') and not current.get('resolution_date'):
-                         updates['agreement_status'] = AgreementStatus.RESOLUTION_DUE
-
-                if updates:
-                    obj.update(updates)
-                    self.supabase.table('Ticket').update(updates).eq('name', id).execute()
-
-        if obj.get('status') == 'On Hold' and current.get('status') != 'On Hold':
-            self.supabase.table('Ticket_Hold').insert({
-                'ticket': id,
-                'hold_start': now.isoformat()
-            }).execute()
+                        updates['agreement_status'] = AgreementStatus.RESOLUTION_DUE
 
-        elif current.get('status') == 'On Hold' and obj.get('status') and obj.get('status') != 'On Hold':
-            hold_res = self.supabase.table('Ticket_Hold')\
-                .select('*')\
-                .eq('ticket', id)\
-                .is_('hold_end', 'null')\
-                .order('hold_start', desc=True)\
-                .limit(1)\
-                .execute()
+                changes.update(updates)
 
-            if hold_res.data:
-                hold_record = hold_res.data[0]
-                hold_start = datetime.fromisoformat(hold_record['hold_start'].replace('Z', '+00:00'))
+        new_status = changes.get('status')
+        if new_status == 'On Hold' and current.get('status') != 'On Hold':
+            plan['hold'] = {'insert': {'ticket': id, 'hold_start': now.isoformat()}}
 
-                if hold_start.tzinfo and not now.tzinfo:
-                    now = now.replace(tzinfo=timezone.utc)
+        elif current.get('status') == 'On Hold' and new_status and new_status != 'On Hold' and open_holds:
+            hold_record = max(open_holds, key=lambda h: h['hold_start'])
+            duration = now - self._parse_timestamp(hold_record['hold_start'])
 
-                duration = now - hold_start
+            plan['hold'] = {
+                'id': hold_record['id'],
+                'hold_start': hold_record['hold_start'],
+                'update': {'hold_end': now.isoformat(), 'duration': format_interval(duration)}
+            }
 
-                self.supabase.table('Ticket_Hold').update({
-                    'hold_end': now.isoformat(),
-                    'duration': str(duration)
-                }).eq('id', hold_record['id']).execute()
+            current_hold_time = to_timedelta(current.get('total_hold_time'))
+            changes['total_hold_time'] = format_interval(current_hold_time + duration)
 
-                current_hold_time = self._parse_interval(current.get('total_hold_time'))
-                new_total_hold_time = current_hold_time + duration
+            resolution_by = changes.get('resolution_by') or current.get('resolution_by')
+            if resolution_by:
+                changes['resolution_by'] = (self._parse_timestamp(resolution_by) + duration).isoformat()
 
-                updates = {
-                    'total_hold_time': str(new_total_hold_time)
-                }
+        if new_status in ['Resolved', 'Closed']:
+            if not current.get('resolved_by'):
+                user = self._current_user()
+                if user:
+                    changes['resolved_by'] = user.id
 
-                if current.get('resolution_by'):
-                    resolution_by = datetime.fromisoformat(current['resolution_by'].replace('Z', '+00:00'))
-                    new_resolution_by = resolution_by + duration
-                    updates['resolution_by'] = new_resolution_by.isoformat()
+            if not current.get('resolution_date'):
+                changes['resolution_date'] = now.isoformat()
 
-                self.supabase.table('Ticket').update(updates).eq('name', id).execute()
-                obj.update(updates)
+            resolution_by = changes.get('resolution_by') or current.get('resolution_by')
+            if resolution_by:
+                if now > self._parse_timestamp(resolution_by):
+                    changes['agreement_status'] = AgreementStatus.FAILED
+                elif current.get('agreement_status') != AgreementStatus.FAILED:
+                    changes['agreement_status'] = AgreementStatus.FULFILLED
 
-        if 'agent' in obj and obj['agent']:
-            team_name = obj.get('team') or current.get('team')
-            if team_name:
-                self.supabase.table('Team').update({'last_assigned_agent': obj['agent']}).eq('name', team_name).execute()
+        return plan
 
+    def _apply_update(self, id: str, current: dict, plan: dict) -> dict | None:
         res = self.supabase.table('Ticket')\
-        .update(obj).eq('name', id).execute()
+        .update(plan['changes'])\
+        .eq('name', id)\
+        .eq('modified', current['modified'])\
+        .execute()
+
+        if not res.data:
+            return None
+        updated = res.data[0]
 
-        updated = res.data[0] if res.data else {}
+        hold = plan['hold']
+        if hold and 'insert' in hold:
+            self.supabase.table('Ticket_Hold').insert(hold['insert']).execute()
+        elif hold:
+            self.supabase.table('Ticket_Hold').update(hold['update']).eq('id', hold['id']).execute()
 
-        if current and updated:
-            self._check_and_log_changes(id, current, updated)
+        events = self._change_events(id, current, updated)
+        if events:
+            self.supabase.table('Communication').insert(events).execute()
 
         return updated
 
+    def bulk_update(self, changes: dict, ids: list[str] | None = None, filters: dict | None = None) -> tuple[list[dict], list[str]]:
+        unknown = [k for k in changes if k not in self.BULK_FIELDS]
+        if not changes or unknown:
+            raise ValueError(f"Bulk updates accept only: {', '.join(self.BULK_FIELDS)}")
+        filters = filters or {}
+        if not isinstance(filters, dict):
+            raise ValueError("Bulk update filter must be an object")
+        unknown = [k for k in filters if k not in self.LIST_FILTERS]
+        if unknown:
+            raise ValueError(f"Unknown bulk update filters: {', '.join(unknown)}")
+
+        applied = {}
+        for col, val in filters.items():
+            values = [v.strip() for v in str(val or '').split(',') if v.strip()]
+            if values:
+                applied[col] = values
+        if not ids and not applied:
+            raise ValueError("Bulk updates need ids or a filter")
+
+        query = self._select_for_update()
+        if ids:
+            query = query.in_('name', ids)
+        for col, values in applied.items():
+            query = query.in_(col, values) if len(values) > 1 else query.eq(col, values[0])
+
+        res = query.order('name').limit(self.MAX_BULK_SIZE + 1).execute()
+        if len(res.data) > self.MAX_BULK_SIZE:
+            raise ValueError(f"Bulk updates are limited to {self.MAX_BULK_SIZE} tickets")
+
+        rows = res.data
+        currents = {}
+        plans = {}
+        assignees = {}
+        updated = []
+        conflicted = []
+        for _ in range(self.MAX_UPDATE_ATTEMPTS):
+            attempt = {}
+            for current in rows:
+                name = current['name']
+                open_holds = current.pop('Ticket_Hold', None) or []
+                currents[name] = current
+                attempt[name] = self._plan_update(name, current, changes, open_holds, assignees)
+
+            if not attempt:
+                break
+
+            res = self.supabase.rpc('bulk_update_tickets', {
+                'p_changes': {name: plan['changes'] for name, plan in attempt.items()},
+                'p_expected': {name: currents[name]['modified'] for name in attempt}
+            }).execute()
 
-    def get_next_agent_for_team(self, team_name: str) -> str | None:
-        team_res = self.supabase.table('Team').select('last_assigned_agent').eq('name', team_name).execute()
-        if not team_res.data:
-            return None
+            written = {row['name'] for row in res.data or []}
+            updated.extend(res.data or [])
+            plans.update({name: plan for name, plan in attempt.items() if name in written})
 
-        last_agent = team_res.data[0].get('last_assigned_agent')
+            conflicted = [name for name in attempt if name not in written]
+            if not conflicted:
+                break
+            rows = self._select_for_update().in_('name', conflicted).execute().data
 
-        members_res = self.supabase.table('Agent_Membership')\
-            .select('user')\
-            .eq('team', team_name)\
-            .order('user')\
-            .execute()
+        holds = [plan['hold'] for plan in plans.values() if plan['hold']]
+        inserts = [hold['insert'] for hold in holds if 'insert' in hold]
+        if inserts:
+            self.supabase.table('Ticket_Hold').insert(inserts).execute()
 
-        if not members_res.data:
-            return None
+        releases = [
+            {'id': hold['id'], 'ticket': name, 'hold_start': hold['hold_start'], **hold['update']}
+            for name, hold in ((name, plan['hold']) for name, plan in plans.items())
+            if hold and 'update' in hold
+        ]
+        if releases:
+            self.supabase.table('Ticket_Hold').upsert(releases, on_conflict='id').execute()
+
+        events = []
+        for row in updated:
+            events.extend(self._change_events(row['name'], currents[row['name']], row))
+        if events:
+            self.supabase.table('Communication').insert(events).execute()
 
-        agents = [m['user'] for m in members_res.data]
+        return updated, conflicted
 
-        if len(agents) == 0:
-            return None
+    def get_by_id(self, id: str, fields: str | None = None) -> dict:
+        if fields:
+            res = self.supabase.table('Ticket').select(fields).eq('name', id).execute()
+            return self._hydrate(res.data[0]) if res.data else {}
 
-        if last_agent is None or last_agent not in agents:
-            next_agent = agents[0]
-        else:
-            current_idx = agents.index(last_agent)
-            next_idx = (current_idx + 1) % len(agents)
-            next_agent = agents[next_idx]
+        res = self.supabase.table('Ticket')\
+        .select(f'{self.FIELDS}, Priority(*), {self.ENRICHMENT}').eq('name', id).execute()
+
+        if not res.data:
+            return {}
 
-        self.supabase.table('Team').update({'last_assigned_agent': next_agent}).eq('name', team_name).execute()
+        return self._hydrate(res.data[0])
 
-        return next_agent
+    def get_conversation(self, id: str, limit: int | None = None, cursor: str | None = None) -> dict:
+        limit = max(1, min(int(limit or self.CONVERSATION_PAGE_SIZE), self.MAX_PAGE_SIZE))
 
+        query = self.supabase.table('Communication').select(self.CONVERSATION_FIELDS).eq('ticket', id)
+        if cursor:
+            creation, comm_id = self._decode_cursor(cursor)
+            creation = self._cursor_timestamp(creation)
+            if not comm_id.isdigit():
+                raise ValueError("Invalid cursor")
+            query = query.or_(f'creation.lt."{creation}",and(creation.eq."{creation}",id.lt.{comm_id})')
 
+        res = query.order('creation', desc=True)\
+        .order('id', desc=True)\
+        .limit(limit + 1)\
+        .execute()
 
-    def get_by_id(self, id: str) -> dict:
-        res = self.supabase.table('Ticket')\
-        .select('*, Communication(*), Priority(*)').eq('name', id).execute()
+        messages = res.data
+        next_cursor = None
+        if len(messages) > limit:
+            messages = messages[:limit]
+            next_cursor = self._encode_cursor(messages[-1]['creation'], messages[-1]['id'])
+
+        return {'data': messages, 'next_cursor': next_cursor, 'limit': limit}
 
+    def get_original(self, id: str, comm_id: str) -> dict:
+        res = self.supabase.table('Communication')\
+        .select('id, has_original, raw_headers')\
+        .eq('ticket', id)\
+        .eq('id', comm_id)\
+        .execute()
         if not res.data:
             return {}
 
-        ticket = res.data[0]
+        row = res.data[0]
+        original = row.get('raw_headers')
+        if original is None and row.get('has_original'):
+            original = get_archive_store(self.supabase).get(row['id'])
+        if original is None:
+            return {}
+
+        original = dict(original)
+        full_body_text = original.pop('full_body_text', None)
+        return {'id': row['id'], 'raw_headers': original, 'full_body_text': full_body_text}
+
+    def get_communication(self, id: str, comm_id: str, include: str | None = None) -> dict:
+        requested = [f.strip() for f in (include or ','.join(self.HEAVY_FIELDS)).split(',') if f.strip()]
+        unknown = [f for f in requested if f not in self.HEAVY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown communication fields: {', '.join(unknown)}")
+
+        res = self.supabase.table('Communication')\
+        .select(', '.join(['id', 'ticket', *requested]))\
+        .eq('ticket', id)\
+        .eq('id', comm_id)\
+        .execute()
+        return res.data[0] if res.data else {}
+
+    def _hydrate(self, ticket: dict) -> dict:
         if ticket.get('priority'):
-            sla_res = self.supabase.table('SLA')\
-            .select('*')\
-            .eq('priority', ticket['priority'])\
-            .execute()
-            if sla_res.data:
-                ticket['SLA'] = sla_res.data[0]
-            if sla_res.data:
-                ticket['SLA'] = sla_res.data[0]
-
-        if ticket.get('agent'):
+            sla = self.visible_reference.sla_for(ticket['priority'])
+            if sla:
+                ticket['SLA'] = sla
+        return self._flatten(ticket)
+
+    def _flatten(self, ticket: dict) -> dict:
+        profile = ticket.pop('assignee', None)
+        if profile:
+            ticket['assigneeName'] = profile.get('full_name') or profile.get('email')
+
+        customer = ticket.pop('Customer', None)
+        if customer:
+            ticket['customerName'] = customer.get('full_name') or customer.get('email') or customer.get('phone') or ticket.get('customer')
+            ticket['customerEmail'] = customer.get('email')
+            ticket['customerPhone'] = customer.get('phone')
+
+        return ticket
+
+    def _parse_timestamp(self, value: str) -> datetime:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+    def get_page(self, limit: int | None = None, cursor: str | None = None, filters: dict | None = None, fields: str | None = None, counts: bool = False) -> dict:
+        limit = max(1, min(int(limit or self.PAGE_SIZE), self.MAX_PAGE_SIZE))
+
+        query = self._filtered(self.supabase.table('Ticket').select(self._projection(fields)), filters)
+        if cursor:
+            modified, name = self._decode_cursor(cursor)
+            modified = self._cursor_timestamp(modified)
+            if any(c in name for c in '",()\\'):
+                raise ValueError("Invalid cursor")
+            query = query.or_(f'modified.lt."{modified}",and(modified.eq."{modified}",name.lt."{name}")')
+
+        res = query.order('modified', desc=True)\
+        .order('name', desc=True)\
+        .limit(limit + 1)\
+        .execute()
+
+        tickets = res.data
+        next_cursor = None
+        if len(tickets) > limit:
+            tickets = tickets[:limit]
+            next_cursor = self._encode_cursor(tickets[-1]['modified'], tickets[-1]['name'])
+
+        page = {'data': self._enrich(tickets), 'next_cursor': next_cursor, 'limit': limit}
+        if counts:
+            page['counts'] = self.count_by_status()
+        return page
+
+    def export_page(self, columns: list[str], limit: int | None = None, cursor: str | None = None, filters: dict | None = None) -> dict:
+        limit = max(1, min(int(limit or self.MAX_PAGE_SIZE), self.MAX_PAGE_SIZE))
+        unknown = [c for c in columns if c not in self.COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown ticket fields: {', '.join(unknown)}")
+
+        projection = ', '.join(dict.fromkeys(['name', *columns]))
+        query = self._filtered(self.supabase.table('Ticket').select(f'{projection}, {self.ENRICHMENT}'), filters)
+        if cursor:
             try:
-                profile_res = self.supabase.table('Profile').select('full_name, email').eq('id', ticket['agent']).execute()
-                if profile_res.data:
-                    profile = profile_res.data[0]
-                    ticket['assigneeName'] = profile.get('full_name') or profile.get('email')
+                name, = json.loads(base64.urlsafe_b64decode(cursor.encode()))
             except Exception:
-                pass
-
-        if ticket.get('customer'):
+                raise ValueError("Invalid cursor")
+            query = query.gt('name', str(name))
+
+        tickets = query.order('name').limit(limit + 1).execute().data
+        next_cursor = None
+        if len(tickets) > limit:
+            tickets = tickets[:limit]
+            next_cursor = self._encode_cursor(tickets[-1]['name'])
+
+        return {'data': [self._flatten(t) for t in tickets], 'next_cursor': next_cursor, 'limit': limit}
+
+    def _filtered(self, query, filters: dict | None):
+        for col, val in (filters or {}).items():
+            if col not in self.LIST_FILTERS or not val:
+                continue
+            values = [v.strip() for v in str(val).split(',') if v.strip()]
+            query = query.in_(col, values) if len(values) > 1 else query.eq(col, values[0])
+        return query
+
+    def count_by_status(self) -> dict:
+        rows = self.supabase.rpc('ticket_status_counts', {}).execute().data or []
+        by_status = {row['status']: row['total'] for row in rows if row.get('status')}
+        return {'total': sum(row['total'] for row in rows), 'by_status': by_status}
+
+    def search(self, query: str, filters: dict | None = None, limit: int | None = None, cursor: str | None = None) -> dict:
+        query = (query or '').strip()
+        if not query:
+            raise ValueError("Search query is required")
+        limit = max(1, min(int(limit or self.SEARCH_PAGE_SIZE), self.MAX_SEARCH_PAGE_SIZE))
+        filters = filters or {}
+
+        params = {'p_query': query, 'p_limit': limit + 1}
+        if cursor:
             try:
-                customer_res = self.supabase.table('Customer').select('full_name, email, phone').eq('name', ticket['customer']).execute()
-                if customer_res.data:
-                    customer = customer_res.data[0]
-                    ticket['customerName'] = customer.get('full_name') or customer.get('email') or customer.get('phone') or ticket['customer']
-                    ticket['customerEmail'] = customer.get('email')
-                    ticket['customerPhone'] = customer.get('phone')
+                rank, modified, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+                rank = float(rank)
             except Exception:
-                pass
-
-        return ticket
+                raise ValueError("Invalid cursor")
+            params.update({
+                'p_after_rank': rank,
+                'p_after_modified': self._cursor_timestamp(str(modified)),
+                'p_after_name': str(name),
+            })
+        for col in self.SEARCH_FILTERS:
+            values = [v.strip() for v in str(filters.get(col) or '').split(',') if v.strip()]
+            params[f'p_{col}'] = values or None
+        for key in ('from', 'to'):
+            value = filters.get(key)
+            if value:
+                try:
+                    params[f'p_{key}'] = self._parse_timestamp(str(value)).isoformat()
+                except ValueError:
+                    raise ValueError(f"Invalid {key} date: {value}")
+
+        tickets = self.supabase.rpc('search_tickets', params).execute().data or []
+        next_cursor = None
+        if len(tickets) > limit:
+            tickets = tickets[:limit]
+            last = tickets[-1]
+            next_cursor = self._encode_cursor(last['rank'], last['modified'], last['name'])
+
+        return {'data': self._enrich(tickets), 'next_cursor': next_cursor, 'limit': limit}
+
+    def _projection(self, fields: str | None) -> str:
+        if not fields:
+            return f'{self.FIELDS}, Priority(*)'
+
+        requested = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in requested if f not in self.COLUMNS and f != 'Priority']
+        if unknown:
+            raise ValueError(f"Unknown ticket fields: {', '.join(unknown)}")
+
+        columns = ['name', 'modified']
+        if 'response_by' in requested:
+            columns += ['creation', 'priority']
+        for f in requested:
+            if f not in columns:
+                columns.append(f)
+        return ', '.join('Priority(*)' if c == 'Priority' else c for c in columns)
+
+    def _encode_cursor(self, *values) -> str:
+        raw = json.dumps(list(values)).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def _cursor_timestamp(self, value: str) -> str:
+        try:
+            return self._parse_timestamp(value).isoformat()
+        except ValueError:
+            raise ValueError("Invalid cursor")
 
-    def _parse_interval(self, interval_str: str):
-        if not interval_str:
-            return timedelta(0)
+    def _decode_cursor(self, cursor: str) -> tuple[str, str]:
         try:
-            if ':' in interval_str:
-                parts = list(map(int, interval_str.split(':')))
-                if len(parts) == 3:
-                    return timedelta(hours=parts[0], minutes=parts[1], seconds=parts[2])
-            val = int(interval_str.split()[0])
-            if 'day' in interval_str:
-                return timedelta(days=val)
-            if 'hour' in interval_str:
-                return timedelta(hours=val)
-            if 'minute' in interval_str:
-                return timedelta(minutes=val)
+            first, second = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return str(first), str(second)
         except Exception:
-            pass
-        return timedelta(0)
-
-    def get_all(self) -> list[dict]:
-        res = self.supabase.table('Ticket')\
-        .select('*, Priority(*)').execute()
-        tickets = res.data
+            raise ValueError("Invalid cursor")
 
-        sla_res = self.supabase.table('SLA').select('*').execute()
-        sla_map = {sla['priority']: sla for sla in sla_res.data}
+    def _enrich(self, tickets: list[dict]) -> list[dict]:
+        reference = self.reference
+        visible = self.visible_reference
         for ticket in tickets:
             if ticket.get('priority'):
-                sla = sla_map.get(ticket['priority'])
-                ticket['SLA'] = sla
-                if not ticket.get('response_by') and sla and sla.get('first_response_time'):
+                sla = reference.sla_for(ticket['priority'])
+                ticket['SLA'] = visible.sla_for(ticket['priority'])
+                if not ticket.get('response_by') and sla and sla.get('first_response_time') and ticket.get('creation'):
                     try:
                         creation = datetime.fromisoformat(ticket['creation'].replace('Z', '+00:00'))
-                        delta = self._parse_interval(sla['first_response_time'])
+                        delta = to_timedelta(sla['first_response_time'])
                         ticket['response_by'] = (creation + delta).isoformat()
                     except Exception as e:
                         print(f"Error calculating response_by: {e}")
 
-        agent_ids = [t['agent'] for t in tickets if t.get('agent')]
+        agent_ids = list({t['agent'] for t in tickets if t.get('agent')})
         if agent_ids:
             try:
-                profiles_res = self.supabase.table('Profile').select('id, full_name, email').in_('id', agent_ids).execute()
-                profile_map = {p['id']: p for p in profiles_res.data}
-
+                directory = DirectoryCache(self.service).get_many(agent_ids)
                 for t in tickets:
-                    if t.get('agent') and t['agent'] in profile_map:
-                        profile = profile_map[t['agent']]
-                        t['assigneeName'] = profile.get('full_name') or profile.get('email')
+                    entry = directory.get(str(t['agent'])) if t.get('agent') else None
+                    if entry and entry['profile']:
+                        t['assigneeName'] = display_name(entry)
             except Exception as e:
                 print(f"Error fetching agent profiles: {e}")
 
-        customer_ids = [t['customer'] for t in tickets if t.get('customer')]
+        customer_ids = list({t['customer'] for t in tickets if t.get('customer')})
         if customer_ids:
             try:
                 customers_res = self.supabase.table('Customer').select('name, full_name, email, phone').in_('name', customer_ids).execute()
@@ -420,17 +623,14 @@ class Ticket:
     def _get_actor_identity(self):
         if not self.token:
             return os.environ.get('BOT_NAME', 'AI Bot')
-        try:
-            user_res = self.supabase.auth.get_user(self.token)
-            if user_res and user_res.user:
-                metadata = user_res.user.user_metadata or {}
-                name = metadata.get('full_name') or metadata.get('name') or user_res.user.email or "Agent"
-                return f"Agent {name}" if "@" not in name else name
-        except Exception:
-            pass
+        user = self._current_user()
+        if user:
+            metadata = user.user_metadata or {}
+            name = metadata.get('full_name') or metadata.get('name') or user.email or "Agent"
+            return f"Agent {name}" if "@" not in name else name
         return "Agent"
 
-    def _check_and_log_changes(self, ticket_id: str, old: dict, new: dict):
+    def _change_events(self, ticket_id: str, old: dict, new: dict) -> list[dict]:
         events = []
         actor = self._get_actor_identity()
 
@@ -473,44 +673,41 @@ class Ticket:
                 "direction": "System"
             })
 
+        if not events:
+            return []
 
-        if events:
-            user = None
-            if self.token:
-                try:
-                    user_res = self.supabase.auth.get_user(self.token)
-                    user = user_res.user if user_res else None
-                except Exception:
-                    pass
-
-            sender_id = user.id if user else None
-
-            for event in events:
-                self.supabase.table('Communication').insert({
-                    'ticket': ticket_id,
-                    'body': event['body'],
-                    'direction': event['direction'],
-                    'channel': 'System',
-                    'raised_by': new.get('raised_by'),
-                    'sender': sender_id,
-                    'event_type': 'system_event'
-                }).execute()
+        user = self._current_user()
+        sender_id = user.id if user else None
+
+        return [{
+            'ticket': ticket_id,
+            'body': event['body'],
+            'direction': event['direction'],
+            'channel': 'System',
+            'raised_by': new.get('raised_by'),
+            'sender': sender_id,
+            'event_type': 'system_event'
+        } for event in events]
 
     def add_reply(self, id: str, obj: dict) -> dict:
         obj['ticket'] = id
 
-        user = self.supabase.auth.get_user(self.token)
-        obj['sender'] = user.user.id
+        user = self._current_user()
+        if not user:
+            raise ValueError("Could not resolve the current user")
+        obj['sender'] = user.id
         obj['direction'] = CommunicationDirection.OUTBOUND
 
-        if not obj.get('raised_by') and user.user.email:
-            obj['raised_by'] = user.user.email
+        if not obj.get('raised_by') and user.email:
+            obj['raised_by'] = user.email
+        if obj.get('attachments'):
+            obj['attachments'] = store_attachments(obj['attachments'])
 
         res = self.supabase.table('Communication')\
         .insert(obj).execute()
 
-        ticket = self.get_by_id(id)
-        if not ticket.get('first_responded_on'):
+        ticket = self.get_by_id(id, self.FIRST_RESPONSE_FIELDS)
+        if ticket and not ticket.get('first_responded_on'):
             now = datetime.now()
             creation = datetime.fromisoformat(ticket['creation'].replace('Z', '+00:00'))
             if creation.tzinfo and not now.tzinfo:
@@ -520,7 +717,7 @@ class Ticket:
 
             updates = {
                 'first_responded_on': now.isoformat(),
-                'first_response_time': str(delta)
+                'first_response_time': format_interval(delta)
             }
 
             if ticket.get('response_by'):
@@ -533,7 +730,8 @@ class Ticket:
                     else:
                         updates['agreement_status'] = AgreementStatus.FULFILLED
 
-            self.supabase.table('Ticket').update(updates).eq('name', id).execute()
+            self.supabase.table('Ticket').update(updates)\
+            .eq('name', id).is_('first_responded_on', 'null').execute()
 
         return res.data[-1] if res.data else {}
 
@@ -549,8 +747,8 @@ class Ticket:
         res = self.supabase.table('Communication').insert(comm).execute()
 
         if raised_by == 'AI Orchestrator':
-            ticket = self.get_by_id(ticket_id)
-            if not ticket.get('bot_first_response_time'):
+            ticket = self.get_by_id(ticket_id, self.FIRST_RESPONSE_FIELDS)
+            if ticket and not ticket.get('bot_first_response_time'):
                 now = datetime.now()
                 creation = datetime.fromisoformat(ticket['creation'].replace('Z', '+00:00'))
                 if creation.tzinfo and not now.tzinfo:
@@ -559,7 +757,7 @@ class Ticket:
                 delta = now - creation
 
                 updates = {
-                    'bot_first_response_time': str(delta),
+                    'bot_first_response_time': format_interval(delta),
                     'bot_first_responded_on': now.isoformat()
                 }
 
@@ -573,10 +771,10 @@ class Ticket:
                          else:
                             updates['agreement_status'] = AgreementStatus.FULFILLED
 
-                self.supabase.table('Ticket').update(updates).eq('name', ticket_id).execute()
+                self.supabase.table('Ticket').update(updates)\
+                .eq('name', ticket_id).is_('bot_first_response_time', 'null').execute()
 
         return res.data[0] if res.data else {}
 
     def get_channels(self) -> list[dict]:
-        res = self.supabase.table('Channel').select('*').eq('is_active', True).execute()
-        return res.data
+        return self.visible_reference.active_channels()